@@ -38,14 +38,28 @@
 # Kütüphanelerin İçe Aktarılması ve Görüntü Ayarları
 ##############################################################################################################################
 
+import os
 import pandas as pd
 import datetime as dt
 
+from rfm import (AudienceIndex, Instrument, assign_segments, check_seg_map, explore, export_campaigns, load_campaigns,
+                 load_customers, Query, quintile_score)
+
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', None)
 pd.set_option('display.float_format', lambda x: '%.2f' % x)
 pd.set_option('display.width',1000)
 
+# Veri seti yolu: RFM_DATA ortam değişkeni verilmezse depodaki dataset/flo_data_20k.csv dosyası okunur.
+DATA_PATH = os.environ.get("RFM_DATA", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dataset",
+                                                    "flo_data_20k.csv"))
+
+# Tüm tablo üzerinde ek geçiş yapan tanılama çıktıları (describe, isnull, info) yalnızca RFM_DIAGNOSTICS=1 ise yazdırılır.
+DIAGNOSTICS = os.environ.get("RFM_DIAGNOSTICS") == "1"
+
+# Aşama bazında süre, satır sayısı ve bellek değişimini toplayan ölçüm nesnesi.
+instrument = Instrument()
+
 
 ##############################################################################################################################
 # GÖREV 1: VERİYİ TANIMA VE HAZIRLAMA
@@ -55,8 +69,11 @@ pd.set_option('display.width',1000)
 # 1. Veri setini içe aktar
 ###############################################################
 
-# CSV dosyasını pandas DataFrame'ine oku.
-df_ = pd.read_csv("CRM_Analitigi/Dataset/flo_data_20K.csv")
+# CSV dosyasını açık şemayla (sabit tarih biçimi, kategorik kanallar, int32 sipariş sayaçları) DataFrame'e oku.
+# İlk çalıştırmada sütunsal bir önbellek yazılır; sonraki çalıştırmalarda CSV yerine bu önbellek belleğe eşlenerek okunur.
+with instrument.stage("load") as record:
+    df_ = load_customers(DATA_PATH)
+    record.rows = len(df_)
 # Orijinal DataFrame'in bir kopyasını oluştur.
 df = df_.copy()
 
@@ -64,28 +81,9 @@ df = df_.copy()
 # 2. Veri keşfi
 ###############################################################
 
-# Veri setinin ilk 10 satırını yazdır.
-print("\nFirst 10 rows:")
-print(df.head(10), "\n")
-
-# Sütun isimlerini yazdır.
-print("\nColumn names:")
-print(df.columns, "\n")
-
-# Veri setinin boyutlarını (satır ve sütun sayısı) yazdır.
-print("\nShape of dataset (rows, columns):", df.shape, "\n")
-
-# Betimsel istatistikleri (sayısal sütunlar için) yazdır.
-print("\nDescriptive statistics:")
-print(df.describe().T, "\n")
-
-# Her sütundaki eksik (NaN) değerlerin sayısını yazdır.
-print("\nMissing values by column:")
-print(df.isnull().sum(), "\n")
-
-# Veri setinin sütunları, eksik olmayan değer sayısı ve veri tipleri hakkında bilgi yazdır.
-print("\nData types:")
-print(df.info(), "\n")
+# İlk 10 satırı, sütun isimlerini ve veri setinin boyutlarını yazdır.
+# DIAGNOSTICS açıksa betimsel istatistikleri, eksik değer sayılarını ve veri tiplerini de yazdır.
+explore(df, diagnostics=DIAGNOSTICS, instrument=instrument)
 
 ###############################################################
 # 3. Özellik Mühendisliği: Müşteri bazında toplam sipariş sayısı ve toplam harcama
@@ -98,39 +96,47 @@ df["customer_value_total"] = df["customer_value_total_ever_offline"] + df["custo
 # 4. Tarih değişkenlerini datetime tipine çevir
 ###############################################################
 
-# Sütun isimleri içinde "date" geçenleri seç.
+# Sütun isimleri içinde "date" geçenleri seç (load_customers ile okunduğunda bu sütunlar zaten datetime tipindedir).
 date_columns = df.columns[df.columns.str.contains("date")]
 # Seçilen sütunları datetime tipine çevir.
 df[date_columns] = df[date_columns].apply(pd.to_datetime)
 
+# 5, 6 ve 7. adımlardaki özetler tek bir sorgu planında toplanır ve tablo üzerinde tek geçişte hesaplanır (rfm/query.py).
+# İlk 10 listeleri için tablo sıralanmaz; her blokta yalnızca en büyük 10 değer seçilir.
+summary = (Query(df)
+           # Her kanal için müşteri sayısı, toplam sipariş sayısı, toplam harcama
+           .groupby("order_channel", {"master_id": "count",
+                                      "order_num_total": "sum",
+                                      "customer_value_total": "sum"}, name="channels")
+           # "customer_value_total" değeri en yüksek 10 müşteri
+           .top_k("customer_value_total", 10, name="top_revenue")
+           # "order_num_total" değeri en yüksek 10 müşteri
+           .top_k("order_num_total", 10, name="top_orders")
+           .collect())
+
 ###############################################################
 # 5. Kanal bazında dağılım
 ###############################################################
 
-# order_channel sütununa göre gruplama yap.
+# order_channel sütununa göre gruplanmış müşteri sayısı, toplam sipariş sayısı ve toplam harcama.
 print("\nDistribution by order channel:")
-# Her kanal için müşteri sayısı, toplam sipariş sayısı),toplam harcama hesapla.
-print(df.groupby("order_channel").agg({"master_id": "count",
-                                       "order_num_total": "sum",
-                                       "customer_value_total": "sum"}), "\n")
+print(summary["channels"], "\n")
 
 ###############################################################
 # 6. En çok gelir getiren ilk 10 müşteri
 ###############################################################
 
-# "customer_value_total" sütununa göre DataFrame'i azalan sırada sırala.
-# İlk 10 satırı seç.
+# "customer_value_total" sütununa göre azalan sırada ilk 10 satır.
 print("\nTop 10 customers by total revenue:")
-print(df.sort_values("customer_value_total", ascending=False).head(10), "\n")
+print(summary["top_revenue"], "\n")
 
 ###############################################################
 # 7. En çok sipariş veren ilk 10 müşteri
 ###############################################################
 
-# "order_num_total" sütununa göre DataFrame'i azalan sırada sırala.
-# İlk 10 satırı seç.
+# "order_num_total" sütununa göre azalan sırada ilk 10 satır.
 print("\nTop 10 customers by total number of orders:")
-print(df.sort_values("order_num_total", ascending=False).head(10), "\n")f
+print(summary["top_orders"], "\n")
 
 
 
@@ -181,12 +187,14 @@ print(rfm.head(), "\n")
 # 1. Recency, Frequency, Monetary skorlarının hesaplanması
 ###############################################################
 
+# quintile_score, pd.qcut ile aynı sonucu verir; kantil sınırlarını sıralama yerine seçimle (O(n)) bulur.
 # Recency skorunu hesapla: Değerleri 5 gruba ayır ve 5 en iyi (en düşük recency) olacak şekilde etiketle.
-rfm["recency_score"] = pd.qcut(rfm["recency"], 5, labels=[5, 4, 3, 2, 1])
-# Frequency skorunu hesapla: Değerlerin rank'ını al, 5 gruba ayır ve 5 en iyi (en yüksek frequency) olacak şekilde etiketle.
-rfm["frequency_score"] = pd.qcut(rfm["frequency"].rank(method="first"), 5, labels=[1, 2, 3, 4, 5])
+rfm["recency_score"] = quintile_score(rfm["recency"], [5, 4, 3, 2, 1])
+# Frequency skorunu hesapla: Eşit değerleri rank(method="first") gibi satır sırasına göre bölerek 5 gruba ayır
+# ve 5 en iyi (en yüksek frequency) olacak şekilde etiketle.
+rfm["frequency_score"] = quintile_score(rfm["frequency"], [1, 2, 3, 4, 5], ties="first")
 # Monetary skorunu hesapla: Değerleri 5 gruba ayır ve 5 en iyi (en yüksek monetary) olacak şekilde etiketle.
-rfm["monetary_score"] = pd.qcut(rfm["monetary"], 5, labels=[1, 2, 3, 4, 5])
+rfm["monetary_score"] = quintile_score(rfm["monetary"], [1, 2, 3, 4, 5])
 
 ###############################################################
 # 2. RF_SCORE oluşturma
@@ -235,21 +243,24 @@ seg_map = {
 }
 
 # rfm DataFrame'ine "segment" adında yeni bir sütun ekle.
-# RF_SCORE sütunundaki değerleri seg_map sözlüğünü kullanarak segment isimleriyle değiştir.
-# regex=True parametresi, anahtarların regex desenleri olarak kullanılmasını sağlar.
-rfm["segment"] = rfm["RF_SCORE"].replace(seg_map, regex=True)
+# seg_map bir kez (recency_score, frequency_score) ile indekslenen 5x5'lik bir arama tablosuna derlenir;
+# segmentler satır başına regex/string işlemi yapılmadan kategorik sütun olarak atanır.
+rfm["segment"] = assign_segments(rfm["recency_score"], rfm["frequency_score"], seg_map)
+
+# seg_map desenlerinde çakışma veya boşluk olup olmadığını kontrol et (regex sırası bu durumları sessizce belirler).
+print("\nseg_map coverage check:", check_seg_map(seg_map))
 
 # Segment bilgisi eklenmiş DataFrame'in ilk 5 satırını yazdır.
 print("\nFirst 5 rows of RFM with segments:\n")
 print(rfm.head())
 
 # First 5 rows of RFM with segments:
-#                            customer_id  recency  frequency  monetary recency_score frequency_score monetary_score RF_SCORE RFM_SCORE          segment
-# 0  cc294636-19f0-11eb-8d74-000d3a38a36f       95       5.00    939.37             3               4              4       34       344  loyal_customers
-# 1  f431bd5a-ab7b-11e9-a2fc-000d3a38a36f      105      21.00   2013.55             3               5              5       35       355  loyal_customers
-# 2  69b69676-1a40-11ea-941b-000d3a38a36f      186       5.00    585.32             2               4              3       24       243          at_Risk
-# 3  1854e56c-491f-11eb-806e-000d3a38a36f      135       2.00    121.97             3               1              1       31       311   about_to_sleep
-# 4  d6ea1074-f1f5-11e9-9346-000d3a38a36f       86       2.00    209.98             3               1              1       31       311   about_to_sleep
+#                             customer_id  recency  frequency  monetary recency_score frequency_score monetary_score RF_SCORE RFM_SCORE          segment
+# 0  cc294636-19f0-11eb-8d74-000d3a38a36f       95          5    939.37             3               4              4       34       344  loyal_customers
+# 1  f431bd5a-ab7b-11e9-a2fc-000d3a38a36f      105         21   2013.55             3               5              5       35       355  loyal_customers
+# 2  69b69676-1a40-11ea-941b-000d3a38a36f      186          5    585.32             2               4              3       24       243          at_Risk
+# 3  1854e56c-491f-11eb-806e-000d3a38a36f      135          2    121.97             3               1              1       31       311   about_to_sleep
+# 4  d6ea1074-f1f5-11e9-9346-000d3a38a36f       86          2    209.98             3               1              1       31       311   about_to_sleep
 
 
 
@@ -265,8 +276,10 @@ print("\nSegment statistics (mean values and counts):\n")
 # RFM DataFrame'inden segment, recency, frequency ve monetary sütunlarını seç.
 # "segment" sütununa göre gruplama yap.
 # Her grup için recency, frequency ve monetary sütunlarının ortalamasını (mean) ve sayısını (count) hesapla.
-print(rfm[["segment", "recency", "frequency", "monetary"]]
-      .groupby("segment").agg(["mean", "count"]), "\n")
+# segment kategorik olduğundan satırlar alfabetik değil, seg_map sırasıyla yazdırılır.
+print(Query(rfm)
+      .groupby("segment", {column: ["mean", "count"] for column in ["recency", "frequency", "monetary"]})
+      .collect()["segment_stats"], "\n")
 
 
 #   Segment statistics (mean values and counts):
@@ -274,16 +287,16 @@ print(rfm[["segment", "recency", "frequency", "monetary"]]
 #                     recency       frequency       monetary      
 #                        mean count      mean count     mean count
 # segment                                                         
-# about_to_sleep       113.79  1629      2.40  1629   359.01  1629
+# hibernating          247.95  3604      2.39  3604   366.27  3604
 # at_Risk              241.61  3131      4.47  3131   646.61  3131
 # cant_loose           235.44  1200     10.70  1200  1474.47  1200
-# champions             17.11  1932      8.93  1932  1406.63  1932
-# hibernating          247.95  3604      2.39  3604   366.27  3604
-# loyal_customers       82.59  3361      8.37  3361  1216.82  3361
+# about_to_sleep       113.79  1629      2.40  1629   359.01  1629
 # need_attention       113.83   823      3.73   823   562.14   823
+# loyal_customers       82.59  3361      8.37  3361  1216.82  3361
+# promising             58.92   647      2.00   647   335.67   647
 # new_customers         17.92   680      2.00   680   339.96   680
 # potential_loyalists   37.16  2938      3.30  2938   533.18  2938
-# promising             58.92   647      2.00   647   335.67   647 
+# champions             17.11  1932      8.93  1932  1406.63  1932
 
 
 ###############################################################
@@ -294,16 +307,12 @@ print(rfm[["segment", "recency", "frequency", "monetary"]]
 # kadın kategorisinden alışveriş yapan kişiler olması planlandı. Müşterilerin id numaralarını csv dosyasına yeni_marka_hedef_müşteri_id.cvs
 # olarak kaydediniz
 
-# "champions" ve "loyal_customers" segmentlerindeki müşteri ID'lerini seç.
-target_segments_customer_ids = rfm[rfm["segment"].isin(["champions", "loyal_customers"])]["customer_id"]
-# Seçilen segmentlerdeki ve "KADIN" kategorisiyle ilgilenen müşteri ID'lerini filtrele.
-cust_ids = df[(df["master_id"].isin(target_segments_customer_ids)) &
-              (df["interested_in_categories_12"].str.contains("KADIN"))]["master_id"]
+# Kategori listelerini bir kez bit maskelerine çevir ve segmentlere göre satır indeksini oluştur.
+# Sorgular metin taraması ve master_id birleştirmesi yerine bu indeks üzerinden bit işlemleriyle çözülür.
+audience = AudienceIndex.from_frames(df, rfm)
 
-# Hedef müşteri ID'lerini CSV dosyasına kaydet.
-cust_ids.to_csv("yeni_marka_hedef_müşteri_id.csv", index=False)
-print("\nNew brand target customer IDs saved to yeni_marka_hedef_müşteri_id.csv")
-print("Number of customers:", cust_ids.shape[0])
+# Kampanyalar campaigns.json dosyasında tanımlıdır: "yeni_marka_hedef_müşteri_id" kitlesi "champions" ve
+# "loyal_customers" segmentlerindeki ve "KADIN" kategorisiyle ilgilenen müşterilerden oluşur.
 
 
 ###############################################################
@@ -313,17 +322,15 @@ print("Number of customers:", cust_ids.shape[0])
 # alışveriş yapmayan ve yeni gelen müşteriler özel olarak hedef alınmak isteniliyor. Uygun profildeki müşterilerin id'lerini csv dosyasına indirim_hedef_müşteri_ids.csv
 # olarak kaydediniz.
 
-# "cant_loose", "hibernating", "new_customers" segmentlerindeki müşteri ID'lerini seç.
-target_segments_customer_ids = rfm[rfm["segment"].isin(["cant_loose", "hibernating", "new_customers"])]["customer_id"]
-# Seçilen segmentlerdeki ve "ERKEK" veya "COCUK" kategorileriyle ilgilenen müşteri ID'lerini filtrele.
-cust_ids = df[(df["master_id"].isin(target_segments_customer_ids)) &
-              ((df["interested_in_categories_12"].str.contains("ERKEK")) |
-               (df["interested_in_categories_12"].str.contains("COCUK")))]["master_id"]
+# campaigns.json dosyasındaki "indirim_hedef_müşteri_ids" kitlesi "cant_loose", "hibernating", "new_customers"
+# segmentlerindeki ve "ERKEK" veya "COCUK" kategorileriyle ilgilenen müşterilerden oluşur.
+# (str.contains ile olduğu gibi "COCUK", "AKTIFCOCUK" kategorisini de kapsar.)
 
-# Hedef müşteri ID'lerini CSV dosyasına kaydet.
-cust_ids.to_csv("indirim_hedef_müşteri_ids.csv", index=False)
-print("\nDiscount campaign target customer IDs saved to indirim_hedef_müşteri_ids.csv")
-print("Number of customers:", cust_ids.shape[0])
+# Tanım dosyasındaki tüm kitleleri tek geçişte seç, CSV dosyalarını paralel yaz ve müşteri sayılarını yazdır.
+campaigns = load_campaigns(os.path.join(os.path.dirname(os.path.abspath(__file__)), "campaigns.json"))
+campaign_report = export_campaigns(campaigns, audience)
+print("\nCampaign target customer IDs saved:")
+print(campaign_report.to_string(index=False))
 
 
 
@@ -331,55 +338,16 @@ print("Number of customers:", cust_ids.shape[0])
 # BONUS: TÜM SÜRECİ FONKSİYONLAŞTIRMA
 ##############################################################################################################################
 
-def create_rfm(dataframe):
-    """RFM segmentasyon veri çerçevesi oluşturur"""
-
-    # Veri hazırlama: Toplam sipariş sayısı ve toplam harcama hesapla
-    dataframe["order_num_total"] = (dataframe["order_num_total_ever_online"] +
-                                    dataframe["order_num_total_ever_offline"])
-    dataframe["customer_value_total"] = (dataframe["customer_value_total_ever_offline"] +
-                                         dataframe["customer_value_total_ever_online"])
-    
-    # Tarih değişkenlerini datetime tipine çevir
-    date_columns = dataframe.columns[dataframe.columns.str.contains("date")]
-    dataframe[date_columns] = dataframe[date_columns].apply(pd.to_datetime)
-
-    # Analiz tarihi: Son alışveriş tarihinden 2 gün sonrası
-    analysis_date = dt.datetime(2021, 6, 1)
-
-    # RFM metrikleri: Recency, Frequency ve Monetary değerlerini hesapla
-    rfm = pd.DataFrame()
-    rfm["customer_id"] = dataframe["master_id"]
-    rfm["recency"] = (analysis_date - dataframe["last_order_date"]).dt.days # Gün farkını hesapla
-    rfm["frequency"] = dataframe["order_num_total"] # Toplam sipariş sayısı
-    rfm["monetary"] = dataframe["customer_value_total"] # Toplam harcama
-
-    # Skorlar: Recency, Frequency, Monetary skorlarını hesapla ve birleştir
-    rfm["recency_score"] = pd.qcut(rfm['recency'], 5, labels=[5, 4, 3, 2, 1]) # Recency skoru (ters)
-    rfm["frequency_score"] = pd.qcut(rfm['frequency'].rank(method="first"), 5, labels=[1, 2, 3, 4, 5]) # Frequency skoru (rank ile)
-    rfm["monetary_score"] = pd.qcut(rfm['monetary'], 5, labels=[1, 2, 3, 4, 5]) # Monetary skoru
-    rfm["RF_SCORE"] = (rfm['recency_score'].astype(str) + rfm['frequency_score'].astype(str)) # RF skoru
-    rfm["RFM_SCORE"] = (rfm['recency_score'].astype(str) + rfm['frequency_score'].astype(str) + rfm['monetary_score'].astype(str)) # RFM skoru
-
-    # Segmentler: RF_SCORE'a göre müşteri segmentlerini ata
-    seg_map = {
-        r'[1-2][1-2]': 'hibernating',
-        r'[1-2][3-4]': 'at_Risk',
-        r'[1-2]5': 'cant_loose',
-        r'3[1-2]': 'about_to_sleep',
-        r'33': 'need_attention',
-        r'[3-4][4-5]': 'loyal_customers',
-        r'41': 'promising',
-        r'51': 'new_customers',
-        r'[4-5][2-3]': 'potential_loyalists',
-        r'5[4-5]': 'champions'
-    }
-    rfm['segment'] = rfm['RF_SCORE'].replace(seg_map, regex=True) # Segment isimlerini ata
-
-    # İstenen sütunları içeren RFM DataFrame'ini döndür
-    return rfm[["customer_id", "recency", "frequency", "monetary", "RF_SCORE", "RFM_SCORE", "segment"]]
+# create_rfm fonksiyonu rfm/core.py içinde tanımlıdır ve bu betiği çalıştırmadan "from rfm import create_rfm" ile içe
+# aktarılabilir; büyük veri setleri için parça parça çalışan create_rfm_streaming (rfm/streaming.py) aynı çıktıyı sınırlı
+# bellekle üretir. Zamanlanmış işler için: python -m rfm score / export / stats (rfm/cli.py).
+from rfm import create_rfm
 
 # Fonksiyonu çalıştır ve sonucu yeni bir DataFrame'e ata
-rfm_df = create_rfm(df)
+rfm_df = create_rfm(df, instrument=instrument)
 print("\nFinal RFM dataframe created with segments:\n")
 print(rfm_df.head(),"\n")
+
+# Aşama bazında çalıştırma raporunu yazdır.
+print("\nRun report:\n")
+print(instrument.report)
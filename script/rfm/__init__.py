@@ -0,0 +1,39 @@
+# Paketteki isimler ilk kullanıldıklarında içe aktarılır: "import rfm" pandas / numpy yüklemez, böylece komut satırı
+# (python -m rfm --help) ve küçük işler hızlı başlar. "from rfm import create_rfm" yalnızca rfm.core ve bağımlılıklarını
+# yükler; hiçbir modül içe aktarılırken veri okumaz veya çıktı yazmaz.
+
+import importlib
+
+_EXPORTS = {
+    "rfm.audience": ["AudienceIndex", "parse_categories"],
+    "rfm.binning": ["QuantileBinner", "exact_quantiles"],
+    "rfm.campaigns": ["Campaign", "CampaignSpec", "export_campaigns", "load_campaigns", "parse_campaigns"],
+    "rfm.compact": ["CompactRFM", "decode_uuids", "encode_uuids", "memory_report"],
+    "rfm.core": ["ANALYSIS_DATE", "RFM_COLUMNS", "create_rfm", "explore", "quintile_score"],
+    "rfm.history": ["SnapshotStore"],
+    "rfm.incremental": ["RFMState", "UpdateResult", "apply_delta", "build_state", "read_delta"],
+    "rfm.instrument": ["Instrument", "RunReport", "StageRecord"],
+    "rfm.ingest": ["load_customers", "read_customers_csv"],
+    "rfm.parallel": ["create_rfm_parallel", "split_csv"],
+    "rfm.query": ["Query"],
+    "rfm.segments": ["SEG_MAP", "assign_segments", "check_seg_map", "compile_seg_map"],
+    "rfm.store": ["SegmentStore"],
+    "rfm.streaming": ["create_rfm_streaming", "fit_cut_points", "iter_rfm_chunks"],
+    "rfm.synthetic": ["generate_customers", "write_synthetic_csv"],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Sonraki erişimler __getattr__'a uğramaz
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,185 @@
+##############################################################################################################################
+# Kampanya Hedef Kitle Sorguları (Kategori Bit Maskesi İndeksi)
+##############################################################################################################################
+
+# Kampanya seçimleri her sorguda interested_in_categories_12 sütunu üzerinde str.contains ile tam bir metin taraması
+# ve master_id üzerinden isin birleştirmesi yapar. AudienceIndex kategori listesini bir kez ayrıştırarak her müşteri
+# için bir tamsayı bit maskesine çevirir ve her segmentin satır konumlarını önceden gruplar. Sorgular yalnızca seçilen
+# segmentlerin satırlarına bakar ve kategori koşullarını bit işlemleriyle çözer.
+#
+# Eşleştirme: str.contains("COCUK") "AKTIFCOCUK" kategorisini de yakalar. Aynı sonuçları vermek için sorgudaki
+# kategori adı varsayılan olarak adında bu metni içeren tüm kategorilerin bitlerine genişletilir (COCUK -> COCUK,
+# AKTIFCOCUK). exact=True ile yalnızca birebir aynı isimli kategori eşleştirilir.
+#
+# Çok sayıda kampanya için select_many, her satırın (segment, kategori maskesi, kanal, son kanal) bileşimini bir kez
+# kodlar. Koşullar yalnızca birkaç yüz farklı bileşim üzerinde değerlendirilir; her kampanyanın maliyeti tablo
+# boyutuna değil kendi sonuç boyutuna bağlıdır.
+
+import numpy as np
+import pandas as pd
+
+
+def parse_categories(categories):
+    """"[KADIN, ERKEK]" biçimindeki kategori listelerini (bit maskeleri, kategori sözlüğü) ikilisine çevirir"""
+    # Her farklı liste yalnızca bir kez ayrıştırılır
+    codes, uniques = pd.factorize(pd.Series(categories), use_na_sentinel=False)
+    tokens = [[token.strip() for token in str(value).strip("[]").split(",") if token.strip()]
+              if isinstance(value, str) else [] for value in uniques]
+    vocabulary = tuple(sorted({token for value_tokens in tokens for token in value_tokens}))
+    if len(vocabulary) > 64:
+        raise ValueError(f"At most 64 categories are supported, got {len(vocabulary)}.")
+    bits = {token: np.uint64(1) << np.uint64(i) for i, token in enumerate(vocabulary)}
+    unique_masks = np.array([sum(int(bits[token]) for token in value_tokens) for value_tokens in tokens],
+                            dtype=np.uint64)
+    return unique_masks[codes], vocabulary
+
+
+# select parametrelerinden isim listesi alanlar
+NAME_FIELDS = ("segments", "categories_any", "categories_all", "channels", "last_channels")
+
+
+def _factorize(values):
+    """Kanal gibi kategorik bir sütunu (isimler, kodlar) ikilisine çevirir; sütun verilmemişse ((), None)"""
+    if values is None:
+        return (), None
+    values = pd.Categorical(values)
+    return tuple(values.categories), values.codes.astype(np.int64)
+
+
+def _check_names(query):
+    """Sorgudaki isim listesi alanlarının (segments, categories_*, channels) liste olduğunu doğrular"""
+    for kind in NAME_FIELDS:
+        value = query.get(kind)
+        if value is not None and (isinstance(value, (str, bytes)) or not isinstance(value, (list, tuple, set))):
+            raise TypeError(f"{kind} must be a list of names, got {value!r}.")
+
+
+def _member(codes, names, wanted, kind):
+    """codes içindeki değerlerin wanted isimlerinden biri olup olmadığını döndürür"""
+    unknown = set(wanted) - set(names)
+    if unknown:
+        raise KeyError(f"Unknown {kind}: {sorted(unknown)}")
+    return np.isin(codes, [names.index(name) for name in wanted])
+
+
+class AudienceIndex:
+    """Segment ve kategori koşullarıyla müşteri seçimi için indeks"""
+
+    def __init__(self, customer_ids, segment, categories, index=None, channels=None, last_channels=None):
+        self.customer_ids = pd.array(customer_ids)  # Sonuçlar take ile, metinleri yeniden dönüştürmeden üretilir
+        self.index = pd.RangeIndex(len(self.customer_ids)) if index is None else index
+        self.masks, self.vocabulary = parse_categories(categories)
+        self.channels, self.channel_codes = _factorize(channels)
+        self.last_channels, self.last_channel_codes = _factorize(last_channels)
+
+        # Segment indeksi: segment kodu -> o segmentteki satır konumları (artan sırada)
+        segment = pd.Categorical(segment)
+        self.segments = tuple(segment.categories)
+        codes = segment.codes
+        self.segment_codes = codes
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(self.segments) + 1))
+        self._positions = {name: order[bounds[i]:bounds[i + 1]] for i, name in enumerate(self.segments)}
+        self._groups = None
+
+    @classmethod
+    def from_frames(cls, dataframe, rfm):
+        """Müşteri tablosu ve create_rfm çıktısından indeksi oluşturur (birleştirme yalnızca burada bir kez yapılır)"""
+        segment = rfm["segment"]
+        if not np.array_equal(rfm["customer_id"].to_numpy(), dataframe["master_id"].to_numpy()):
+            position = pd.Index(rfm["customer_id"]).get_indexer(dataframe["master_id"])
+            segment = pd.Categorical(segment).take(position, allow_fill=True)
+        return cls(dataframe["master_id"], segment, dataframe["interested_in_categories_12"], index=dataframe.index,
+                   channels=dataframe.get("order_channel"), last_channels=dataframe.get("last_order_channel"))
+
+    def category_mask(self, names, exact=False):
+        """Kategori isimlerinin bit maskesini döndürür"""
+        mask = 0
+        for name in names:
+            matches = [i for i, category in enumerate(self.vocabulary)
+                       if (category == name if exact else name in category)]
+            for i in matches:
+                mask |= 1 << i
+        return np.uint64(mask)
+
+    def _keep(self, masks, channel_codes, last_channel_codes, categories_any=None, categories_all=None,
+              channels=None, last_channels=None, exact=False):
+        """Kategori ve kanal koşullarını sağlayan satırlar için True döndürür"""
+        keep = np.ones(len(masks), dtype=bool)
+        if categories_any:
+            keep &= (masks & self.category_mask(categories_any, exact)) != 0
+        if categories_all:
+            # Her kategori adı (genişletildiğinde) kendi bitlerinden en az biriyle eşleşmelidir
+            for name in categories_all:
+                keep &= (masks & self.category_mask([name], exact)) != 0
+        if channels:
+            keep &= _member(channel_codes, self.channels, channels, "channels")
+        if last_channels:
+            keep &= _member(last_channel_codes, self.last_channels, last_channels, "last channels")
+        return keep
+
+    def _result(self, positions):
+        return pd.Series(self.customer_ids.take(positions), index=self.index[positions], name="master_id")
+
+    def select(self, segments=None, categories_any=None, categories_all=None, exact=False, channels=None,
+               last_channels=None):
+        """Koşulları sağlayan müşterilerin master_id değerlerini (orijinal sırada) döndürür
+
+        segments       : Bu segmentlerden birindeki müşteriler
+        categories_any : Bu kategorilerden en az biriyle ilgilenen müşteriler
+        categories_all : Bu kategorilerin hepsiyle ilgilenen müşteriler
+        channels       : Bu kanallardan biriyle alışverişe başlayan müşteriler (order_channel)
+        last_channels  : Son alışverişini bu kanallardan birinden yapan müşteriler (last_order_channel)
+        """
+        _check_names({"segments": segments, "categories_any": categories_any, "categories_all": categories_all,
+                      "channels": channels, "last_channels": last_channels})
+        if segments is None:
+            positions = np.arange(len(self.customer_ids))
+        else:
+            unknown = set(segments) - set(self.segments)
+            if unknown:
+                raise KeyError(f"Unknown segments: {sorted(unknown)}")
+            groups = [self._positions[name] for name in segments]
+            positions = np.sort(np.concatenate(groups)) if groups else np.array([], dtype=np.int64)
+
+        keep = self._keep(self.masks[positions],
+                          None if self.channel_codes is None else self.channel_codes[positions],
+                          None if self.last_channel_codes is None else self.last_channel_codes[positions],
+                          categories_any, categories_all, channels, last_channels, exact)
+        return self._result(positions[keep])
+
+    def _combinations(self):
+        """Satırları (segment, kategori maskesi, kanal, son kanal) bileşimlerine göre bir kez gruplar"""
+        if self._groups is None:
+            n = len(self.customer_ids)
+            channel_codes = np.zeros(n, dtype=np.int64) if self.channel_codes is None else self.channel_codes
+            last_channel_codes = np.zeros(n, dtype=np.int64) if self.last_channel_codes is None else self.last_channel_codes
+            mask_codes, mask_uniques = pd.factorize(self.masks)
+            # Bileşenler küçük tamsayı kodlarıdır; tek bir int64 anahtarda birleştirilir (-1 kodları için +1)
+            sizes = [len(self.segments) + 1, len(mask_uniques), max(len(self.channels), 1) + 1,
+                     max(len(self.last_channels), 1) + 1]
+            key = np.ravel_multi_index([self.segment_codes.astype(np.int64) + 1, mask_codes, channel_codes + 1,
+                                        last_channel_codes + 1], sizes)
+            combo_codes, combo_keys = pd.factorize(key)
+            segment, mask, channel, last_channel = np.unravel_index(combo_keys, sizes)
+            order = np.argsort(combo_codes, kind="stable")
+            bounds = np.searchsorted(combo_codes[order], np.arange(len(combo_keys) + 1))
+            self._groups = {"segment": segment - 1, "masks": mask_uniques[mask], "channel": channel - 1,
+                            "last_channel": last_channel - 1, "order": order, "bounds": bounds}
+        return self._groups
+
+    def select_many(self, queries):
+        """Birden çok select sorgusunu (anahtar kelime sözlükleri) tek geçişte değerlendirir; Series listesi döndürür"""
+        groups = self._combinations()
+        results = []
+        for query in queries:
+            _check_names(query)
+            query = dict(query)
+            segments = query.pop("segments", None)
+            keep = self._keep(groups["masks"], groups["channel"], groups["last_channel"], **query)
+            if segments is not None:
+                keep &= _member(groups["segment"], self.segments, segments, "segments")
+            order, bounds = groups["order"], groups["bounds"]
+            positions = [order[bounds[i]:bounds[i + 1]] for i in np.flatnonzero(keep)]
+            results.append(self._result(np.sort(np.concatenate(positions)) if positions else np.array([], dtype=np.int64)))
+        return results
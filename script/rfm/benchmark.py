@@ -0,0 +1,266 @@
+##############################################################################################################################
+# RFM İşlem Hattı Performans Ölçümü (Benchmark)
+##############################################################################################################################
+
+# create_rfm aşamalarını (rfm.instrument) ve kampanya seçimlerini sentetik veri üzerinde ayrı ayrı ölçer. Her adım
+# için duvar saati süresi, bellek kullanımı ve saniye başına satır sayısı bir JSON dosyasına yazılır. İki sürümün
+# sonuçları tek komutla karşılaştırılabilir.
+#
+# Her ölçüm turu yeni bir süreçte çalışır, böylece bellek değerleri önceki turlardan etkilenmez:
+#
+# peak_mb        : Süreç başından adım sonuna kadarki en yüksek RSS (ru_maxrss). tracemalloc'un göremediği Arrow /
+#                  pyarrow ayırmalarını da içerir; turlar arasındaki en yüksek değer yazılır. parallel modunda yalnızca
+#                  ana süreci kapsar (işçiler ayrı süreçlerdir).
+# rss_delta_mb   : Adım boyunca RSS değişimi (en hızlı turdan)
+# traced_peak_mb : Adım içindeki en yüksek Python / numpy ayırması (tracemalloc, ayrı turda; --no-memory ile atlanır)
+#
+# mode alanı ölçülen işlem hattını gösterir: "in_memory" (okuma, create_rfm aşamaları ve kampanyalar), "streaming"
+# (yalnızca create_rfm_streaming, kampanya ölçümü yok) veya "parallel" (--parallel). compare yalnızca aynı boyut, mod ve
+# adımları eşleştirir; tek dosyada bulunan adımları ayrıca bildirir.
+#
+# Kullanım (script/ dizininden):
+#
+#   python -m rfm.benchmark run --sizes 20k 1m 10m 50m --output bench.json
+#   python -m rfm.benchmark compare bench_old.json bench.json
+#
+# Sentetik veri dosyaları --data-dir dizininde (varsayılan: .rfm_bench) saklanır ve sonraki çalıştırmalarda
+# yeniden kullanılır. Süre ve bellek ayrı turlarda ölçülür; tracemalloc süre ölçümlerini etkilemez.
+#
+# Veri, işlem hattının kendi okuma katmanıyla (load_customers) okunur: load_cold boş önbellekle (CSV ayrıştırma, dosya
+# özeti ve önbellek yazımı), load_warm dolu önbellekten okumayı ölçer. Tablonun tamamı bellekte tutulduğundan bu ölçüm
+# IN_MEMORY_MAX_ROWS satıra kadar yapılır. Daha büyük boyutlarda (ör. 50m) sınırlı bellekle çalışan
+# create_rfm_streaming ölçülür; tam tabloyu belleğe sığdıracak kadar RAM'i olan makinelerde --in-memory ile bellek içi
+# ölçüm zorlanabilir (50M satır için yaklaşık 25 GB).
+#
+# --parallel 1 2 4 8 16 verilirse her boyutta create_rfm_parallel bu işçi sayılarıyla ayrıca ölçülür (sonuçlar dosyaya
+# yazılarak). parallel_jobs_<n> adımlarının speedup alanı ilk verilen işçi sayısındaki süreye oranı gösterir; çekirdek sayısı
+# sonuçlardaki cpu_count alanından okunabilir:
+#
+#   python -m rfm.benchmark run --sizes 20m --parallel 1 2 4 8 16 --no-memory --repeat 1
+
+import argparse
+import datetime as dt
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from rfm.audience import AudienceIndex
+from rfm.core import create_rfm
+from rfm.ingest import load_customers
+from rfm.instrument import Instrument
+from rfm.parallel import create_rfm_parallel
+from rfm.streaming import create_rfm_streaming
+from rfm.synthetic import write_synthetic_csv
+
+SIZES = {"20k": 20_000, "1m": 1_000_000, "10m": 10_000_000, "50m": 50_000_000}
+DEFAULT_DATA_DIR = ".rfm_bench"
+IN_MEMORY_MAX_ROWS = 10_000_000
+
+
+def parse_size(size):
+    """"20k", "1m" ya da "250000" biçimindeki boyutu satır sayısına çevirir"""
+    size = size.lower()
+    if size in SIZES:
+        return SIZES[size]
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(size[-1], 1)
+    return int(float(size.rstrip("km")) * multiplier)
+
+
+##############################################################################################################################
+# Ölçüm ve karşılaştırma
+##############################################################################################################################
+
+def _run_stages(path, trace_memory):
+    """Veri okuma (soğuk / sıcak önbellek), create_rfm aşamaları ve kampanya seçimlerini ölçer; aşama adı ->
+    StageRecord döndürür"""
+    instrument = Instrument(trace_memory=trace_memory)
+    cache_dir = os.path.join(os.path.dirname(path), ".rfm_cache")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    with instrument.stage("load_cold") as record:
+        df = load_customers(path, cache_dir=cache_dir)
+        record.rows = len(df)
+    del df
+    with instrument.stage("load_warm") as record:
+        df = load_customers(path, cache_dir=cache_dir)
+        record.rows = len(df)
+    rfm = create_rfm(df, instrument=instrument)
+    rows = len(df)
+    with instrument.stage("audience_index", rows):
+        audience = AudienceIndex.from_frames(df, rfm)
+    with instrument.stage("campaign_new_brand", rows):
+        audience.select(segments=["champions", "loyal_customers"], categories_any=["KADIN"])
+    with instrument.stage("campaign_discount", rows):
+        audience.select(segments=["cant_loose", "hibernating", "new_customers"], categories_any=["ERKEK", "COCUK"])
+    return {record.name: record for record in instrument.report.stages}
+
+
+def _run_streaming(path, trace_memory):
+    """Belleğe sığmayan boyutlarda create_rfm_streaming'i (sonuçlar dosyaya yazılarak) ölçer"""
+    instrument = Instrument(trace_memory=trace_memory)
+    output_path = os.path.splitext(path)[0] + "_rfm.csv"
+    with instrument.stage("create_rfm_streaming"):
+        create_rfm_streaming(path, output_path=output_path)
+    os.remove(output_path)
+    return {record.name: record for record in instrument.report.stages}
+
+
+def _run_parallel(path, trace_memory, n_jobs):
+    """create_rfm_parallel'i verilen işçi sayılarıyla (sonuçlar dosyaya yazılarak) ölçer"""
+    instrument = Instrument(trace_memory=trace_memory)
+    output_path = os.path.splitext(path)[0] + "_rfm.csv"
+    for jobs in n_jobs:
+        with instrument.stage(f"parallel_jobs_{jobs}"):
+            create_rfm_parallel(path, output_path=output_path, n_jobs=jobs)
+    os.remove(output_path)
+    return {record.name: record for record in instrument.report.stages}
+
+
+def _child(connection, run, path, trace_memory, args):
+    connection.send(run(path, trace_memory, *args))
+    connection.close()
+
+
+def _in_subprocess(run, path, trace_memory, *args):
+    """run'ı yeni bir süreçte çalıştırır ve aşama kayıtlarını döndürür (ru_maxrss yalnızca bu turu yansıtır)"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(sender, run, path, trace_memory, args))
+    process.start()
+    sender.close()
+    try:
+        return receiver.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(f"benchmark process for {path} exited with code {process.exitcode}") from None
+    finally:
+        process.join()
+
+
+def run_benchmark(sizes, data_dir=DEFAULT_DATA_DIR, repeat=3, memory=True, seed=0, in_memory=False, parallel=None):
+    """Her boyut ve adım için süre, bellek ve satır/sn ölçümlerini döndürür
+
+    IN_MEMORY_MAX_ROWS'tan büyük boyutlarda in_memory=True verilmedikçe create_rfm_streaming ölçülür. parallel bir işçi
+    sayısı listesiyse create_rfm_parallel her işçi sayısı için ayrıca ölçülür.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    for n in sizes:
+        path = os.path.join(data_dir, f"synthetic_{n}_{seed}.csv")
+        if not os.path.exists(path):
+            write_synthetic_csv(path + ".tmp", n, seed=seed)
+            os.replace(path + ".tmp", path)
+
+        if in_memory or n <= IN_MEMORY_MAX_ROWS:
+            runs = [("in_memory", _run_stages, ())]
+        else:
+            runs = [("streaming", _run_streaming, ())]
+        if parallel:
+            runs.append(("parallel", _run_parallel, (parallel,)))
+        for mode, run, args in runs:
+            timings = [_in_subprocess(run, path, False, *args) for _ in range(repeat)]
+            traced = _in_subprocess(run, path, True, *args) if memory else {}
+            for name in timings[0]:
+                # Süre için en iyi (en kısa) tur, en yüksek RSS için en kötü tur
+                best = min(timings, key=lambda timing: timing[name].seconds)[name]
+                peaks = [timing[name].peak_rss_mb for timing in timings]
+                results.append({"rows": n,
+                                "mode": mode,
+                                "stage": name,
+                                "seconds": best.seconds,
+                                "peak_mb": None if None in peaks else max(peaks),
+                                "rss_delta_mb": best.rss_delta_mb,
+                                "traced_peak_mb": traced[name].peak_traced_mb if memory else None,
+                                "rows_per_sec": n / best.seconds if best.seconds > 0 else None})
+        if parallel:
+            # Hızlanma, ilk verilen işçi sayısındaki süreye göre
+            sweep = [result for result in results if result["rows"] == n and result["mode"] == "parallel"]
+            for result in sweep:
+                result["speedup"] = sweep[0]["seconds"] / result["seconds"] if result["seconds"] > 0 else None
+    return results
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"created": dt.datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()}
+
+
+def compare(base_path, new_path, threshold=0.10):
+    """İki benchmark sonucunu karşılaştırır; threshold oranından fazla yavaşlayan adımları işaretler"""
+    with open(base_path) as base_file, open(new_path) as new_file:
+        base = pd.DataFrame(json.load(base_file)["results"])
+        new = pd.DataFrame(json.load(new_file)["results"])
+    for results in (base, new):
+        if "mode" not in results:  # mode alanından önceki sonuç dosyaları
+            results["mode"] = "unknown"
+    table = base.merge(new, on=["rows", "mode", "stage"], how="outer", suffixes=("_base", "_new"), indicator=True)
+    table["only_in"] = table["_merge"].map({"left_only": "base", "right_only": "new", "both": ""})
+    table["ratio"] = table["seconds_new"] / table["seconds_base"]
+    table["regression"] = table["ratio"] > 1 + threshold
+    return table[["rows", "mode", "stage", "seconds_base", "seconds_new", "ratio", "peak_mb_base", "peak_mb_new",
+                  "only_in", "regression"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rfm.benchmark", description="RFM pipeline benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmark and write results to JSON")
+    run.add_argument("--sizes", nargs="+", default=["20k", "1m"], help="row counts, e.g. 20k 1m 10m 50m")
+    run.add_argument("--output", "-o", default="bench.json")
+    run.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--parallel", nargs="+", type=int, metavar="N_JOBS",
+                     help="also time create_rfm_parallel with these worker counts, e.g. 1 2 4 8 16")
+    run.add_argument("--in-memory", action="store_true",
+                     help=f"load the full table above {IN_MEMORY_MAX_ROWS:,} rows instead of timing the streaming mode")
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown ratio (default: 0.10)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run_benchmark([parse_size(size) for size in args.sizes], data_dir=args.data_dir,
+                                repeat=args.repeat, memory=not args.no_memory, seed=args.seed,
+                                in_memory=args.in_memory, parallel=args.parallel)
+        meta = _metadata()
+        meta["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        with open(args.output, "w") as file:
+            json.dump({"meta": meta, "results": results}, file, indent=2)
+        print(pd.DataFrame(results).to_string(index=False))
+        print(f"\nResults saved to {args.output}")
+        return 0
+
+    table = compare(args.base, args.new, threshold=args.threshold)
+    print(table.to_string(index=False))
+    regressions = int(table["regression"].sum())
+    unmatched = int((table["only_in"] != "").sum())
+    if unmatched:
+        print(f"\n{unmatched} stage(s) found in only one file (different sizes or modes), not compared")
+    print(f"\n{regressions} stage(s) slower than {args.threshold:.0%} threshold")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
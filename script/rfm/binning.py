@@ -0,0 +1,160 @@
+##############################################################################################################################
+# Kesin Kantil Skorlama Motoru (Tie-Aware Quantile Binning)
+##############################################################################################################################
+
+# pd.qcut her çağrıda sütunu sıralar (O(n log n)) ve frequency skoru için ayrıca rank(method="first") ile tam bir
+# sıralama yapılır. QuantileBinner kesin kantil sınırlarını seçim (np.partition, O(n)) ile bulur ve değerleri
+# np.searchsorted ya da vektörel karşılaştırmalarla aralıklara yerleştirir.
+#
+# Eşit değer (tie) politikaları:
+#
+# "raise"  : pd.qcut(values, q) ile aynı; tekrar eden sınır varsa ValueError fırlatır.
+# "drop"   : pd.qcut(values, q, duplicates="drop") ile aynı; tekrar eden sınırlar atılır, aralık sayısı azalabilir.
+# "first"  : pd.qcut(values.rank(method="first"), q) ile aynı; sınırdaki eşit değerler satır sırasına göre bölünür.
+# "spread" : "first" gibi aralıkları eşit büyüklükte tutar, ancak sınırdaki eşit değerleri (seed ile tekrarlanabilir)
+#            rastgele sırayla böler; dosyada önce gelen müşterilerin düşük skor alması önlenir.
+#
+# fit ile bulunan sınırlar to_dict/from_dict ile saklanıp yeni müşterileri skorlamak için tekrar kullanılabilir.
+# transform aralık dışındaki değerleri en yakın uç aralığa yerleştirir. "first" politikasında sınır değerine eşit yeni
+# müşteriler mevcut müşterilerden sonra gelmiş sayılır (üst aralık); "spread" politikasında ise sınırdaki eşit değerlerin
+# fit sırasındaki bölünme oranına göre rastgele yerleştirilir.
+#
+# Eksik değerler (NaN), pd.qcut'ta olduğu gibi sınırların hesabına katılmaz ve -1 kodunu alır
+# (pd.Categorical.from_codes -1 kodunu NaN olarak gösterir).
+
+import numpy as np
+
+from rfm.sketch import _lerp
+
+TIE_POLICIES = ("raise", "drop", "first", "spread")
+
+
+def exact_quantiles(values, qs):
+    """np.nanquantile (linear) ile aynı kantil değerlerini seçim (np.partition) ile O(n) sürede hesaplar"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]  # np.partition NaN'ları sona taşır ve tüm sıraları kaydırır
+    if not len(values):
+        raise ValueError("Cannot compute quantiles: all values are missing.")
+    qs = np.asarray(qs, dtype=np.float64)
+    positions = (len(values) - 1) * qs
+    low = np.floor(positions).astype(np.int64)
+    high = np.minimum(low + 1, len(values) - 1)
+    partitioned = np.partition(values, np.unique(np.concatenate([low, high])))
+    return _lerp(partitioned[low], partitioned[high], positions - low)
+
+
+class QuantileBinner:
+    """Değerleri q eşit kantil aralığına yerleştirir ve 0 tabanlı aralık numarasını döndürür"""
+
+    def __init__(self, q=5, ties="raise", seed=None):
+        if ties not in TIE_POLICIES:
+            raise ValueError(f"ties must be one of {TIE_POLICIES}, got {ties!r}.")
+        self.q = q
+        self.ties = ties
+        self.seed = seed
+        self.edges = None        # Değer cinsinden sınırlar (en küçük ve en büyük değer dahil)
+        self.tie_values = None   # "first"/"spread": iç sınırlardaki değerler
+        self.tie_share = None    # "first"/"spread": sınır değerine eşit olanların alt aralıkta kalan oranı
+        self.tie_rows = None     # "first": sınırdaki son alt aralık satırının konumu
+
+    @property
+    def n_bins(self):
+        return len(self.edges) - 1
+
+    def fit(self, values):
+        self._fit(np.asarray(values, dtype=np.float64))
+        return self
+
+    def fit_transform(self, values):
+        return self._fit(np.asarray(values, dtype=np.float64))
+
+    def _fit(self, values):
+        missing = np.isnan(values)
+        if missing.any():
+            # Sınırlar yalnızca eksik olmayan değerlerle bulunur; "first" satır konumları tüm veriye göre tutulur
+            valid = np.flatnonzero(~missing)
+            codes = np.full(len(values), -1, dtype=np.int64)
+            codes[valid] = self._fit(values[valid])
+            if self.tie_rows is not None:
+                self.tie_rows = valid[self.tie_rows]
+            return codes
+        if not len(values):
+            raise ValueError("Cannot bin: all values are missing.")
+        quantiles = np.linspace(0, 1, self.q + 1)
+
+        if self.ties in ("raise", "drop"):
+            edges = exact_quantiles(values, quantiles)
+            if len(np.unique(edges)) != len(edges):
+                if self.ties == "raise":
+                    raise ValueError(f"Bin edges must be unique: {edges!r}.")
+                edges = np.unique(edges)
+            self.edges = edges
+            return self.transform(values)
+
+        # qcut(rank(method="first"), q): sıra r, r > 1 + q_j * (n - 1) olan her sınırda bir üst aralığa geçer.
+        # r tamsayı olduğundan her sınır, sıralamadaki floor(1 + q_j * (n - 1)). elemanla ifade edilir.
+        n = len(values)
+        thresholds = np.floor(1 + quantiles[1:-1] * (n - 1)).astype(np.int64)
+        partitioned = np.partition(values, np.unique(np.concatenate([[0, n - 1], thresholds - 1])))
+        self.tie_values = partitioned[thresholds - 1]
+        self.edges = np.concatenate([[partitioned[0]], self.tie_values, [partitioned[n - 1]]])
+
+        codes = np.zeros(n, dtype=np.int64)
+        self.tie_share = np.empty(len(thresholds))
+        self.tie_rows = np.empty(len(thresholds), dtype=np.int64)
+        rng = np.random.default_rng(self.seed)
+        orders = {}  # Sınır değeri -> eşit değerli satırların bölünme sırası
+        for j, (threshold, value) in enumerate(zip(thresholds, self.tie_values)):
+            if value not in orders:
+                tied = np.flatnonzero(values == value)
+                orders[value] = tied if self.ties == "first" else tied[rng.permutation(len(tied))]
+            tied = orders[value]
+            below = threshold - np.count_nonzero(values < value)  # Eşit değerlilerden alt aralıkta kalan sayısı
+            self.tie_share[j] = below / len(tied)
+            self.tie_rows[j] = tied[below - 1]
+            codes += values > value
+            codes[tied[below:]] += 1
+        if self.ties == "spread":
+            self.tie_rows = None
+        return codes
+
+    def transform(self, values, rows=None):
+        """Değerleri sabitlenmiş sınırlarla aralıklara yerleştirir
+
+        "first" politikasında rows (fit edilen verideki satır konumları) verilirse eşit değerler fit ile aynı şekilde bölünür.
+        Eksik değerler -1 kodunu alır.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        if self.ties in ("raise", "drop"):
+            return np.where(missing, -1, np.searchsorted(self.edges[1:-1], values, side="left"))
+
+        codes = np.zeros(len(values), dtype=np.int64)
+        if self.ties == "spread":
+            draw = np.random.default_rng(self.seed).random(len(values))
+        for j, value in enumerate(self.tie_values):
+            codes += values > value
+            tied = values == value
+            if self.ties == "first":
+                codes += tied if rows is None else tied & (np.asarray(rows) > self.tie_rows[j])
+            else:
+                codes += tied & (draw >= self.tie_share[j])
+        codes[missing] = -1
+        return codes
+
+    def to_dict(self):
+        """Sabitlenmiş sınırları JSON'a yazılabilir bir sözlük olarak döndürür"""
+        state = {"q": self.q, "ties": self.ties, "seed": self.seed, "edges": self.edges.tolist()}
+        for name in ("tie_values", "tie_share", "tie_rows"):
+            value = getattr(self, name)
+            state[name] = None if value is None else value.tolist()
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        binner = cls(q=state["q"], ties=state["ties"], seed=state["seed"])
+        binner.edges = np.asarray(state["edges"])
+        for name in ("tie_values", "tie_share", "tie_rows"):
+            if state.get(name) is not None:
+                setattr(binner, name, np.asarray(state[name]))
+        return binner
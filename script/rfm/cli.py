@@ -0,0 +1,130 @@
+##############################################################################################################################
+# Komut Satırı Arayüzü (rfm score / export / stats)
+##############################################################################################################################
+
+# Analiz betiği (FLO_RFM_analysis.py) tüm adımları sırayla çalıştırıp yazdıran bir eğitim betiğidir. Zamanlanmış işler
+# için aynı hesaplamalar bu arayüzle, veri yolu ve analiz tarihi parametre olarak verilerek çalıştırılır:
+#
+#   python -m rfm score  --data ../dataset/flo_data_20k.csv --analysis-date 2021-06-01 --output rfm.csv
+#   python -m rfm export campaigns.json --output-dir campaigns
+#   python -m rfm stats  --top 5
+#
+# Depo kökünde "pip install -e ." ile kurulduğunda aynı komutlar herhangi bir dizinden "rfm score ..." olarak çalışır
+# (pyproject.toml, [project.scripts]). Kurulum yapılmadan python -m rfm, script/ dizininden ya da
+# PYTHONPATH=<depo>/script ile çalıştırılmalıdır.
+#
+# --data verilmezse RFM_DATA ortam değişkeni, o da yoksa depodaki dataset/flo_data_20k.csv kullanılır. pandas ve paket
+# modülleri yalnızca komut çalışırken içe aktarılır; --help ve argüman hataları pandas yüklenmeden yanıtlanır.
+
+import argparse
+import datetime as dt
+import os
+import sys
+
+DEFAULT_DATA = os.environ.get("RFM_DATA", os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), "dataset", "flo_data_20k.csv"))
+
+
+def _analysis_date(value):
+    try:
+        return dt.datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}") from None
+
+
+def _load(args):
+    """Müşteri tablosunu okur ve create_rfm ile skorlar; (df, rfm) döndürür"""
+    from rfm.core import ANALYSIS_DATE, create_rfm
+    from rfm.ingest import load_customers
+
+    df = load_customers(args.data, use_cache=not args.no_cache)
+    rfm = create_rfm(df, analysis_date=args.analysis_date or ANALYSIS_DATE)
+    return df, rfm
+
+
+def score(args):
+    """Müşteri başına RFM skorlarını ve segmentleri CSV olarak yazar"""
+    _, rfm = _load(args)
+    rfm.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+    if args.output != "-":
+        print(f"{len(rfm)} customers scored, saved to {args.output}")
+
+
+def export(args):
+    """Kampanya tanım dosyasındaki tüm hedef kitleleri dışa aktarır"""
+    from rfm.audience import AudienceIndex
+    from rfm.campaigns import export_campaigns, load_campaigns
+
+    spec = load_campaigns(args.spec)  # Tanım hatası veri okunmadan bildirilir
+    if args.output_dir:
+        spec.output_dir = args.output_dir
+    df, rfm = _load(args)
+    report = export_campaigns(spec, AudienceIndex.from_frames(df, rfm), max_workers=args.jobs)
+    print(report.to_string(index=False))
+
+
+def stats(args):
+    """Kanal dağılımı, en değerli müşteriler ve segment istatistiklerini tek geçişte hesaplayıp yazdırır"""
+    from rfm.query import Query
+
+    df, rfm = _load(args)
+    summary = (Query(df)
+               .groupby("order_channel", {"master_id": "count",
+                                          "order_num_total": "sum",
+                                          "customer_value_total": "sum"}, name="channels")
+               .top_k("customer_value_total", args.top, columns=["master_id"], name="top_revenue")
+               .top_k("order_num_total", args.top, columns=["master_id"], name="top_orders")
+               .collect())
+    segments = (Query(rfm)
+                .groupby("segment", {column: ["mean", "count"] for column in ["recency", "frequency", "monetary"]})
+                .collect()["segment_stats"])
+
+    print(f"Customers: {len(df)}  Last order date: {df['last_order_date'].max().date()}")
+    print("\nDistribution by order channel:")
+    print(summary["channels"].to_string(float_format="%.2f"))
+    print(f"\nTop {args.top} customers by total revenue:")
+    print(summary["top_revenue"].to_string(index=False, float_format="%.2f"))
+    print(f"\nTop {args.top} customers by total number of orders:")
+    print(summary["top_orders"].to_string(index=False, float_format="%.2f"))
+    print("\nSegment statistics:")
+    print(segments.to_string(float_format="%.2f"))
+
+
+def main(argv=None):
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument("--data", default=DEFAULT_DATA, help="customer CSV (default: $RFM_DATA or %(default)s)")
+    data.add_argument("--analysis-date", type=_analysis_date, default=None,
+                      help="YYYY-MM-DD reference date for recency (default: 2021-06-01)")
+    data.add_argument("--no-cache", action="store_true", help="parse the CSV without the columnar cache")
+
+    prog = "python -m rfm" if os.path.basename(sys.argv[0]) == "__main__.py" else "rfm"
+    parser = argparse.ArgumentParser(prog=prog, description="RFM customer segmentation")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = commands.add_parser("score", parents=[data], help="write per-customer RFM scores and segments")
+    score_parser.add_argument("--output", "-o", default="-", help="output CSV (default: stdout)")
+    score_parser.set_defaults(handler=score)
+
+    export_parser = commands.add_parser("export", parents=[data], help="export campaign audiences")
+    export_parser.add_argument("spec", help="campaign spec (JSON)")
+    export_parser.add_argument("--output-dir", help="override the spec's output_dir")
+    export_parser.add_argument("--jobs", type=int, default=None, help="parallel writers")
+    export_parser.set_defaults(handler=export)
+
+    stats_parser = commands.add_parser("stats", parents=[data], help="print channel, top customer and segment stats")
+    stats_parser.add_argument("--top", type=int, default=10, help="number of top customers to list")
+    stats_parser.set_defaults(handler=stats)
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        parser.error(f"data file not found: {args.data}")
+    try:
+        args.handler(args)
+    except BrokenPipeError:  # Çıktıyı okuyan süreç erken kapandı (ör. "python -m rfm score | head")
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
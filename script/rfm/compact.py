@@ -0,0 +1,182 @@
+##############################################################################################################################
+# Kompakt RFM Gösterimi (Compact Memory Representation)
+##############################################################################################################################
+
+# create_rfm çıktısında customer_id 36 karakterlik metin, RF_SCORE / RFM_SCORE birleştirmeyle üretilmiş metin
+# sütunlarıdır. On milyonlarca müşteride bu sütunlar tablonun büyük kısmını oluşturur. CompactRFM aynı bilgiyi sabit
+# genişlikli numpy dizileriyle tutar:
+#
+# id_hi, id_lo : master_id (UUID) 16 bayt olarak, iki büyük-uçlu (big-endian) uint64 halinde
+# recency      : int16 (gün)
+# frequency    : float32 (sipariş sayıları tamsayıdır ve float32 ile kayıpsız tutulur)
+# monetary     : float64
+# rfm_code     : uint16, RFM_SCORE'un sayısal hali (ör. "554" -> 554); RF_SCORE = rfm_code // 10
+# segment      : int8 segment kodu (segment_names içindeki sıra, boşluk -1), pd.Categorical kodlarıyla aynı
+#
+# Müşteri başına 16 + 2 + 4 + 8 + 2 + 1 = 33 bayt yer kaplar. Okunabilir metinler yalnızca dışa aktarırken (to_frame,
+# to_csv) üretilir.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from rfm.binning import QuantileBinner
+from rfm.core import ANALYSIS_DATE, RFM_COLUMNS, add_totals, convert_dates, rfm_metrics
+from rfm.segments import SEG_MAP, compile_seg_map
+
+# Onaltılık karakter (ASCII kodu) -> 4 bitlik değer; geçersiz karakterler 255
+_NIBBLES = np.full(256, 255, dtype=np.uint8)
+_NIBBLES[np.frombuffer(b"0123456789abcdef", dtype=np.uint8)] = np.arange(16)
+_NIBBLES[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_HEX_POSITIONS = [i for i in range(36) if i not in (8, 13, 18, 23)]
+
+# Sayısal skor kodu -> metin (ör. 554 -> "554"); dışa aktarırken satır başına dönüşüm yerine tablo araması yapılır
+_CODE_STRINGS = np.array([str(code) for code in range(1000)], dtype=object)
+
+
+def encode_uuids(customer_ids):
+    """UUID metinlerini (id_hi, id_lo) uint64 ikilisine çevirir; UUID olmayan değerlerde ValueError fırlatır"""
+    values = np.asarray(customer_ids)
+    if values.dtype.kind not in "SU":
+        values = values.astype(str)
+    # Uzunluk, bayta (S36) çevirmeden önce kontrol edilir: daha uzun değerler kırpılıp geçerli bir UUID'ye dönüşebilir
+    invalid = np.char.str_len(values) != 36
+    chars = np.zeros((len(values), 36), dtype=np.uint8)
+    if not invalid.all():
+        # Karakter kodları doğrudan okunur (U: UTF-32, S: bayt); ASCII dışı karakterler geçersizdir
+        codes = np.ascontiguousarray(values).view(np.uint32 if values.dtype.kind == "U" else np.uint8)
+        codes = codes.reshape(len(values), -1)[:, :36]
+        invalid |= (codes > 127).any(axis=1)
+        chars[:, :codes.shape[1]] = codes
+    nibbles = _NIBBLES[chars[:, _HEX_POSITIONS]]
+    invalid |= (nibbles == 255).any(axis=1) | (chars[:, [8, 13, 18, 23]] != ord("-")).any(axis=1)
+    if invalid.any():
+        rows = np.flatnonzero(invalid)
+        raise ValueError(f"{len(rows)} customer id(s) are not UUIDs, e.g. {values[rows[0]].item()!r}.")
+    packed = np.ascontiguousarray(nibbles[:, 0::2] << 4 | nibbles[:, 1::2])
+    halves = packed.view(">u8").astype(np.uint64)
+    return halves[:, 0].copy(), halves[:, 1].copy()
+
+
+def decode_uuids(id_hi, id_lo):
+    """encode_uuids'in tersi: uint64 ikililerinden küçük harfli UUID metinleri üretir"""
+    packed = np.column_stack([id_hi, id_lo]).astype(">u8").view(np.uint8).reshape(-1, 16)
+    nibbles = np.empty((len(packed), 32), dtype=np.uint8)
+    nibbles[:, 0::2] = packed >> 4
+    nibbles[:, 1::2] = packed & 0x0F
+    # Karakterler doğrudan UTF-32 kodları olarak yazılır; bayt -> metin dönüşümü gerekmez
+    chars = np.full((len(packed), 36), ord("-"), dtype=np.uint32)
+    chars[:, _HEX_POSITIONS] = _HEX[nibbles]
+    return chars.view("U36").ravel()
+
+
+@dataclass
+class CompactRFM:
+    """create_rfm çıktısının sabit genişlikli dizilerle tutulan hali"""
+    id_hi: np.ndarray
+    id_lo: np.ndarray
+    recency: np.ndarray
+    frequency: np.ndarray
+    monetary: np.ndarray
+    rfm_code: np.ndarray
+    segment: np.ndarray
+    segment_names: tuple
+
+    def __len__(self):
+        return len(self.rfm_code)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in
+                   ("id_hi", "id_lo", "recency", "frequency", "monetary", "rfm_code", "segment"))
+
+    @property
+    def recency_score(self):
+        return (self.rfm_code // 100).astype(np.uint8)
+
+    @property
+    def frequency_score(self):
+        return (self.rfm_code // 10 % 10).astype(np.uint8)
+
+    @property
+    def monetary_score(self):
+        return (self.rfm_code % 10).astype(np.uint8)
+
+    @property
+    def segment_categorical(self):
+        return pd.Categorical.from_codes(self.segment, categories=self.segment_names)
+
+    @classmethod
+    def from_scores(cls, customer_ids, recency, frequency, monetary, recency_score, frequency_score, monetary_score,
+                    seg_map=SEG_MAP):
+        table, names = compile_seg_map(seg_map)
+        recency_score = np.asarray(recency_score, dtype=np.int64)
+        frequency_score = np.asarray(frequency_score, dtype=np.int64)
+        monetary_score = np.asarray(monetary_score, dtype=np.int64)
+        id_hi, id_lo = encode_uuids(customer_ids)
+        return cls(id_hi=id_hi,
+                   id_lo=id_lo,
+                   recency=np.asarray(recency, dtype=np.int16),
+                   frequency=np.asarray(frequency, dtype=np.float32),
+                   monetary=np.asarray(monetary, dtype=np.float64),
+                   rfm_code=(recency_score * 100 + frequency_score * 10 + monetary_score).astype(np.uint16),
+                   segment=table[recency_score - 1, frequency_score - 1],
+                   segment_names=names)
+
+    @classmethod
+    def from_frame(cls, rfm, seg_map=SEG_MAP):
+        """create_rfm çıktısını kompakt hale çevirir"""
+        codes = pd.to_numeric(rfm["RFM_SCORE"]).to_numpy(dtype=np.int64)
+        return cls.from_scores(rfm["customer_id"].to_numpy(), rfm["recency"], rfm["frequency"], rfm["monetary"],
+                               codes // 100, codes // 10 % 10, codes % 10, seg_map)
+
+    @classmethod
+    def from_customers(cls, dataframe, analysis_date=ANALYSIS_DATE, seg_map=SEG_MAP):
+        """Müşteri tablosundan, create_rfm ile aynı skorları hiç metin sütunu üretmeden hesaplar"""
+        add_totals(dataframe)
+        convert_dates(dataframe)
+        rfm = rfm_metrics(dataframe, analysis_date)
+        return cls.from_scores(rfm["customer_id"].to_numpy(), rfm["recency"], rfm["frequency"], rfm["monetary"],
+                               5 - QuantileBinner(q=5).fit_transform(rfm["recency"]),
+                               QuantileBinner(q=5, ties="first").fit_transform(rfm["frequency"]) + 1,
+                               QuantileBinner(q=5).fit_transform(rfm["monetary"]) + 1,
+                               seg_map)
+
+    def to_frame(self):
+        """create_rfm çıktısıyla aynı sütunları (okunabilir metinlerle) üretir"""
+        rfm = pd.DataFrame()
+        rfm["customer_id"] = decode_uuids(self.id_hi, self.id_lo)
+        rfm["recency"] = self.recency.astype(np.int64)
+        rfm["frequency"] = self.frequency.astype(np.float64)
+        rfm["monetary"] = self.monetary
+        rfm["RFM_SCORE"] = _CODE_STRINGS[self.rfm_code]
+        rfm["RF_SCORE"] = _CODE_STRINGS[self.rfm_code // 10]
+        rfm["segment"] = self.segment_categorical
+        return rfm[RFM_COLUMNS]
+
+    def to_csv(self, path, chunksize=1_000_000):
+        """Okunabilir metinleri parça parça üreterek CSV dosyasına yazar"""
+        for start in range(0, max(len(self), 1), chunksize):
+            part = CompactRFM(*(getattr(self, name)[start:start + chunksize] for name in
+                                ("id_hi", "id_lo", "recency", "frequency", "monetary", "rfm_code", "segment")),
+                              segment_names=self.segment_names)
+            part.to_frame().to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+        return path
+
+
+def memory_report(rfm, compact):
+    """create_rfm çıktısı ile kompakt gösterimin sütun bazında bellek kullanımını (MB) karşılaştırır"""
+    frame = rfm.memory_usage(deep=True, index=False) / 2 ** 20
+    compact_mb = {"customer_id": compact.id_hi.nbytes + compact.id_lo.nbytes,
+                  "recency": compact.recency.nbytes,
+                  "frequency": compact.frequency.nbytes,
+                  "monetary": compact.monetary.nbytes,
+                  "RF_SCORE": 0,
+                  "RFM_SCORE": compact.rfm_code.nbytes,
+                  "segment": compact.segment.nbytes}
+    report = pd.DataFrame({"frame_mb": frame, "compact_mb": pd.Series(compact_mb) / 2 ** 20})
+    report.loc["total"] = report.sum()
+    report["ratio"] = report["frame_mb"] / report["compact_mb"].replace(0, np.nan)
+    return report
@@ -0,0 +1,151 @@
+##############################################################################################################################
+# RFM Çekirdek Fonksiyonları
+##############################################################################################################################
+
+import datetime as dt
+
+import pandas as pd
+
+from rfm.binning import QuantileBinner
+from rfm.instrument import stage
+from rfm.segments import SEG_MAP, assign_segments
+
+# Analiz tarihi: Veri setindeki son alışveriş tarihinden (2021-05-30) 2 gün sonrası
+ANALYSIS_DATE = dt.datetime(2021, 6, 1)
+
+# create_rfm çıktısında yer alan sütunlar
+RFM_COLUMNS = ["customer_id", "recency", "frequency", "monetary", "RF_SCORE", "RFM_SCORE", "segment"]
+
+
+##############################################################################################################################
+# Veri keşfi
+##############################################################################################################################
+
+def explore(dataframe, diagnostics=False, instrument=None):
+    """Veri setinin genel görünümünü yazdırır
+
+    describe, isnull().sum() ve info tüm tablo üzerinde ek geçişler yaptığından yalnızca diagnostics=True ise çalışır.
+    """
+    rows = len(dataframe)
+
+    with stage(instrument, "head", rows):
+        # Veri setinin ilk 10 satırını yazdır.
+        print("\nFirst 10 rows:")
+        print(dataframe.head(10), "\n")
+
+        # Sütun isimlerini ve veri setinin boyutlarını yazdır.
+        print("\nColumn names:")
+        print(dataframe.columns, "\n")
+        print("\nShape of dataset (rows, columns):", dataframe.shape, "\n")
+
+    if not diagnostics:
+        return
+
+    with stage(instrument, "describe", rows):
+        # Betimsel istatistikleri (sayısal sütunlar için) yazdır.
+        print("\nDescriptive statistics:")
+        print(dataframe.describe().T, "\n")
+
+    with stage(instrument, "missing_values", rows):
+        # Her sütundaki eksik (NaN) değerlerin sayısını yazdır.
+        print("\nMissing values by column:")
+        print(dataframe.isnull().sum(), "\n")
+
+    with stage(instrument, "info", rows):
+        # Sütunlar, eksik olmayan değer sayısı ve veri tipleri hakkında bilgi yazdır.
+        print("\nData types:")
+        dataframe.info()
+        print()
+
+
+##############################################################################################################################
+# create_rfm aşamaları
+##############################################################################################################################
+
+def add_totals(dataframe):
+    """Toplam sipariş sayısı ve toplam harcama sütunlarını ekler"""
+    dataframe["order_num_total"] = (dataframe["order_num_total_ever_online"] +
+                                    dataframe["order_num_total_ever_offline"])
+    dataframe["customer_value_total"] = (dataframe["customer_value_total_ever_offline"] +
+                                         dataframe["customer_value_total_ever_online"])
+
+
+def convert_dates(dataframe):
+    """İsminde "date" geçen sütunları datetime tipine çevirir"""
+    date_columns = dataframe.columns[dataframe.columns.str.contains("date")]
+    dataframe[date_columns] = dataframe[date_columns].apply(pd.to_datetime)
+
+
+def rfm_metrics(dataframe, analysis_date=ANALYSIS_DATE):
+    """Recency, Frequency ve Monetary değerlerini içeren RFM DataFrame'ini oluşturur"""
+    rfm = pd.DataFrame()
+    rfm["customer_id"] = dataframe["master_id"]
+    rfm["recency"] = (analysis_date - dataframe["last_order_date"]).dt.days # Gün farkını hesapla
+    rfm["frequency"] = dataframe["order_num_total"] # Toplam sipariş sayısı
+    rfm["monetary"] = dataframe["customer_value_total"] # Toplam harcama
+    return rfm
+
+
+def quintile_score(values, labels, ties="raise"):
+    """pd.qcut(values, 5, labels=labels) ile aynı kategorik skoru sıralama yapmadan üretir (bkz. rfm.binning)"""
+    return pd.Categorical.from_codes(QuantileBinner(q=5, ties=ties).fit_transform(values), categories=labels)
+
+
+def score_recency(rfm):
+    rfm["recency_score"] = quintile_score(rfm['recency'], [5, 4, 3, 2, 1]) # Recency skoru (ters)
+
+
+def score_frequency(rfm):
+    rfm["frequency_score"] = quintile_score(rfm['frequency'], [1, 2, 3, 4, 5], ties="first") # Frequency skoru (rank(method="first") ile aynı)
+
+
+def score_monetary(rfm):
+    rfm["monetary_score"] = quintile_score(rfm['monetary'], [1, 2, 3, 4, 5]) # Monetary skoru
+
+
+def score_strings(rfm):
+    """RF_SCORE ve RFM_SCORE sütunlarını oluşturur"""
+    # Kategoriler metne çevrilir: eksik skor içeren kategorik sütunda astype(str) tamsayıları "1.0" olarak yazar
+    recency, frequency, monetary = (rfm[column].cat.rename_categories(str).astype(str)
+                                    for column in ["recency_score", "frequency_score", "monetary_score"])
+    rfm["RF_SCORE"] = (recency + frequency) # RF skoru
+    rfm["RFM_SCORE"] = (rfm['RF_SCORE'] + monetary) # RFM skoru
+
+
+def add_segments(rfm, seg_map=SEG_MAP):
+    rfm['segment'] = assign_segments(rfm['recency_score'], rfm['frequency_score'], seg_map) # Segment isimlerini ata (kategorik)
+
+
+def create_rfm(dataframe, analysis_date=ANALYSIS_DATE, instrument=None):
+    """RFM segmentasyon veri çerçevesi oluşturur
+
+    instrument (rfm.instrument.Instrument) verilirse her aşama ölçülür ve instrument.report'a eklenir.
+    """
+    rows = len(dataframe)
+
+    # Veri hazırlama: Toplam sipariş sayısı ve toplam harcama hesapla, tarih değişkenlerini datetime tipine çevir
+    with stage(instrument, "totals", rows):
+        add_totals(dataframe)
+    with stage(instrument, "to_datetime", rows):
+        convert_dates(dataframe)
+
+    # RFM metrikleri: Recency, Frequency ve Monetary değerlerini hesapla
+    with stage(instrument, "rfm_metrics", rows):
+        rfm = rfm_metrics(dataframe, analysis_date)
+
+    # Skorlar: Recency, Frequency, Monetary skorlarını hesapla ve birleştir
+    with stage(instrument, "recency_score", rows):
+        score_recency(rfm)
+    with stage(instrument, "frequency_score", rows):
+        score_frequency(rfm)
+    with stage(instrument, "monetary_score", rows):
+        score_monetary(rfm)
+    with stage(instrument, "score_strings", rows):
+        score_strings(rfm)
+
+    # Segmentler: RF skorlarına göre müşteri segmentlerini ata
+    with stage(instrument, "segment", rows):
+        add_segments(rfm)
+
+    # İstenen sütunları içeren RFM DataFrame'ini döndür
+    return rfm[RFM_COLUMNS]
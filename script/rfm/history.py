@@ -0,0 +1,309 @@
+##############################################################################################################################
+# Tarihsel Segment Anlık Görüntüleri ve Geçiş Matrisleri (Segment Snapshot History)
+##############################################################################################################################
+
+# create_rfm tek bir analiz tarihi için segmentasyon üretir. SnapshotStore her analiz tarihindeki müşteri başına segment
+# kodlarını yalnızca eklemeli (append-only), sıkıştırılmış ve sütunsal olarak bir dizinde saklar:
+#
+# meta.json                  : Segment isimleri ve anlık görüntü listesi (tarih, tür, müşteri sayısı, değişen satır sayısı)
+# ids/<tarih>.npz            : O tarihte ilk kez görülen müşteriler (UUID, iki uint64 olarak; rfm.compact.encode_uuids)
+# snapshots/<tarih>.npz      : Anlık görüntü. Müşteriler ilk görüldükleri sıraya göre numaralanır (global satır).
+#   - Anahtar (key)    : Tüm müşterilerin int8 segment kodları
+#   - Fark (delta)     : Yalnızca bir önceki anlık görüntüye göre segmenti değişen satırlar. Satır konumları fark
+#                        kodlamasıyla (ardışık konumların farkı) ve yeni kodlarla birlikte tutulur.
+#
+# Diziler np.savez_compressed (zlib) ile sıkıştırılır. Aydan aya müşterilerin çoğu aynı segmentte kaldığından fark
+# görüntüleri küçüktür; her keyframe_interval görüntüde bir anahtar görüntü yazılarak bir tarihin çözülmesi için
+# uygulanacak fark sayısı sınırlanır.
+#
+# Kodlar: 0.. segment_names içindeki sıra, -1 seg_map'te karşılığı olmayan RF skoru, -2 o tarihte bulunmayan müşteri.
+#
+#   history = SnapshotStore.create(".rfm_history")
+#   history.append_rfm(create_rfm(df, analysis_date=date), date)  # her ay
+#   history.transition_matrix("2021-05-01", "2021-06-01")
+#   history.history("cc294636-19f0-11eb-8d74-000d3a38a36f")
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from rfm.compact import decode_uuids, encode_uuids
+
+UNMAPPED = -1
+ABSENT = -2
+DEFAULT_KEYFRAME_INTERVAL = 12
+
+
+def _date(value):
+    return pd.Timestamp(value).date().isoformat()
+
+
+def _find(sorted_hi, order, id_lo, hi, lo, query_order):
+    """(hi, lo) anahtarlarının global satır numaralarını döndürür; bulunamayanlar -1
+
+    Kayıt yalnızca hi değerine göre sıralıdır. Sorgular da hi'ye göre sıralı (query_order) arandığından ikili arama
+    belleği sırayla dolaşır. Aynı hi değerine sahip (nadir) anahtarlar tek tek karşılaştırılır.
+    """
+    query_hi = hi[query_order]
+    left = np.searchsorted(sorted_hi, query_hi, side="left")
+    right = np.searchsorted(sorted_hi, query_hi, side="right")
+    rows = np.full(len(hi), -1, dtype=np.int64)
+    single = np.flatnonzero(right - left == 1)
+    candidates = order[left[single]]
+    queries = query_order[single]
+    match = id_lo[candidates] == lo[queries]
+    rows[queries[match]] = candidates[match]
+    for i in np.flatnonzero(right - left > 1):
+        run = order[left[i]:right[i]]
+        hits = run[id_lo[run] == lo[query_order[i]]]
+        if len(hits):
+            rows[query_order[i]] = hits[0]
+    return rows
+
+
+def _has_duplicates(hi, lo, order):
+    """hi'ye göre sıralama indeksi (order) verilen (hi, lo) anahtarlarında tekrar olup olmadığını kontrol eder"""
+    sorted_hi = hi[order]
+    for start in np.flatnonzero(sorted_hi[1:] == sorted_hi[:-1]):
+        if lo[order[start]] in lo[order[start + 1:np.searchsorted(sorted_hi, sorted_hi[start], side="right")]]:
+            return True
+    return False
+
+
+class SnapshotStore:
+    """Analiz tarihlerine göre müşteri segmentlerinin yalnızca eklemeli deposu"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as file:
+            self.meta = json.load(file)
+        self._ids = None      # (id_hi, id_lo), ilk ihtiyaçta yüklenir
+        self._sorted = None   # (sıralı id_hi, sıralama indeksi)
+        self._cache = None    # Son çözülen anlık görüntü: (sıra, kodlar)
+
+    @classmethod
+    def create(cls, path, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        """Boş bir depo oluşturur; dizinde zaten bir depo varsa onu açar"""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            os.makedirs(os.path.join(path, "ids"), exist_ok=True)
+            os.makedirs(os.path.join(path, "snapshots"), exist_ok=True)
+            meta = {"segment_names": [], "keyframe_interval": keyframe_interval, "snapshots": []}
+            with open(os.path.join(path, "meta.json"), "w") as file:
+                json.dump(meta, file, indent=2)
+        return cls(path)
+
+    @property
+    def segment_names(self):
+        return tuple(self.meta["segment_names"])
+
+    @property
+    def dates(self):
+        return [snapshot["date"] for snapshot in self.meta["snapshots"]]
+
+    def __len__(self):
+        """Depoda kayıtlı (herhangi bir tarihte görülmüş) müşteri sayısı"""
+        snapshots = self.meta["snapshots"]
+        return snapshots[-1]["customers"] if snapshots else 0
+
+    def nbytes(self):
+        """Depo dosyalarının diskteki toplam boyutu (bayt)"""
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(self.path) for name in names)
+
+    ##########################################################################################################################
+    # Müşteri kaydı
+    ##########################################################################################################################
+
+    def _load_ids(self):
+        if self._ids is None:
+            parts = [np.load(os.path.join(self.path, "ids", f"{date}.npz")) for date in self.dates]
+            self._ids = (np.concatenate([np.empty(0, np.uint64)] + [part["id_hi"] for part in parts]),
+                         np.concatenate([np.empty(0, np.uint64)] + [part["id_lo"] for part in parts]))
+        return self._ids
+
+    def _index(self):
+        if self._sorted is None:
+            id_hi, _ = self._load_ids()
+            order = np.argsort(id_hi, kind="stable")
+            self._sorted = (id_hi[order], order)
+        return self._sorted
+
+    def customer_ids(self):
+        """Kayıtlı müşterilerin master_id değerleri (global satır sırasıyla)"""
+        return decode_uuids(*self._load_ids())
+
+    ##########################################################################################################################
+    # Ekleme
+    ##########################################################################################################################
+
+    def _segment_codes(self, segment):
+        """Segment sütununu depodaki isim tablosuna göre int8 kodlara çevirir; yeni isimler tabloya eklenir"""
+        segment = pd.Categorical(segment)
+        names = self.meta["segment_names"]
+        for name in segment.categories:
+            if name not in names:
+                names.append(name)
+        if len(names) > 127:
+            raise ValueError(f"At most 127 segments are supported, got {len(names)}.")
+        mapping = np.array([names.index(name) for name in segment.categories] + [UNMAPPED], dtype=np.int8)
+        return mapping[segment.codes]  # -1 (NaN) kodu tablonun son elemanına, yani UNMAPPED'e düşer
+
+    def append(self, analysis_date, customer_ids, segment):
+        """Bir analiz tarihindeki müşteri segmentlerini depoya ekler; tarih son anlık görüntüden sonra olmalıdır"""
+        date = _date(analysis_date)
+        if self.dates and date <= self.dates[-1]:
+            raise ValueError(f"Snapshots are append-only: {date} is not after {self.dates[-1]}.")
+
+        hi, lo = encode_uuids(np.asarray(customer_ids))
+        query_order = np.argsort(hi, kind="stable")
+        if _has_duplicates(hi, lo, query_order):
+            raise ValueError("customer_ids must be unique within a snapshot.")
+        rows = np.full(len(hi), -1, dtype=np.int64)
+        if len(self):
+            sorted_hi, order = self._index()
+            rows = _find(sorted_hi, order, self._load_ids()[1], hi, lo, query_order)
+
+        # İlk kez görülen müşteriler kaydın sonuna eklenir
+        new = np.flatnonzero(rows < 0)
+        previous = len(self)
+        rows[new] = previous + np.arange(len(new))
+        total = previous + len(new)
+
+        codes = np.full(total, ABSENT, dtype=np.int8)
+        codes[rows] = self._segment_codes(segment)
+
+        position = len(self.meta["snapshots"])
+        keyframe = position % self.meta["keyframe_interval"] == 0
+        if keyframe:
+            arrays = {"codes": codes}
+            changed = total
+        else:
+            before = np.full(total, ABSENT, dtype=np.int8)
+            before[:previous] = self._codes(position - 1)
+            changed_rows = np.flatnonzero(codes != before)
+            arrays = {"gaps": np.diff(changed_rows, prepend=-1).astype(np.uint32), "codes": codes[changed_rows]}
+            changed = len(changed_rows)
+
+        np.savez_compressed(os.path.join(self.path, "ids", f"{date}.npz"), id_hi=hi[new], id_lo=lo[new])
+        np.savez_compressed(os.path.join(self.path, "snapshots", f"{date}.npz"), **arrays)
+        self.meta["snapshots"].append({"date": date, "kind": "key" if keyframe else "delta", "customers": total,
+                                       "present": len(hi), "changed": changed})
+        with open(os.path.join(self.path, "meta.json.tmp"), "w") as file:
+            json.dump(self.meta, file, indent=2)
+        os.replace(os.path.join(self.path, "meta.json.tmp"), os.path.join(self.path, "meta.json"))
+
+        if self._ids is not None:
+            self._ids = (np.concatenate([self._ids[0], hi[new]]), np.concatenate([self._ids[1], lo[new]]))
+        if self._sorted is not None:
+            # Sıralı indeks yeniden sıralanmaz; yeni müşteriler (hi'ye göre sıralı) yerlerine eklenir
+            new_order = query_order[rows[query_order] >= previous]
+            sorted_hi, order = self._sorted
+            positions = np.searchsorted(sorted_hi, hi[new_order], side="right")
+            self._sorted = (np.insert(sorted_hi, positions, hi[new_order]), np.insert(order, positions, rows[new_order]))
+        self._cache = (position, codes)
+        return changed
+
+    def append_rfm(self, rfm, analysis_date):
+        """create_rfm çıktısını (customer_id, segment) anlık görüntü olarak ekler"""
+        return self.append(analysis_date, rfm["customer_id"].to_numpy(), rfm["segment"])
+
+    ##########################################################################################################################
+    # Sorgular
+    ##########################################################################################################################
+
+    def _position(self, date):
+        date = _date(date)
+        try:
+            return self.dates.index(date)
+        except ValueError:
+            raise KeyError(f"No snapshot for {date}; available: {self.dates}") from None
+
+    def _codes(self, position):
+        """position sıradaki anlık görüntünün kodlarını, en yakın anahtar görüntüden farkları uygulayarak çözer"""
+        if self._cache is not None and self._cache[0] == position:
+            return self._cache[1]
+        snapshots = self.meta["snapshots"]
+        start = position - position % self.meta["keyframe_interval"]
+        if self._cache is not None and start <= self._cache[0] < position:
+            start, codes = self._cache[0] + 1, self._cache[1]
+        else:
+            codes = None
+        for i in range(start, position + 1):
+            with np.load(os.path.join(self.path, "snapshots", f"{snapshots[i]['date']}.npz")) as arrays:
+                if snapshots[i]["kind"] == "key":
+                    codes = arrays["codes"]
+                    continue
+                grown = np.full(snapshots[i]["customers"], ABSENT, dtype=np.int8)
+                grown[:len(codes)] = codes
+                codes = grown
+                codes[np.cumsum(arrays["gaps"], dtype=np.int64) - 1] = arrays["codes"]
+        self._cache = (position, codes)
+        return codes
+
+    def codes(self, date):
+        """Bir tarihteki tüm kayıtlı müşterilerin segment kodları (global satır sırasıyla)"""
+        return self._codes(self._position(date)).copy()
+
+    def snapshot(self, date):
+        """Bir tarihte bulunan müşterilerin segmentlerini customer_id ile indekslenmiş kategorik Series olarak döndürür"""
+        codes = self.codes(date)
+        present = np.flatnonzero(codes != ABSENT)
+        id_hi, id_lo = self._load_ids()
+        return pd.Series(pd.Categorical.from_codes(codes[present], categories=self.segment_names),
+                         index=pd.Index(decode_uuids(id_hi[present], id_lo[present]), name="customer_id"),
+                         name="segment")
+
+    def transition_matrix(self, date_from, date_to, normalize=False):
+        """date_from'daki segmentten date_to'daki segmente geçen müşteri sayıları
+
+        Satırlar başlangıç, sütunlar bitiş segmentleridir. "(absent)" o tarihte bulunmayan, "(unmapped)" seg_map'te
+        karşılığı olmayan müşterileri gösterir. normalize=True ise her satır oranlara çevrilir.
+        """
+        before = self.codes(date_from)
+        after = self.codes(date_to)
+        size = max(len(before), len(after))
+        before = np.concatenate([before, np.full(size - len(before), ABSENT, dtype=np.int8)])
+        after = np.concatenate([after, np.full(size - len(after), ABSENT, dtype=np.int8)])
+
+        labels = [*self.segment_names, "(absent)", "(unmapped)"]
+        n = len(labels)
+        # -2 ve -1 kodları tablonun sonundaki "(absent)" ve "(unmapped)" satırlarına düşer
+        index_before = np.where(before >= 0, before, n + before.astype(np.int64))
+        index_after = np.where(after >= 0, after, n + after.astype(np.int64))
+        counts = np.bincount(index_before * n + index_after, minlength=n * n).reshape(n, n)
+        counts[n - 2, n - 2] = 0  # İki tarihte de bulunmayan müşteriler sayılmaz
+
+        matrix = pd.DataFrame(counts, index=pd.Index(labels, name=_date(date_from)),
+                              columns=pd.Index(labels, name=_date(date_to)))
+        if not counts[n - 1].any() and not counts[:, n - 1].any():
+            matrix = matrix.drop(index="(unmapped)", columns="(unmapped)")
+        if normalize:
+            matrix = matrix.div(matrix.sum(axis=1).replace(0, np.nan), axis=0)
+        return matrix
+
+    def history(self, customer_id):
+        """Bir müşterinin tarihe göre segment geçmişi (bulunmadığı tarihlerde eksik değer)"""
+        hi, lo = encode_uuids([customer_id])
+        sorted_hi, order = self._index()
+        row = _find(sorted_hi, order, self._load_ids()[1], hi, lo, np.zeros(1, dtype=np.int64))[0]
+        if row < 0:
+            raise KeyError(f"Unknown customer: {customer_id!r}")
+
+        # Müşterinin satırı her görüntüde yalnızca aranır; tüm görüntü çözülmez
+        names = self.segment_names
+        segments = []
+        code = ABSENT
+        for snapshot in self.meta["snapshots"]:
+            if row < snapshot["customers"]:
+                with np.load(os.path.join(self.path, "snapshots", f"{snapshot['date']}.npz")) as arrays:
+                    if snapshot["kind"] == "key":
+                        code = int(arrays["codes"][row])
+                    else:
+                        changed_rows = np.cumsum(arrays["gaps"], dtype=np.int64) - 1
+                        i = np.searchsorted(changed_rows, row)
+                        if i < len(changed_rows) and changed_rows[i] == row:
+                            code = int(arrays["codes"][i])
+            segments.append(names[code] if code >= 0 else None if code == ABSENT else "(unmapped)")
+        return pd.Series(segments, index=pd.Index(pd.to_datetime(self.dates), name="analysis_date"), name="segment")
@@ -0,0 +1,300 @@
+##############################################################################################################################
+# Artımlı (Incremental) Günlük RFM Güncellemesi
+##############################################################################################################################
+
+# create_rfm her çalıştırmada tüm müşterileri baştan hesaplar. Bu modül müşteri başına RFM durumunu diske kaydeder ve
+# günlük sipariş olaylarını (delta dosyası) bu duruma uygular:
+#
+# - Recency yerine son alışveriş günü saklanır. Analiz tarihi ilerletildiğinde herkesin recency değeri ve recency
+#   kantil sınırları aynı miktarda kayar; bu nedenle yalnızca tarihin ilerlemesi hiçbir skoru değiştirmez ve
+#   kaynak veri yeniden taranmaz.
+# - Kantil sınırları her güncellemede seçim (np.partition tabanlı np.quantile) ile O(n) sürede kesin olarak
+#   yeniden bulunur. Yeni müşteriler ve eklenen sipariş tutarları sınırları neredeyse her gün biraz kaydırır; ancak
+#   deltada olmayan bir müşterinin skoru yalnızca değeri bir sınırın eski ve yeni konumu arasında kalıyorsa değişebilir.
+#   Bu nedenle deltadaki müşterilerle birlikte yalnızca bu aralıklardaki müşteriler yeniden skorlanır.
+# - Frequency skoru qcut(rank(method="first")) ile aynıdır: her sınır (frequency değeri, satır konumu) ikilisi olarak
+#   tutulur. Yeni müşteriler sona eklendiğinden mevcut müşterilerin satır konumları değişmez.
+#
+# Delta dosyası sipariş olaylarından oluşan bir CSV dosyasıdır:
+#
+# master_id     : Müşteri numarası (durumda olmayan müşteriler yeni müşteri olarak eklenir)
+# order_date    : Sipariş tarihi (%Y-%m-%d)
+# order_num     : Sipariş sayısı (genellikle 1)
+# order_value   : Sipariş tutarı
+
+import datetime as dt
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from rfm.core import ANALYSIS_DATE, RFM_COLUMNS
+from rfm.sketch import QUINTILES, qcut_codes
+from rfm.segments import SEG_MAP, compile_seg_map
+
+EPOCH = dt.datetime(1970, 1, 1)
+
+# Durum dizininde .npy dosyası olarak saklanan diziler
+STATE_ARRAYS = ["customer_id", "id_order", "last_order_day", "frequency", "monetary",
+                "recency_score", "frequency_score", "monetary_score", "segment"]
+
+
+def _to_days(dates):
+    """Tarihleri 1970-01-01'den itibaren gün sayısına çevirir"""
+    return ((pd.to_datetime(dates) - EPOCH) // pd.Timedelta(days=1)).to_numpy(dtype=np.int32, copy=True)
+
+
+@dataclass
+class Boundaries:
+    """Skorlamada kullanılan kantil sınırları"""
+    recency: np.ndarray          # Güncel analiz tarihine göre recency sınırları
+    last_order_day: np.ndarray   # Tamsayı recency sınırlarının son alışveriş günü karşılığı (analiz tarihinden bağımsız)
+    frequency_value: np.ndarray  # rank(method="first") sınırlarının frequency değerleri
+    frequency_row: np.ndarray    # ve eşit değerler arasındaki sıralamayı belirleyen satır konumları
+    monetary: np.ndarray
+
+    def __eq__(self, other):
+        return all(np.array_equal(getattr(self, name), getattr(other, name))
+                   for name in ("last_order_day", "frequency_value", "frequency_row", "monetary"))
+
+
+def _boundaries(state):
+    """Durumdaki tüm müşteriler için kesin kantil sınırlarını O(n) sürede hesaplar"""
+    n = len(state.frequency)
+    recency_edges = np.quantile(state.analysis_day - state.last_order_day, QUINTILES)
+
+    # qcut(rank(method="first"), 5): sıra r, r > e_j olan sınır sayısı kadar yukarı kayar. r tamsayı olduğundan
+    # e_j sınırı floor(e_j) sıralı müşteriyle, yani (değer, satır konumu) sıralamasındaki o müşteriyle ifade edilir.
+    thresholds = np.floor(1 + QUINTILES[1:-1] * (n - 1)).astype(np.int64)
+    values = np.partition(state.frequency, thresholds - 1)[thresholds - 1]
+    rows = np.empty(len(thresholds), dtype=np.int64)
+    for j, (threshold, value) in enumerate(zip(thresholds, values)):
+        less = np.count_nonzero(state.frequency < value)
+        rows[j] = np.flatnonzero(state.frequency == value)[threshold - less - 1]
+
+    # Tamsayı recency değerleri için r <= e ile r <= floor(e) aynıdır; karşılaştırma gün cinsinden yapılır
+    return Boundaries(recency=recency_edges,
+                      last_order_day=state.analysis_day - np.floor(recency_edges).astype(np.int64),
+                      frequency_value=values,
+                      frequency_row=rows,
+                      monetary=np.quantile(state.monetary, QUINTILES))
+
+
+def _score(state, boundaries, rows=None):
+    """Verilen satırları (varsayılan: tümü) sınırlara göre skorlar ve segmentler"""
+    rows = np.arange(len(state.frequency)) if rows is None else rows
+    recency = state.analysis_day - state.last_order_day[rows]
+    frequency = state.frequency[rows]
+
+    recency_score = 5 - qcut_codes(recency, boundaries.recency)
+    frequency_score = np.ones(len(rows), dtype=np.int8)
+    for value, row in zip(boundaries.frequency_value, boundaries.frequency_row):
+        frequency_score += (frequency > value) | ((frequency == value) & (rows > row))
+    monetary_score = 1 + qcut_codes(state.monetary[rows], boundaries.monetary)
+
+    table, _ = compile_seg_map(state.seg_map)
+    state.recency_score[rows] = recency_score
+    state.frequency_score[rows] = frequency_score
+    state.monetary_score[rows] = monetary_score
+    state.segment[rows] = table[recency_score - 1, frequency_score - 1]
+
+
+def _moved_rows(state, old, new, old_day):
+    """Sınırlar old'dan new'e kaydığında skoru değişebilecek satırlar: değeri bir sınırın eski ve yeni konumu arasında
+    (uçlar dahil) kalanlar"""
+    moved = np.zeros(len(state.frequency), dtype=bool)
+
+    # Recency: r > e, son alışveriş günü < analiz günü - e demektir; sınırlar analiz tarihinden bağımsız olarak gün
+    # cinsinden karşılaştırılır. Yalnızca tarih ilerlediyse sınırlar bu eksende yerinde kalır.
+    before = old_day - old.recency[1:-1]
+    after = state.analysis_day - new.recency[1:-1]
+    for low, high in zip(np.minimum(before, after), np.maximum(before, after)):
+        if low != high:
+            moved |= (state.last_order_day >= np.floor(low)) & (state.last_order_day <= np.ceil(high))
+
+    for low, high in zip(np.minimum(old.monetary[1:-1], new.monetary[1:-1]),
+                         np.maximum(old.monetary[1:-1], new.monetary[1:-1])):
+        if low != high:
+            moved |= (state.monetary >= low) & (state.monetary <= high)
+
+    # Frequency sınırları (değer, satır konumu) ikilileridir; aralık bu sıralamaya göre alınır
+    frequency = state.frequency
+    for old_key, new_key in zip(zip(old.frequency_value, old.frequency_row), zip(new.frequency_value, new.frequency_row)):
+        if old_key == new_key:
+            continue
+        (low_value, low_row), (high_value, high_row) = sorted([old_key, new_key])
+        if low_value == high_value:
+            ties = np.flatnonzero(frequency == low_value)
+            moved[ties[(ties >= low_row) & (ties <= high_row)]] = True
+            continue
+        moved |= (frequency > low_value) & (frequency < high_value)
+        ties = np.flatnonzero(frequency == low_value)
+        moved[ties[ties >= low_row]] = True
+        ties = np.flatnonzero(frequency == high_value)
+        moved[ties[ties <= high_row]] = True
+    return np.flatnonzero(moved)
+
+
+@dataclass
+class RFMState:
+    """Müşteri başına kalıcı RFM durumu"""
+    analysis_date: dt.datetime
+    customer_id: np.ndarray       # Sabit genişlikli bayt dizisi (S36)
+    id_order: np.ndarray          # customer_id'yi sıralayan indeks (müşteri aramak için)
+    last_order_day: np.ndarray    # int32, 1970-01-01'den itibaren gün
+    frequency: np.ndarray
+    monetary: np.ndarray
+    recency_score: np.ndarray     # int8
+    frequency_score: np.ndarray   # int8
+    monetary_score: np.ndarray    # int8
+    segment: np.ndarray           # int8 segment kodu (segment_names içindeki sıra)
+    boundaries: Boundaries = None
+    seg_map: dict = None
+
+    @property
+    def analysis_day(self):
+        return np.int32((self.analysis_date - EPOCH).days)
+
+    @property
+    def segment_names(self):
+        return compile_seg_map(self.seg_map)[1]
+
+    def find(self, customer_ids):
+        """Müşteri numaralarının satır konumlarını döndürür (bulunamayanlar için -1)"""
+        customer_ids = np.asarray(customer_ids, dtype="S")
+        position = np.searchsorted(self.customer_id, customer_ids, sorter=self.id_order)
+        rows = self.id_order[np.minimum(position, len(self.id_order) - 1)]
+        return np.where(self.customer_id[rows] == customer_ids, rows, -1)
+
+    def to_frame(self):
+        """Durumu create_rfm çıktısıyla aynı sütunlara sahip bir DataFrame'e çevirir"""
+        rfm = pd.DataFrame()
+        rfm["customer_id"] = self.customer_id.astype(str)
+        rfm["recency"] = self.analysis_day - self.last_order_day
+        rfm["frequency"] = self.frequency
+        rfm["monetary"] = self.monetary
+        scores = pd.DataFrame({"recency": self.recency_score, "frequency": self.frequency_score,
+                               "monetary": self.monetary_score}).astype(str)
+        rfm["RF_SCORE"] = scores["recency"] + scores["frequency"]
+        rfm["RFM_SCORE"] = rfm["RF_SCORE"] + scores["monetary"]
+        rfm["segment"] = pd.Categorical.from_codes(self.segment, categories=self.segment_names)
+        return rfm[RFM_COLUMNS]
+
+    def save(self, path):
+        """Durumu bir dizine .npy dosyaları ve meta.json olarak kaydeder"""
+        os.makedirs(path, exist_ok=True)
+        for name in STATE_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        meta = {"analysis_date": self.analysis_date.isoformat(),
+                "seg_map": self.seg_map,
+                "boundaries": {name: getattr(self.boundaries, name).tolist()
+                               for name in ("recency", "last_order_day", "frequency_value", "frequency_row", "monetary")}}
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump(meta, file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """save ile kaydedilmiş durumu yükler"""
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy")) for name in STATE_ARRAYS}
+        boundaries = Boundaries(**{name: np.asarray(values) for name, values in meta["boundaries"].items()})
+        return cls(analysis_date=dt.datetime.fromisoformat(meta["analysis_date"]),
+                   boundaries=boundaries, seg_map=meta["seg_map"], **arrays)
+
+
+def build_state(dataframe, analysis_date=ANALYSIS_DATE, seg_map=SEG_MAP):
+    """Müşteri tablosundan (flo_data_20k.csv şeması) başlangıç durumunu oluşturur"""
+    customer_id = dataframe["master_id"].to_numpy().astype("S")
+    n = len(customer_id)
+    state = RFMState(analysis_date=analysis_date,
+                     customer_id=customer_id,
+                     id_order=np.argsort(customer_id, kind="stable"),
+                     last_order_day=_to_days(dataframe["last_order_date"]),
+                     frequency=(dataframe["order_num_total_ever_online"] +
+                                dataframe["order_num_total_ever_offline"]).to_numpy(dtype=np.float64, copy=True),
+                     monetary=(dataframe["customer_value_total_ever_offline"] +
+                               dataframe["customer_value_total_ever_online"]).to_numpy(dtype=np.float64, copy=True),
+                     recency_score=np.zeros(n, dtype=np.int8),
+                     frequency_score=np.zeros(n, dtype=np.int8),
+                     monetary_score=np.zeros(n, dtype=np.int8),
+                     segment=np.zeros(n, dtype=np.int8),
+                     seg_map=dict(seg_map))
+    state.boundaries = _boundaries(state)
+    _score(state, state.boundaries)
+    return state
+
+
+def read_delta(path):
+    """Sipariş olayları delta dosyasını okur"""
+    return pd.read_csv(path, dtype={"order_num": "float64", "order_value": "float64"}, parse_dates=["order_date"])
+
+
+@dataclass
+class UpdateResult:
+    """apply_delta sonucu"""
+    changed: pd.DataFrame   # Segmenti değişen müşteriler: customer_id, old_segment, new_segment
+    new_customers: int
+    updated_customers: int
+    rebinned: bool          # Kantil sınırları değişti mi?
+    rescored: int           # Yeniden skorlanan müşteri sayısı (delta + kayan sınırların arasında kalanlar)
+
+
+def apply_delta(state, delta, analysis_date=None):
+    """Sipariş olaylarını duruma uygular, analiz tarihini ilerletir ve segmenti değişen müşterileri raporlar
+
+    analysis_date verilmezse analiz tarihi bir gün ilerletilir.
+    """
+    old_day = state.analysis_day
+    state.analysis_date = state.analysis_date + dt.timedelta(days=1) if analysis_date is None else analysis_date
+
+    # Aynı müşteriye ait olaylar tek satırda birleştirilir
+    events = (delta.assign(order_day=_to_days(delta["order_date"]))
+              .groupby("master_id", sort=False)
+              .agg(order_day=("order_day", "max"), order_num=("order_num", "sum"), order_value=("order_value", "sum")))
+    rows = state.find(events.index.to_numpy().astype("S"))
+    old_segment = state.segment.copy()
+
+    # Mevcut müşterileri güncelle
+    existing = rows >= 0
+    rows_existing = rows[existing]
+    state.last_order_day[rows_existing] = np.maximum(state.last_order_day[rows_existing],
+                                                     events["order_day"].to_numpy()[existing])
+    state.frequency[rows_existing] += events["order_num"].to_numpy()[existing]
+    state.monetary[rows_existing] += events["order_value"].to_numpy()[existing]
+
+    # Yeni müşterileri sona ekle (mevcut satır konumları değişmez)
+    new = events[~existing]
+    n_old = len(state.customer_id)
+    if len(new):
+        new_ids = new.index.to_numpy().astype("S")
+        # Sıralama indeksine yeni müşteriler tüm tablo yeniden sıralanmadan yerleştirilir
+        new_order = np.argsort(new_ids, kind="stable")
+        insert_at = np.searchsorted(state.customer_id, new_ids[new_order], sorter=state.id_order)
+        state.id_order = np.insert(state.id_order, insert_at, n_old + new_order)
+        state.customer_id = np.concatenate([state.customer_id, new_ids])
+        state.last_order_day = np.concatenate([state.last_order_day, new["order_day"].to_numpy(dtype=np.int32)])
+        state.frequency = np.concatenate([state.frequency, new["order_num"].to_numpy(dtype=np.float64)])
+        state.monetary = np.concatenate([state.monetary, new["order_value"].to_numpy(dtype=np.float64)])
+        for name in ("recency_score", "frequency_score", "monetary_score", "segment"):
+            setattr(state, name, np.concatenate([getattr(state, name), np.zeros(len(new), dtype=np.int8)]))
+        old_segment = np.concatenate([old_segment, np.full(len(new), -1, dtype=np.int8)])
+
+    # Deltadaki müşterileri ve sınırlar kaydıysa eski ve yeni sınır arasında kalan müşterileri yeniden skorla
+    boundaries = _boundaries(state)
+    rebinned = boundaries != state.boundaries
+    touched = np.concatenate([rows_existing, np.arange(n_old, len(state.customer_id))])
+    if rebinned:
+        touched = np.union1d(touched, _moved_rows(state, state.boundaries, boundaries, old_day))
+    state.boundaries = boundaries
+    _score(state, boundaries, touched)
+
+    changed_rows = np.flatnonzero(state.segment != old_segment)
+    names = np.array(state.segment_names + (None,), dtype=object)  # -1 kodu (yeni müşteri) -> None
+    changed = pd.DataFrame({"customer_id": state.customer_id[changed_rows].astype(str),
+                            "old_segment": names[old_segment[changed_rows]],
+                            "new_segment": names[state.segment[changed_rows]]})
+    return UpdateResult(changed=changed, new_customers=len(new),
+                        updated_customers=int(existing.sum()), rebinned=rebinned, rescored=len(touched))
@@ -0,0 +1,123 @@
+##############################################################################################################################
+# Tipli Veri Okuma ve Sütunsal Önbellek (Typed Ingest & Columnar Cache)
+##############################################################################################################################
+
+# pd.read_csv her çalıştırmada tüm CSV'yi yeniden ayrıştırır, tarih sütunlarının biçimini sütun sütun tahmin eder ve
+# metin sütunlarını Python nesnesi olarak tutar. Bu modül flo_data_20k.csv şeması için açık bir şema kullanır:
+#
+# - Tarihler sabit "%Y-%m-%d" biçimiyle ayrıştırılır.
+# - order_channel, last_order_channel ve interested_in_categories_12 kategorik tiptedir.
+# - Sipariş sayıları int32 olarak tutulur. Harcama tutarları float64 kalır (float32 kuruş değerlerini yuvarlar).
+#
+# Tipli tablo, kaynak dosyanın SHA-256 özeti ve şemanın özetiyle adlandırılan sıkıştırılmamış bir Arrow IPC (Feather v2)
+# dosyasına yazılır. Sonraki çalıştırmalarda CSV yerine bu dosya belleğe eşlenerek (memory-map) okunur. Kaynak dosya ya da
+# şema (CSV_DTYPES, DATE_FORMAT, ...) değiştiğinde dosya adı da değişeceğinden eski önbellek kendiliğinden geçersiz olur.
+# Kaynak dosyanın özeti, dosyanın boyutu ve değiştirilme zamanıyla birlikte önbellek dizininde saklanır; bunlar
+# değişmedikçe büyük dosyalar her çalıştırmada yeniden okunup özetlenmez. pyarrow kurulu değilse önbellek kullanılmaz.
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow isteğe bağlıdır
+    feather = None
+
+DATE_FORMAT = "%Y-%m-%d"
+DATE_COLUMNS = ["first_order_date", "last_order_date", "last_order_date_online", "last_order_date_offline"]
+
+# Tarih sütunları dışındaki sütunların tipleri
+CSV_DTYPES = {
+    "order_channel": "category",
+    "last_order_channel": "category",
+    "order_num_total_ever_online": "float32",
+    "order_num_total_ever_offline": "float32",
+    "customer_value_total_ever_offline": "float64",
+    "customer_value_total_ever_online": "float64",
+    "interested_in_categories_12": "category",
+}
+COUNT_COLUMNS = ["order_num_total_ever_online", "order_num_total_ever_offline"]
+
+DEFAULT_CACHE_DIR = ".rfm_cache"
+
+
+def read_customers_csv(path, **kwargs):
+    """Müşteri CSV dosyasını açık şemayla okur"""
+    dataframe = pd.read_csv(path, dtype=CSV_DTYPES, **kwargs)
+    for col in DATE_COLUMNS:
+        if col in dataframe.columns:
+            dataframe[col] = pd.to_datetime(dataframe[col], format=DATE_FORMAT)
+    for col in COUNT_COLUMNS:
+        if col in dataframe.columns:
+            # CSV'de "4.0" biçiminde yazılan sipariş sayıları tamsayıya çevrilir
+            dataframe[col] = dataframe[col].astype("int32")
+    return dataframe
+
+
+def source_hash(path, block_size=1 << 20):
+    """Kaynak dosyanın SHA-256 özetini döndürür"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def schema_hash():
+    """Okuma şemasının özeti; şema değiştiğinde önbellek dosyalarının adı da değişir"""
+    schema = {"dtypes": CSV_DTYPES, "date_columns": DATE_COLUMNS, "date_format": DATE_FORMAT,
+              "count_columns": COUNT_COLUMNS}
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def cached_source_hash(path, cache_dir):
+    """source_hash(path) değerini, dosyanın boyutu ve değiştirilme zamanı değişmediyse cache_dir'deki kayıttan döndürür"""
+    stat = os.stat(path)
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    record_path = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{key}.source.json")
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    try:
+        with open(record_path) as file:
+            record = json.load(file)
+        if {name: record.get(name) for name in signature} == signature:
+            return record["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = source_hash(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(record_path + ".tmp", "w") as file:
+        json.dump({**signature, "sha256": digest}, file)
+    os.replace(record_path + ".tmp", record_path)
+    return digest
+
+
+def cache_path(path, cache_dir=None):
+    """Kaynak dosya için önbellek dosyasının yolunu döndürür"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), DEFAULT_CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{cached_source_hash(path, cache_dir)[:16]}-{schema_hash()}.arrow")
+
+
+def load_customers(path, cache_dir=None, use_cache=True):
+    """Müşteri tablosunu önbellekten (varsa) ya da CSV'den tipli olarak yükler
+
+    İlk çalıştırmada CSV okunur ve önbellek yazılır; sonraki çalıştırmalarda önbellek dosyası belleğe eşlenerek okunur.
+    """
+    if not use_cache or feather is None:
+        return read_customers_csv(path)
+
+    cached = cache_path(path, cache_dir)
+    if os.path.exists(cached):
+        return feather.read_table(cached, memory_map=True).to_pandas()
+
+    dataframe = read_customers_csv(path)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    # Yarım kalan yazımların geçerli önbellek gibi görünmemesi için önce geçici dosyaya yazılır
+    feather.write_feather(dataframe, cached + ".tmp", compression="uncompressed")
+    os.replace(cached + ".tmp", cached)
+    return dataframe
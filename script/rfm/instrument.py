@@ -0,0 +1,141 @@
+##############################################################################################################################
+# Adım Bazında Ölçüm ve Çalıştırma Raporu (Instrumentation)
+##############################################################################################################################
+
+# create_rfm ve veri keşfi adımları isimlendirilmiş aşamalara bölünmüştür. Bir Instrument nesnesi verildiğinde her
+# aşama için süre, satır sayısı ve bellek (RSS) değişimi kaydedilir; istenirse aşama başına tracemalloc en yüksek
+# bellek kullanımı ve cProfile çıktısı da toplanır. Sonuç yapılandırılmış bir RunReport olarak alınır.
+#
+#   instrument = Instrument(profile=True)
+#   rfm = create_rfm(df, instrument=instrument)
+#   print(instrument.report)
+#   instrument.report.to_json("run_report.json")
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def rss_mb():
+    """Sürecin anlık bellek kullanımını (RSS, MB) döndürür; desteklenmeyen sistemlerde None"""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE / 2 ** 20
+    except OSError:
+        return None
+
+
+def peak_rss_mb():
+    """Sürecin başlangıcından bu yana en yüksek bellek kullanımı (ru_maxrss, MB); desteklenmeyen sistemlerde None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # macOS bayt, Linux KB döndürür
+
+
+@dataclass
+class StageRecord:
+    """Tek bir aşamanın ölçümleri"""
+    name: str
+    seconds: float = None
+    rows: int = None
+    rss_delta_mb: float = None
+    peak_rss_mb: float = None     # Süreç başından aşama sonuna kadarki en yüksek RSS (Arrow / numpy dahil)
+    peak_traced_mb: float = None  # Yalnızca trace_memory=True ise
+    profile: str = None           # Yalnızca profile=True ise (en pahalı fonksiyonlar)
+
+
+@dataclass
+class RunReport:
+    """Bir çalıştırmadaki tüm aşamaların raporu"""
+    stages: list = field(default_factory=list)
+
+    @property
+    def total_seconds(self):
+        return sum(stage.seconds or 0 for stage in self.stages)
+
+    def to_dict(self):
+        return {"total_seconds": self.total_seconds, "stages": [asdict(stage) for stage in self.stages]}
+
+    def to_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def __str__(self):
+        lines = [f"{'stage':<20}{'seconds':>10}{'rows':>12}{'rss_delta_mb':>14}{'peak_rss_mb':>13}{'peak_traced_mb':>16}"]
+        for stage in self.stages:
+            lines.append(f"{stage.name:<20}{stage.seconds:>10.4f}{_fmt(stage.rows, 'd'):>12}"
+                         f"{_fmt(stage.rss_delta_mb, '.1f'):>14}{_fmt(stage.peak_rss_mb, '.1f'):>13}"
+                         f"{_fmt(stage.peak_traced_mb, '.1f'):>16}")
+        lines.append(f"{'total':<20}{self.total_seconds:>10.4f}")
+        return "\n".join(lines)
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+class Instrument:
+    """Aşama ölçümlerini toplar"""
+
+    def __init__(self, profile=False, trace_memory=False, profile_limit=15):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_limit = profile_limit
+        self.report = RunReport()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Bir aşamayı ölçer; satır sayısı sonradan record.rows ile de verilebilir"""
+        record = StageRecord(name=name, rows=rows)
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace_memory:
+            tracemalloc.start()
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record.seconds = time.perf_counter() - start
+            rss_after = rss_mb()
+            if rss_before is not None and rss_after is not None:
+                record.rss_delta_mb = rss_after - rss_before
+            record.peak_rss_mb = peak_rss_mb()
+            if self.trace_memory:
+                record.peak_traced_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                tracemalloc.stop()
+            if profiler:
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.profile_limit)
+                record.profile = stream.getvalue()
+            self.report.stages.append(record)
+
+
+def stage(instrument, name, rows=None):
+    """instrument verilmişse aşamayı ölçen, verilmemişse hiçbir şey yapmayan bağlam yöneticisi"""
+    if instrument is None:
+        return nullcontext(StageRecord(name=name, rows=rows))
+    return instrument.stage(name, rows=rows)
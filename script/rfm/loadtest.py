@@ -0,0 +1,92 @@
+##############################################################################################################################
+# Skorlama Servisi Yük Testi (Load Test)
+##############################################################################################################################
+
+# rfm.service'e eşzamanlı keep-alive bağlantılar üzerinden istek gönderir ve istek başına gecikmenin p50/p99
+# değerlerini ve saniye başına istek sayısını raporlar. Sorgulanan müşteriler segment deposundan rastgele seçilir;
+# --score-share oranındaki istekler depoda olmayan müşteriler için /score çağrısıdır.
+#
+# Kullanım (script/ dizininden, servis çalışırken):
+#
+#   python -m rfm.loadtest --store .rfm_store --port 8080 --requests 50000 --concurrency 16
+#   python -m rfm.loadtest --store .rfm_store --unix /tmp/rfm.sock
+
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from rfm.store import SegmentStore
+
+
+def make_targets(store, n, score_share=0.1, seed=0):
+    """Depodaki müşteriler ve yeni müşteri skorlamaları için istek yollarını üretir"""
+    rng = np.random.default_rng(seed)
+    customer_ids = store.customer_id[rng.integers(0, len(store), size=n)]
+    is_score = rng.random(n) < score_share
+    recency = rng.integers(1, 366, size=n)
+    frequency = rng.integers(1, 30, size=n)
+    monetary = rng.gamma(2.5, 300, size=n).round(2)
+    return [f"/score?recency={recency[i]}&frequency={frequency[i]}&monetary={monetary[i]}" if is_score[i]
+            else f"/customers/{customer_ids[i].decode()}"
+            for i in range(n)]
+
+
+async def _client(targets, latencies, host, port, unix):
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: rfm\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(targets, concurrency=16, host="127.0.0.1", port=8080, unix=None):
+    """İstekleri concurrency bağlantıya paylaştırır; (gecikmeler, toplam süre) döndürür"""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(targets[i::concurrency], latencies, host, port, unix) for i in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def summarize(latencies, seconds):
+    milliseconds = latencies * 1000
+    return {"requests": len(latencies),
+            "seconds": seconds,
+            "throughput_rps": len(latencies) / seconds,
+            "p50_ms": float(np.percentile(milliseconds, 50)),
+            "p99_ms": float(np.percentile(milliseconds, 99)),
+            "max_ms": float(milliseconds.max())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rfm.loadtest", description="Load test for rfm.service")
+    parser.add_argument("--store", default=".rfm_store", help="segment store used to pick customer ids")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--score-share", type=float, default=0.1, help="share of /score requests (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    targets = make_targets(SegmentStore.open(args.store), args.requests, args.score_share, args.seed)
+    latencies, seconds = asyncio.run(run_load(targets, args.concurrency, args.host, args.port, args.unix))
+    for name, value in summarize(latencies, seconds).items():
+        print(f"{name:<16}{value:>12.3f}" if isinstance(value, float) else f"{name:<16}{value:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+##############################################################################################################################
+# Çok Çekirdekli (Paralel) RFM Skorlama
+##############################################################################################################################
+
+# CSV dosyası satır sınırlarına hizalanmış bayt aralıklarına bölünür ve her bölüm bir süreç havuzunda işlenir:
+#
+# 1. tur: Her işçi kendi bölümünü okur, recency/frequency/monetary değerlerini hesaplar, geçici dosyaya yazar ve
+#         kantil özetlerini (recency ve frequency için ValueHistogram, monetary için KLLSketch) döndürür.
+# 2. tur: Birleştirilen KLL özetinden her hedef kantil için dar bir değer aralığı seçilir. İşçiler bu aralığın altında
+#         kalan değer sayısını ve aralıktaki değerleri döndürür; monetary sınırları bu sayede kesin olarak bulunur.
+#         (Özet aralığı ıskalarsa aralık genişletilerek tekrar sorulur.)
+# 3. tur: Her işçi kendi bölümünü birleşik sınırlarla skorlar, segmentler ve sonucu dosyaya yazar. Ana sürece yalnızca
+#         satır sayıları döner; output_path verilirse bölüm dosyaları ayrıştırılmadan, bayt olarak art arda eklenir.
+#
+# Bölümler müşteri numarasının özetine (hash) göre değil, dosyadaki sıraya göre ayrılır. rank(method="first") eşit
+# frequency değerlerini dosya sırasına göre sıraladığından, her bölüm kendinden önceki bölümlerdeki eşit değer
+# sayılarını ekleyerek create_rfm ile birebir aynı frequency skorlarını üretir. Bölme işlemi tırnak içindeki alanlarda
+# satır sonu bulunmadığını varsayar (flo_data_20k.csv şeması için geçerlidir).
+
+import io
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rfm.core import ANALYSIS_DATE, RFM_COLUMNS
+from rfm.segments import assign_segments
+from rfm.sketch import QUINTILES, KLLSketch, ValueHistogram, _lerp, qcut_codes
+from rfm.streaming import RFM_SOURCE_COLUMNS, _rfm_metrics
+
+
+def split_csv(path, n_partitions):
+    """CSV dosyasını satır sınırlarına hizalanmış (başlangıç, bitiş) bayt aralıklarına böler"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        header = file.readline()
+        start = file.tell()
+        bounds = [start]
+        for i in range(1, n_partitions):
+            file.seek(max(start, size * i // n_partitions))
+            file.readline()  # Bir sonraki satır başına ilerle
+            bounds.append(max(file.tell(), bounds[-1]))
+    bounds.append(size)
+    columns = header.decode().strip().split(",")
+    return columns, [(bounds[i], bounds[i + 1]) for i in range(n_partitions) if bounds[i] < bounds[i + 1]]
+
+
+def _read_partition(path, columns, byte_range):
+    start, stop = byte_range
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(stop - start)
+    return pd.read_csv(io.BytesIO(data), names=columns, usecols=RFM_SOURCE_COLUMNS)
+
+
+def _summarize(task):
+    """1. tur: Bölümün RFM metriklerini hesaplar, geçici dosyaya yazar ve kantil özetlerini döndürür"""
+    path, columns, byte_range, analysis_date, k, seed, work_path = task
+    rfm = _rfm_metrics(_read_partition(path, columns, byte_range), analysis_date)
+    rfm.to_pickle(work_path)
+    return (ValueHistogram().update(rfm["recency"]),
+            ValueHistogram().update(rfm["frequency"]),
+            KLLSketch(k=k, seed=seed).update(rfm["monetary"]))
+
+
+def _band(task):
+    """2. tur: Her aralık için aralığın altındaki değer sayısını ve aralıktaki sıralı değerleri döndürür"""
+    work_path, lows, highs = task
+    monetary = pd.read_pickle(work_path)["monetary"].to_numpy()
+    return [(int(np.count_nonzero(monetary < low)), np.sort(monetary[(monetary >= low) & (monetary <= high)]))
+            for low, high in zip(lows, highs)]
+
+
+def _score(task):
+    """3. tur: Bölümü birleşik sınırlarla skorlar, segmentler ve sonucu dosyaya yazar; satır sayısını döndürür"""
+    work_path, scored_path, header, recency_edges, monetary_edges, rank_edges, values, less, seen = task
+    rfm = pd.read_pickle(work_path)
+
+    # rank(method="first"): küçük değerler + önceki bölümlerdeki eşit değerler + bu bölümde önce gelen eşit değerler + 1
+    position = np.searchsorted(values, rfm["frequency"])
+    rank = less[position] + seen[position] + rfm.groupby(position).cumcount().to_numpy() + 1
+
+    recency_score = 5 - qcut_codes(rfm["recency"], recency_edges)
+    frequency_score = 1 + qcut_codes(rank, rank_edges)
+    monetary_score = 1 + qcut_codes(rfm["monetary"], monetary_edges)
+
+    scores = pd.DataFrame({"recency": recency_score, "frequency": frequency_score, "monetary": monetary_score},
+                          index=rfm.index).astype(str)
+    rfm["RF_SCORE"] = scores["recency"] + scores["frequency"]
+    rfm["RFM_SCORE"] = rfm["RF_SCORE"] + scores["monetary"]
+    rfm["segment"] = assign_segments(recency_score, frequency_score)
+    if scored_path.endswith(".csv"):
+        rfm[RFM_COLUMNS].to_csv(scored_path, header=header, index=False)
+    else:
+        rfm[RFM_COLUMNS].to_pickle(scored_path)
+    return len(rfm)
+
+
+def _exact_quantiles(executor, work_paths, sketch, n, margin):
+    """KLL özetinden başlayarak monetary kantillerini kesin olarak bulur (np.quantile ile aynı)"""
+    positions = (n - 1) * QUINTILES
+    low = np.floor(positions).astype(np.int64)
+    high = np.minimum(low + 1, n - 1)
+    targets = np.unique(np.concatenate([low, high]))
+    found = {}
+    while len(found) < len(targets):
+        missing = np.array([t for t in targets if t not in found])
+        scale = max(n - 1, 1)
+        lows = sketch.quantiles(np.clip(missing - margin, 0, n - 1) / scale)
+        highs = sketch.quantiles(np.clip(missing + margin, 0, n - 1) / scale)
+        results = list(executor.map(_band, [(work_path, lows, highs) for work_path in work_paths]))
+        for j, target in enumerate(missing):
+            less = sum(result[j][0] for result in results)
+            band = np.sort(np.concatenate([result[j][1] for result in results]))
+            if less <= target < less + len(band):
+                found[target] = band[target - less]
+        margin = max(margin, 1) * 4  # Özet aralığı ıskaladıysa aralığı genişlet
+    value = np.vectorize(found.get)
+    return _lerp(value(low), value(high), positions - low)
+
+
+def create_rfm_parallel(path, output_path=None, n_jobs=None, n_partitions=None, analysis_date=ANALYSIS_DATE, k=2000,
+                        seed=None):
+    """RFM segmentasyonunu CSV dosyasını bölümlere ayırıp bir süreç havuzunda paralel olarak oluşturur
+
+    Sonuç create_rfm(pd.read_csv(path)) ile aynıdır. output_path verilirse sonuçlar CSV dosyasına yazılır ve None döner;
+    verilmezse bölümler birleştirilerek döndürülür (yalnızca belleğe sığan veriler için).
+    """
+    n_jobs = n_jobs or os.cpu_count()
+    columns, byte_ranges = split_csv(path, n_partitions or n_jobs)
+
+    with tempfile.TemporaryDirectory() as work_dir, ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        work_paths = [os.path.join(work_dir, f"part-{i}.pkl") for i in range(len(byte_ranges))]
+        summaries = list(executor.map(_summarize, [(path, columns, byte_range, analysis_date, k, seed, work_path)
+                                                   for byte_range, work_path in zip(byte_ranges, work_paths)]))
+
+        # Özetleri birleştir
+        recency, frequency, monetary = ValueHistogram(), ValueHistogram(), KLLSketch(k=k, seed=seed)
+        for partial_recency, partial_frequency, partial_monetary in summaries:
+            recency.merge(partial_recency)
+            frequency.merge(partial_frequency)
+            monetary.merge(partial_monetary)
+        n = frequency.n
+
+        recency_edges = recency.quantiles()
+        monetary_edges = _exact_quantiles(executor, work_paths, monetary, n, margin=math.ceil(4 * n / k))
+        rank_edges = 1 + QUINTILES * (n - 1)
+
+        # Her bölüm için önceki bölümlerdeki frequency değer sayıları
+        values = frequency.values
+        less = frequency.count_less(values)
+        seen = np.zeros(len(values), dtype=np.int64)
+        extension = "csv" if output_path is not None else "pkl"
+        scored_paths = [os.path.join(work_dir, f"scored-{i}.{extension}") for i in range(len(work_paths))]
+        tasks = []
+        for i, (work_path, (_, partial_frequency, _)) in enumerate(zip(work_paths, summaries)):
+            tasks.append((work_path, scored_paths[i], i == 0, recency_edges, monetary_edges, rank_edges, values, less,
+                          seen.copy()))
+            seen[np.searchsorted(values, partial_frequency.values)] += partial_frequency.counts
+        list(executor.map(_score, tasks))
+
+        if output_path is None:
+            return pd.concat([pd.read_pickle(scored_path) for scored_path in scored_paths], ignore_index=True)
+        with open(output_path, "wb") as output:
+            for scored_path in scored_paths:
+                with open(scored_path, "rb") as part:
+                    shutil.copyfileobj(part, output)
+        return None
@@ -0,0 +1,253 @@
+##############################################################################################################################
+# Tembel (Lazy) Özet Sorguları: Tek Geçişte Birleştirilmiş Toplamlar ve İlk k Listeleri
+##############################################################################################################################
+
+# Kanal dağılımı (groupby), segment istatistikleri (groupby) ve en çok harcayan / sipariş veren müşteriler
+# (sort_values + head) her biri tablonun tamamı üzerinde ayrı bir geçiş yapar; ilk k listeleri için tüm tablo sıralanır.
+# Query istenen özetleri önce toplar, collect() çağrıldığında hepsini tablo üzerinde tek bir geçişte, bloklar halinde
+# hesaplar:
+#
+# - groupby : Her blokta anahtar değerleri kodlanır ve count / sum / mean / min / max değerleri np.bincount ile
+#             biriktirilir. Sonuç pandas groupby(...).agg(...) ile aynı biçimdedir (mean = sum / count).
+# - top_k   : Her blokta yalnızca en büyük k değer seçilir (np.partition) ve önceki adaylarla birleştirilir; tam
+#             sıralama yapılmaz. Eşit değerlerde önce gelen satır seçilir (nlargest(keep="first") ile aynı).
+#
+# Kaynak bir DataFrame ya da Query.from_csv ile parça parça okunan bir CSV dosyası olabilir. CSV okunurken yalnızca
+# sorguların ihtiyaç duyduğu sütunlar okunur.
+#
+#   summary = (Query(df)
+#              .groupby("order_channel", {"master_id": "count", "customer_value_total": "sum"}, name="channels")
+#              .top_k("customer_value_total", 10, name="top_revenue")
+#              .collect())
+#   summary["channels"], summary["top_revenue"]
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+
+def _top_positions(values, k):
+    """En büyük k değerin (NaN hariç) konumlarını artan sırada döndürür; eşit değerlerde önce gelen seçilir"""
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) <= k:
+        return valid
+    values = values[valid]
+    threshold = np.partition(values, len(values) - k)[len(values) - k]
+    above = valid[values > threshold]
+    equal = valid[values == threshold][:k - len(above)]
+    return np.sort(np.concatenate([above, equal]))
+
+
+class _GroupBy:
+    """Bir anahtar sütuna göre blok blok biriktirilen toplamlar"""
+
+    def __init__(self, key, aggs, name):
+        self.key = key
+        self.name = name
+        self.flat = all(isinstance(agg, str) for agg in aggs.values())
+        self.aggs = {column: [agg] if isinstance(agg, str) else list(agg) for column, agg in aggs.items()}
+        unknown = {agg for column_aggs in self.aggs.values() for agg in column_aggs} - set(AGGREGATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported aggregations {sorted(unknown)}; use {AGGREGATIONS}.")
+        self.reset()
+
+    def reset(self):
+        self.groups = {}       # Anahtar değeri -> grup numarası
+        self.categories = None
+        self.dtypes = {}
+        self.state = {}        # (sütun, "count" / "sum" / "min" / "max") -> grup başına dizi
+
+    @property
+    def columns(self):
+        return [self.key, *self.aggs]
+
+    def _array(self, column, stat, size, fill):
+        array = self.state.get((column, stat))
+        if array is None:
+            array = np.full(size, fill, dtype=np.float64 if stat != "count" else np.int64)
+        elif len(array) < size:
+            array = np.concatenate([array, np.full(size - len(array), fill, dtype=array.dtype)])
+        self.state[column, stat] = array
+        return array
+
+    def update(self, block):
+        keys = block[self.key]
+        if self.categories is None and isinstance(keys.dtype, pd.CategoricalDtype):
+            self.categories = list(keys.dtype.categories)
+        codes, uniques = pd.factorize(keys)
+        ids = np.array([self.groups.setdefault(value, len(self.groups)) for value in uniques], dtype=np.int64)
+        has_key = codes >= 0  # groupby gibi eksik anahtarlar atlanır
+        groups = ids[codes[has_key]]
+        size = len(self.groups)
+
+        for column, column_aggs in self.aggs.items():
+            series = block[column][has_key]
+            self.dtypes.setdefault(column, series.dtype)
+            numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan) if numeric else None
+            present = ~np.isnan(values) if numeric else series.notna().to_numpy()
+            present_groups = groups[present]
+
+            self._array(column, "count", size, 0)[:] += np.bincount(present_groups, minlength=size)
+            if not numeric:
+                continue
+            if "sum" in column_aggs or "mean" in column_aggs:
+                self._array(column, "sum", size, 0.0)[:] += np.bincount(present_groups, weights=values[present],
+                                                                        minlength=size)
+            if "min" in column_aggs:
+                np.minimum.at(self._array(column, "min", size, np.inf), present_groups, values[present])
+            if "max" in column_aggs:
+                np.maximum.at(self._array(column, "max", size, -np.inf), present_groups, values[present])
+
+    def result(self):
+        labels = list(self.groups)
+        if self.categories is not None:
+            # Kategorik anahtarlar groupby'da kategori sırasıyla sıralanır
+            position = {category: i for i, category in enumerate(self.categories)}
+            order = sorted(range(len(labels)), key=lambda i: position.get(labels[i], len(position)))
+        else:
+            order = sorted(range(len(labels)), key=lambda i: labels[i])
+        size = len(labels)
+
+        result = {}
+        for column, column_aggs in self.aggs.items():
+            dtype = self.dtypes.get(column)
+            integer = dtype is not None and pd.api.types.is_integer_dtype(dtype)
+            count = self._array(column, "count", size, 0)
+            for agg in column_aggs:
+                if agg == "count":
+                    values = count
+                elif agg == "mean":
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        values = self._array(column, "sum", size, 0.0) / count
+                else:
+                    values = self._array(column, agg, size, 0.0 if agg == "sum" else np.nan)
+                    if agg in ("min", "max"):
+                        observed = count > 0
+                        values = values.astype(dtype) if integer and observed.all() else np.where(observed, values, np.nan)
+                    elif integer:
+                        values = values.astype(np.int64)
+                result[column if self.flat else (column, agg)] = values[order]
+
+        index = pd.Index([labels[i] for i in order], name=self.key)
+        if self.categories is not None:
+            index = pd.CategoricalIndex(index, categories=self.categories, name=self.key)
+        return pd.DataFrame(result, index=index)
+
+
+class _TopK:
+    """Bir sütunun en büyük k değerine sahip satırları"""
+
+    def __init__(self, column, k, columns, name):
+        self.column = column
+        self.k = k
+        self.select_columns = columns
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.values = np.empty(0)
+        self.positions = np.empty(0, dtype=np.int64)  # Adayların tablodaki konumları (artan sırada)
+        self.rows = None                               # Yalnızca parça parça okunan kaynaklarda: aday satırlar
+
+    @property
+    def columns(self):
+        return None if self.select_columns is None else [self.column, *self.select_columns]
+
+    def update(self, block, start, keep_rows):
+        values = block[self.column].to_numpy(dtype=np.float64, na_value=np.nan)
+        candidates = _top_positions(values, self.k)
+        values = np.concatenate([self.values, values[candidates]])
+        positions = np.concatenate([self.positions, start + candidates])
+        keep = _top_positions(values, self.k)
+        self.values, self.positions = values[keep], positions[keep]
+        if keep_rows:
+            rows = block.iloc[candidates]
+            self.rows = (rows if self.rows is None else pd.concat([self.rows, rows])).iloc[keep]
+
+    def result(self, frame=None):
+        order = np.lexsort((self.positions, -self.values))
+        rows = frame.iloc[self.positions[order]] if frame is not None else self.rows.iloc[order]
+        return rows if self.select_columns is None else rows[self.columns]
+
+
+class Query:
+    """Özet sorgularını toplayan ve collect() ile tek geçişte çalıştıran tembel sorgu planı"""
+
+    def __init__(self, source, block_size=DEFAULT_BLOCK_SIZE):
+        self.source = source  # DataFrame ya da sütun listesi alıp DataFrame parçaları üreten fonksiyon
+        self.block_size = block_size
+        self.operations = []
+
+    @classmethod
+    def from_csv(cls, path, chunksize=1_000_000, **read_csv_kwargs):
+        """CSV dosyasını collect() sırasında, yalnızca gereken sütunları okuyarak parça parça tarar"""
+        def read(columns):
+            return pd.read_csv(path, usecols=columns, chunksize=chunksize, **read_csv_kwargs)
+        return cls(read)
+
+    def _add(self, operation):
+        names = [existing.name for existing in self.operations]
+        if operation.name in names:
+            raise ValueError(f"Duplicate query name {operation.name!r}.")
+        self.operations.append(operation)
+        return self
+
+    def groupby(self, key, aggs, name=None):
+        """key'e göre gruplanmış toplamlar: aggs {sütun: "sum" | ["mean", "count"], ...} biçimindedir"""
+        return self._add(_GroupBy(key, aggs, name or f"{key}_stats"))
+
+    def top_k(self, column, k=10, columns=None, name=None):
+        """column değeri en büyük k satır (columns verilmezse tüm sütunlar)"""
+        return self._add(_TopK(column, k, columns, name or f"top_{k}_{column}"))
+
+    @property
+    def required_columns(self):
+        """Taranması gereken sütunlar; tüm satırı döndüren bir top_k varsa None (tüm sütunlar)"""
+        columns = [operation.columns for operation in self.operations]
+        if any(column_list is None for column_list in columns):
+            return None
+        return list(dict.fromkeys(column for column_list in columns for column in column_list))
+
+    def explain(self):
+        """Tek geçişte çalıştırılacak planı metin olarak döndürür"""
+        source = "DataFrame" if isinstance(self.source, pd.DataFrame) else "chunked reader"
+        columns = self.required_columns
+        lines = [f"Scan {source} columns={'*' if columns is None else columns}"]
+        for operation in self.operations:
+            if isinstance(operation, _GroupBy):
+                lines.append(f"  {operation.name}: groupby({operation.key!r}) {operation.aggs}")
+            else:
+                lines.append(f"  {operation.name}: top_k({operation.column!r}, k={operation.k})")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.explain()
+
+    def _blocks(self):
+        columns = self.required_columns
+        if isinstance(self.source, pd.DataFrame):
+            frame = self.source if columns is None else self.source[columns]
+            for start in range(0, len(frame), self.block_size):
+                yield start, frame.iloc[start:start + self.block_size]
+        else:
+            start = 0
+            for chunk in self.source(columns):
+                yield start, chunk
+                start += len(chunk)
+
+    def collect(self):
+        """Tüm sorguları tek geçişte çalıştırır; sorgu adı -> DataFrame sözlüğü döndürür"""
+        in_memory = isinstance(self.source, pd.DataFrame)
+        for operation in self.operations:
+            operation.reset()  # Aynı plan tekrar collect edilebilir
+        for start, block in self._blocks():
+            for operation in self.operations:
+                if isinstance(operation, _TopK):
+                    operation.update(block, start, keep_rows=not in_memory)
+                else:
+                    operation.update(block)
+        return {operation.name: operation.result(self.source) if isinstance(operation, _TopK) and in_memory
+                else operation.result() for operation in self.operations}
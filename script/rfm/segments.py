@@ -0,0 +1,105 @@
+##############################################################################################################################
+# Segment Atama Motoru (5x5 Arama Tablosu)
+##############################################################################################################################
+
+# rfm["RF_SCORE"].replace(seg_map, regex=True) her satır için on ayrı regex'i string sütun üzerinde çalıştırır.
+# RF skorunun yalnızca 5x5 = 25 olası değeri olduğundan seg_map bir kez (recency_score, frequency_score) ile
+# indekslenen 5x5'lik bir tamsayı tablosuna derlenir ve segmentler satır başına string işlemi yapılmadan,
+# tek bir numpy indekslemesiyle kategorik sütun olarak atanır.
+#
+# Regex yaklaşımında bir RF skoruna birden fazla desen uyduğunda (çakışma) hangi segmentin seçileceğine sözlükteki
+# sıra sessizce karar verir; hiçbir desene uymayan skorlar (boşluk) ise olduğu gibi "34" gibi kalır. Derleme sırasında
+# da ilk uyan desen seçilir, ancak check_seg_map ile çakışmalar ve boşluklar raporlanabilir.
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# RF skorlarına karşılık gelen segment isimleri (anahtarlar regex desenleridir)
+SEG_MAP = {
+    r'[1-2][1-2]': 'hibernating',
+    r'[1-2][3-4]': 'at_Risk',
+    r'[1-2]5': 'cant_loose',
+    r'3[1-2]': 'about_to_sleep',
+    r'33': 'need_attention',
+    r'[3-4][4-5]': 'loyal_customers',
+    r'41': 'promising',
+    r'51': 'new_customers',
+    r'[4-5][2-3]': 'potential_loyalists',
+    r'5[4-5]': 'champions'
+}
+
+SCORES = range(1, 6)
+
+
+@dataclass
+class SegMapReport:
+    """seg_map doğrulama sonucu"""
+    overlaps: dict = field(default_factory=dict)  # RF skoru -> uyan desenlerin listesi (birden fazla)
+    gaps: list = field(default_factory=list)      # Hiçbir desene uymayan RF skorları
+
+    @property
+    def ok(self):
+        return not self.overlaps and not self.gaps
+
+
+def check_seg_map(seg_map=SEG_MAP):
+    """seg_map desenlerinin 25 RF skorunu çakışmasız ve boşluksuz kapsayıp kapsamadığını raporlar"""
+    report = SegMapReport()
+    for r in SCORES:
+        for f in SCORES:
+            rf_score = f"{r}{f}"
+            matches = [pattern for pattern in seg_map if re.fullmatch(pattern, rf_score)]
+            if not matches:
+                report.gaps.append(rf_score)
+            elif len(matches) > 1:
+                report.overlaps[rf_score] = matches
+    return report
+
+
+@lru_cache(maxsize=None)
+def _compile(items):
+    names = list(dict.fromkeys(name for _, name in items))
+    table = np.full((5, 5), -1, dtype=np.int8)
+    for r in SCORES:
+        for f in SCORES:
+            # Regex sırasındaki gibi ilk uyan desen kazanır
+            for pattern, name in items:
+                if re.fullmatch(pattern, f"{r}{f}"):
+                    table[r - 1, f - 1] = names.index(name)
+                    break
+    table.setflags(write=False)
+    return table, tuple(names)
+
+
+def compile_seg_map(seg_map=SEG_MAP, validate=False):
+    """seg_map'i (5x5 kod tablosu, segment isimleri) ikilisine derler; boşluklar -1 kodunu alır
+
+    validate=True ise çakışan veya boşluk bırakan desenlerde ValueError fırlatır.
+    """
+    if validate:
+        report = check_seg_map(seg_map)
+        if not report.ok:
+            raise ValueError(f"seg_map has overlapping patterns {report.overlaps} and gaps {report.gaps}.")
+    return _compile(tuple(seg_map.items()))
+
+
+def assign_segments(recency_score, frequency_score, seg_map=SEG_MAP):
+    """Recency ve frequency skorlarından (1-5) kategorik segment sütununu üretir
+
+    Hiçbir desene uymayan ve eksik (NaN) skorlar NaN olur.
+    """
+    table, names = compile_seg_map(seg_map)
+    recency_score = np.asarray(recency_score, dtype=np.float64)
+    frequency_score = np.asarray(frequency_score, dtype=np.float64)
+    missing = np.isnan(recency_score) | np.isnan(frequency_score)
+    if missing.any():
+        recency_score = np.where(missing, 1, recency_score)
+        frequency_score = np.where(missing, 1, frequency_score)
+    codes = table[recency_score.astype(np.int64) - 1, frequency_score.astype(np.int64) - 1]
+    if missing.any():
+        codes = np.where(missing, -1, codes)
+    return pd.Categorical.from_codes(codes, categories=names)
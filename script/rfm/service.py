@@ -0,0 +1,163 @@
+##############################################################################################################################
+# Çevrimiçi Skorlama Servisi (Online Scoring Service)
+##############################################################################################################################
+
+# Segment deposunu (rfm.store) açar ve tek müşteri sorgularını yerel bir HTTP servisiyle yanıtlar. Servis yalnızca
+# standart kütüphaneyi (asyncio) kullanır; bağlantılar keep-alive ile açık tutulur ve TCP yerine Unix soketi de
+# dinlenebilir.
+#
+# GET /customers/<master_id>                                    : Depodaki müşterinin segmenti, RF_SCORE ve RFM_SCORE
+# GET /score?recency=<gün>&frequency=<sayı>&monetary=<tutar>    : Yeni müşteriyi sabitlenmiş sınırlarla skorlar
+#                                                                 (recency yerine last_order_date=%Y-%m-%d verilebilir)
+# GET /health                                                   : Depodaki müşteri sayısı ve analiz tarihi
+#
+# Kullanım (script/ dizininden):
+#
+#   python -m rfm.service build --data ../dataset/flo_data_20k.csv --store .rfm_store
+#   python -m rfm.service serve --store .rfm_store --port 8080
+#   python -m rfm.service serve --store .rfm_store --unix /tmp/rfm.sock
+
+import argparse
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from rfm.store import SegmentStore
+
+DEFAULT_STORE = ".rfm_store"
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def handle(store, method, target):
+    """Bir isteği (durum kodu, JSON gövdesi) ikilisine çevirir"""
+    if method != "GET":
+        return 405, {"error": "only GET is supported"}
+    url = urlsplit(target)
+
+    if url.path.startswith("/customers/"):
+        customer_id = unquote(url.path[len("/customers/"):])
+        record = store.lookup(customer_id)
+        if record is None:
+            return 404, {"error": "customer not found", "customer_id": customer_id}
+        return 200, record
+
+    if url.path == "/score":
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            return 200, store.score(frequency=float(params["frequency"]),
+                                    monetary=float(params["monetary"]),
+                                    recency=float(params["recency"]) if "recency" in params else None,
+                                    last_order_date=params.get("last_order_date"),
+                                    customer_id=params.get("customer_id"))
+        except (KeyError, ValueError) as error:
+            return 400, {"error": f"invalid score request: {error}"}
+
+    if url.path == "/health":
+        return 200, {"customers": len(store), "analysis_date": store.analysis_date.date().isoformat()}
+
+    return 404, {"error": "unknown path"}
+
+
+def _response(status, body, keep_alive):
+    payload = json.dumps(body).encode()
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + payload
+
+
+async def _serve_connection(store, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                writer.write(_response(400, {"error": "malformed request line"}, keep_alive=False))
+                break
+            headers = {name.strip().lower(): value.strip()
+                       for name, _, value in (line.partition(":") for line in lines[1:] if line)}
+            try:
+                length = int(headers.get("content-length", 0))
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                writer.write(_response(400, {"error": "malformed Content-Length header"}, keep_alive=False))
+                break
+            if length:
+                await reader.readexactly(length)  # GET dışındaki istek gövdeleri okunup atılır
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            status, body = handle(store, method, target)
+            writer.write(_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(store, host="127.0.0.1", port=8080, unix=None):
+    """Servisi başlatır ve kapatılana kadar çalıştırır"""
+    async def on_connect(reader, writer):
+        await _serve_connection(store, reader, writer)
+
+    if unix:
+        server = await asyncio.start_unix_server(on_connect, path=unix)
+        address = unix
+    else:
+        server = await asyncio.start_server(on_connect, host=host, port=port)
+        address = f"http://{host}:{port}"
+    print(f"Serving {len(store)} customers on {address}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def build(data_path, store_path):
+    """Müşteri CSV dosyasından create_rfm ile segment deposunu oluşturur"""
+    from rfm.core import create_rfm
+    from rfm.ingest import load_customers
+
+    rfm = create_rfm(load_customers(data_path))
+    store = SegmentStore.from_rfm(rfm)
+    store.save(store_path)
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rfm.service", description="RFM segment lookup service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="score a customer CSV and write the segment store")
+    build_parser.add_argument("--data", required=True, help="customer CSV (flo_data_20k.csv schema)")
+    build_parser.add_argument("--store", default=DEFAULT_STORE)
+
+    serve_parser = commands.add_parser("serve", help="serve lookups from a segment store")
+    serve_parser.add_argument("--store", default=DEFAULT_STORE)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        store = build(args.data, args.store)
+        print(f"Segment store with {len(store)} customers saved to {args.store}")
+        return 0
+
+    try:
+        asyncio.run(serve(SegmentStore.open(args.store), host=args.host, port=args.port, unix=args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+##############################################################################################################################
+# Birleştirilebilir Kantil Özetleri (Mergeable Quantile Sketches)
+##############################################################################################################################
+
+# Veri parça parça (chunk) okunduğunda pd.qcut'ın ihtiyaç duyduğu kantil sınırları tüm sütun belleğe alınmadan
+# hesaplanmalıdır. Bu modül iki birleştirilebilir özet sunar:
+#
+# ValueHistogram : Ayrık değerli sütunlar (recency gün sayısı, frequency sipariş sayısı) için değer -> adet tablosu.
+#                  Bellek kullanımı farklı değer sayısıyla sınırlıdır ve sonuçlar pd.qcut ile birebir aynıdır (hata yok).
+#
+# KLLSketch      : Sürekli değerli sütunlar (monetary) için KLL kantil özeti (Karnin, Lang, Liberty, 2016).
+#                  Bellek kullanımı O(k) düzeyindedir. Hata sınırı sıralama (rank) cinsindendir: tahmin edilen her kantil
+#                  değerinin gerçek sırası ile hedef sıra arasındaki fark, n müşteri için en fazla ~ε·n olur.
+#                  k=200 için ε ≈ 0.0133 (%99 olasılıkla), hata ~1/k ile ölçeklenir (k=400 -> ~%0.67).
+#                  En küçük ve en büyük değerler kesin tutulur; bu nedenle uç sınırlar pd.qcut ile aynıdır.
+#
+# pd.qcut ile karşılaştırma: Kesin qcut'ta her iç sınır tam olarak 0.2·n, 0.4·n, ... sırasındaki değerdir.
+# KLL ile bulunan sınırlar bu sıraların ±ε·n çevresindedir; dolayısıyla her iç sınırda en fazla ~ε·n müşteri
+# komşu skora kayabilir (toplamda en fazla ~4·ε·n müşteri, k=200 için < %5.3, pratikte çok daha az).
+
+import math
+
+import numpy as np
+
+# pd.qcut(x, 5) ile kullanılan kantiller
+QUINTILES = np.linspace(0, 1, 6)
+
+
+def _lerp(low, high, frac):
+    """np.quantile ile aynı doğrusal ara değerlemeyi uygular"""
+    diff = high - low
+    return np.where(frac >= 0.5, high - diff * (1 - frac), low + diff * frac)
+
+
+class ValueHistogram:
+    """Ayrık değerler için kesin ve birleştirilebilir değer -> adet tablosu"""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.float64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def _add(self, values, counts):
+        all_values = np.concatenate([self.values, values])
+        all_counts = np.concatenate([self.counts, counts])
+        self.values, inverse = np.unique(all_values, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=all_counts, minlength=len(self.values)).astype(np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values, counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        self._add(values, counts)
+        return self
+
+    def merge(self, other):
+        self._add(other.values, other.counts)
+        return self
+
+    def value_at(self, positions):
+        """Sıralanmış veride verilen (0 tabanlı) konumlardaki değerleri döndürür"""
+        cumulative = np.cumsum(self.counts)
+        return self.values[np.searchsorted(cumulative, positions, side="right")]
+
+    def quantiles(self, qs=QUINTILES):
+        """np.quantile (linear) ile birebir aynı kantil değerlerini döndürür"""
+        qs = np.asarray(qs, dtype=np.float64)
+        positions = (self.n - 1) * qs
+        low = np.floor(positions).astype(np.int64)
+        high = np.minimum(low + 1, self.n - 1)
+        return _lerp(self.value_at(low), self.value_at(high), positions - low)
+
+    def count_less(self, values):
+        """Her değer için kendisinden kesin küçük gözlem sayısını döndürür"""
+        before = np.concatenate([[0], np.cumsum(self.counts)])
+        return before[np.searchsorted(self.values, values, side="left")]
+
+
+class KLLSketch:
+    """Sürekli değerler için birleştirilebilir KLL kantil özeti"""
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        # Üst seviyeler k kapasiteye sahiptir, alt seviyelere inildikçe kapasite 2/3 oranında küçülür
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) < self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(items)
+            even = len(items) - len(items) % 2
+            # Sıralanmış öğelerin rastgele olarak tek ya da çift konumdakileri bir üst seviyeye (2 kat ağırlıkla) taşınır
+            offset = self._rng.integers(2)
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset:even:2]])
+            self.levels[level] = items[even:]
+            # Seviye sayısı değiştiğinde kapasiteler de değişir; kontrol en alttan yeniden başlar
+            level = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+        return self
+
+    def quantiles(self, qs=QUINTILES):
+        """Yaklaşık kantil değerlerini döndürür (uç kantiller kesindir)"""
+        qs = np.asarray(qs, dtype=np.float64)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level, dtype=np.int64)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # Hedef sıra np.quantile ile aynı şekilde (n - 1) * q olarak alınır
+        positions = (self.n - 1) * qs
+        index = np.minimum(np.searchsorted(cumulative, positions, side="right"), len(items) - 1)
+        result = items[index]
+        result[qs <= 0] = self.min
+        result[qs >= 1] = self.max
+        return result
+
+
+def qcut_codes(values, edges):
+    """Değerleri pd.qcut ile aynı (sağdan kapalı) aralıklara yerleştirir ve 0 tabanlı aralık numarasını döndürür"""
+    edges = np.asarray(edges, dtype=np.float64)
+    if len(np.unique(edges)) != len(edges):
+        raise ValueError(f"Bin edges must be unique: {edges!r}.")
+    return np.searchsorted(edges[1:-1], values, side="left")
@@ -0,0 +1,117 @@
+##############################################################################################################################
+# Bellek Eşlemeli Segment Deposu (Memory-Mapped Segment Store)
+##############################################################################################################################
+
+# create_rfm çıktısı yalnızca bellekteki DataFrame ve birkaç CSV dosyası olarak kalır. Bu modül müşteri başına
+# skorları ve segmenti master_id'ye göre sıralı, sabit genişlikli dizilerle bir dizine kaydeder:
+#
+# customer_id.npy : master_id'ler (S36, sıralı)
+# scores.npy      : (n, 3) uint8 recency, frequency ve monetary skorları
+# segment.npy     : int8 segment kodu (meta.json içindeki segment_names sırası; boşluk -1)
+# meta.json       : analiz tarihi, seg_map ve sabitlenmiş kantil sınırları (QuantileBinner.to_dict)
+#
+# Dosyalar np.load(mmap_mode="r") ile belleğe eşlenerek açılır; yükleme süresi veri boyutundan bağımsızdır ve bir
+# müşteri ikili arama (np.searchsorted, O(log n)) ile birkaç mikrosaniyede bulunur. Depoda olmayan bir müşteri,
+# sabitlenmiş sınırlarla yeniden kantil hesaplamadan skorlanabilir.
+
+import datetime as dt
+import json
+import math
+import os
+
+import numpy as np
+
+from rfm.binning import QuantileBinner
+from rfm.core import ANALYSIS_DATE
+from rfm.segments import SEG_MAP, compile_seg_map
+
+STORE_ARRAYS = ["customer_id", "scores", "segment"]
+
+
+class SegmentStore:
+    """master_id -> skorlar ve segment araması"""
+
+    def __init__(self, customer_id, scores, segment, analysis_date, seg_map, binners):
+        self.customer_id = customer_id
+        self.scores = scores
+        self.segment = segment
+        self.analysis_date = analysis_date
+        self.seg_map = seg_map
+        self.binners = binners  # "recency", "frequency", "monetary" -> QuantileBinner
+        self.table, self.segment_names = compile_seg_map(seg_map)
+
+    def __len__(self):
+        return len(self.customer_id)
+
+    @classmethod
+    def from_rfm(cls, rfm, analysis_date=ANALYSIS_DATE, seg_map=SEG_MAP):
+        """create_rfm çıktısından depo oluşturur; kantil sınırları create_rfm ile aynı politikalarla bulunur"""
+        binners = {"recency": QuantileBinner(q=5),
+                   "frequency": QuantileBinner(q=5, ties="first"),
+                   "monetary": QuantileBinner(q=5)}
+        codes = {name: binner.fit_transform(rfm[name]) for name, binner in binners.items()}
+        scores = np.column_stack([5 - codes["recency"], codes["frequency"] + 1, codes["monetary"] + 1]).astype(np.uint8)
+
+        customer_id = rfm["customer_id"].to_numpy().astype("S36")
+        order = np.argsort(customer_id, kind="stable")
+        table, _ = compile_seg_map(seg_map)
+        segment = table[scores[:, 0].astype(np.int64) - 1, scores[:, 1].astype(np.int64) - 1]
+        return cls(customer_id[order], scores[order], segment[order], analysis_date, dict(seg_map), binners)
+
+    def save(self, path):
+        """Depoyu bir dizine .npy dosyaları ve meta.json olarak kaydeder"""
+        os.makedirs(path, exist_ok=True)
+        for name in STORE_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        meta = {"analysis_date": self.analysis_date.isoformat(),
+                "seg_map": self.seg_map,
+                "segment_names": list(self.segment_names),
+                "binners": {name: binner.to_dict() for name, binner in self.binners.items()}}
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump(meta, file, indent=2)
+
+    @classmethod
+    def open(cls, path):
+        """save ile kaydedilmiş depoyu belleğe eşleyerek açar"""
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in STORE_ARRAYS}
+        binners = {name: QuantileBinner.from_dict(state) for name, state in meta["binners"].items()}
+        return cls(analysis_date=dt.datetime.fromisoformat(meta["analysis_date"]), seg_map=meta["seg_map"],
+                   binners=binners, **arrays)
+
+    def _record(self, customer_id, recency_score, frequency_score, monetary_score, code):
+        rf_score = f"{recency_score}{frequency_score}"
+        return {"customer_id": customer_id,
+                "segment": self.segment_names[code] if code >= 0 else None,
+                "RF_SCORE": rf_score,
+                "RFM_SCORE": f"{rf_score}{monetary_score}"}
+
+    def lookup(self, customer_id):
+        """Müşterinin segmentini ve skorlarını döndürür; depoda yoksa None"""
+        key = customer_id.encode() if isinstance(customer_id, str) else customer_id
+        position = int(np.searchsorted(self.customer_id, key))
+        if position == len(self.customer_id) or self.customer_id[position] != key:
+            return None
+        recency_score, frequency_score, monetary_score = self.scores[position].tolist()
+        return self._record(key.decode(), recency_score, frequency_score, monetary_score, int(self.segment[position]))
+
+    def score(self, frequency, monetary, recency=None, last_order_date=None, customer_id=None):
+        """Depoda olmayan bir müşteriyi sabitlenmiş kantil sınırlarıyla skorlar
+
+        recency (gün) yerine last_order_date verilirse recency deponun analiz tarihine göre hesaplanır. Frequency
+        sınırına eşit değerler mevcut müşterilerden sonra sıralanmış sayılır (üst aralık). Sonlu olmayan (NaN, inf)
+        değerler ValueError fırlatır.
+        """
+        if recency is None:
+            if last_order_date is None:
+                raise ValueError("Either recency or last_order_date is required.")
+            recency = (self.analysis_date - dt.datetime.fromisoformat(str(last_order_date))).days
+        for name, value in (("recency", recency), ("frequency", frequency), ("monetary", monetary)):
+            if not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite number, got {value!r}.")
+        recency_score = 5 - int(self.binners["recency"].transform([recency])[0])
+        frequency_score = int(self.binners["frequency"].transform([frequency])[0]) + 1
+        monetary_score = int(self.binners["monetary"].transform([monetary])[0]) + 1
+        code = int(self.table[recency_score - 1, frequency_score - 1])
+        return self._record(customer_id, recency_score, frequency_score, monetary_score, code)
@@ -0,0 +1,111 @@
+##############################################################################################################################
+# Parça Parça (Streaming) RFM Hesaplama
+##############################################################################################################################
+
+# create_rfm tüm müşteri tablosunun tek bir DataFrame olarak belleğe sığmasını gerektirir. Bu modül aynı çıktıyı
+# (RF_SCORE, RFM_SCORE, segment) CSV dosyasını parça parça okuyarak ve sınırlı bellekle üretir:
+#
+# 1. geçiş: Her parça için recency/frequency/monetary hesaplanır ve birleştirilebilir kantil özetleri güncellenir.
+# 2. geçiş: Özetlerden bulunan kantil sınırlarıyla her parça skorlanır, segmentlenir ve diske yazılır.
+#
+# Recency ve frequency skorları create_rfm ile birebir aynıdır. Frequency için rank(method="first") sıralaması,
+# değer tablosundaki "kendisinden küçük" sayısı ile dosya sırasında aynı değeri daha önce görülen müşteri sayısı
+# toplanarak kesin olarak yeniden üretilir. Monetary sınırları KLL özetinden gelir; hata sınırları için sketch.py'ye bakın.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from rfm.core import ANALYSIS_DATE, RFM_COLUMNS
+from rfm.segments import assign_segments
+from rfm.sketch import QUINTILES, KLLSketch, ValueHistogram, qcut_codes
+
+# RFM hesaplaması için gereken sütunlar (flo_data_20k.csv şeması)
+RFM_SOURCE_COLUMNS = ["master_id", "last_order_date",
+                      "order_num_total_ever_online", "order_num_total_ever_offline",
+                      "customer_value_total_ever_offline", "customer_value_total_ever_online"]
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+@dataclass
+class CutPoints:
+    """Tüm veri üzerinden hesaplanan kantil sınırları"""
+    recency_edges: np.ndarray
+    monetary_edges: np.ndarray
+    frequency_histogram: ValueHistogram
+    n: int
+
+    @property
+    def frequency_rank_edges(self):
+        # qcut(rank(method="first"), 5): 1..n sıralarının kantilleri
+        return 1 + QUINTILES * (self.n - 1)
+
+
+def _rfm_metrics(chunk, analysis_date):
+    """Bir parça için recency, frequency ve monetary değerlerini hesaplar"""
+    rfm = pd.DataFrame()
+    rfm["customer_id"] = chunk["master_id"]
+    rfm["recency"] = (analysis_date - pd.to_datetime(chunk["last_order_date"])).dt.days
+    rfm["frequency"] = chunk["order_num_total_ever_online"] + chunk["order_num_total_ever_offline"]
+    rfm["monetary"] = chunk["customer_value_total_ever_offline"] + chunk["customer_value_total_ever_online"]
+    return rfm
+
+
+def _read_chunks(path, chunksize):
+    return pd.read_csv(path, usecols=RFM_SOURCE_COLUMNS, chunksize=chunksize)
+
+
+def fit_cut_points(path, analysis_date=ANALYSIS_DATE, chunksize=DEFAULT_CHUNKSIZE, k=200, seed=None):
+    """1. geçiş: Dosyayı parça parça okuyarak kantil sınırlarını hesaplar"""
+    recency, frequency, monetary = ValueHistogram(), ValueHistogram(), KLLSketch(k=k, seed=seed)
+    for chunk in _read_chunks(path, chunksize):
+        rfm = _rfm_metrics(chunk, analysis_date)
+        recency.update(rfm["recency"])
+        frequency.update(rfm["frequency"])
+        monetary.update(rfm["monetary"])
+    return CutPoints(recency_edges=recency.quantiles(),
+                     monetary_edges=monetary.quantiles(),
+                     frequency_histogram=frequency,
+                     n=frequency.n)
+
+
+def iter_rfm_chunks(path, cut_points, analysis_date=ANALYSIS_DATE, chunksize=DEFAULT_CHUNKSIZE):
+    """2. geçiş: Her parçayı verilen sınırlarla skorlar ve create_rfm ile aynı sütunlarla döndürür"""
+    histogram = cut_points.frequency_histogram
+    seen = np.zeros(len(histogram.values), dtype=np.int64)  # Değer başına şimdiye kadar görülen müşteri sayısı
+    for chunk in _read_chunks(path, chunksize):
+        rfm = _rfm_metrics(chunk, analysis_date)
+
+        # Frequency için rank(method="first"): küçük değerler + önceki parçalarda ve bu parçada önce gelen eşit değerler
+        position = np.searchsorted(histogram.values, rfm["frequency"])
+        rank = (histogram.count_less(rfm["frequency"]) + seen[position] +
+                rfm.groupby(position).cumcount().to_numpy() + 1)
+        seen += np.bincount(position, minlength=len(seen))
+
+        recency_score = 5 - qcut_codes(rfm["recency"], cut_points.recency_edges)
+        frequency_score = 1 + qcut_codes(rank, cut_points.frequency_rank_edges)
+        monetary_score = 1 + qcut_codes(rfm["monetary"], cut_points.monetary_edges)
+
+        scores = pd.DataFrame({"recency": recency_score, "frequency": frequency_score, "monetary": monetary_score},
+                              index=rfm.index).astype(str)
+        rfm["RF_SCORE"] = scores["recency"] + scores["frequency"]
+        rfm["RFM_SCORE"] = rfm["RF_SCORE"] + scores["monetary"]
+        rfm["segment"] = assign_segments(recency_score, frequency_score)
+        yield rfm[RFM_COLUMNS]
+
+
+def create_rfm_streaming(path, output_path=None, analysis_date=ANALYSIS_DATE, chunksize=DEFAULT_CHUNKSIZE, k=200, seed=None):
+    """RFM segmentasyonunu sınırlı bellekle, dosyayı parça parça okuyarak oluşturur
+
+    output_path verilirse sonuçlar parça parça CSV dosyasına yazılır ve None döner.
+    Verilmezse tüm parçalar birleştirilerek döndürülür (yalnızca belleğe sığan veriler için).
+    """
+    cut_points = fit_cut_points(path, analysis_date=analysis_date, chunksize=chunksize, k=k, seed=seed)
+    chunks = iter_rfm_chunks(path, cut_points, analysis_date=analysis_date, chunksize=chunksize)
+    if output_path is None:
+        return pd.concat(chunks, ignore_index=True)
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return None
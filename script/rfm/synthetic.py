@@ -0,0 +1,95 @@
+##############################################################################################################################
+# Sentetik Müşteri Verisi Üretimi
+##############################################################################################################################
+
+# flo_data_20k.csv ile aynı 12 sütunlu şemada, istenen büyüklükte sentetik müşteri verisi üretir. Dağılımlar gerçek
+# veri setinden yaklaşık olarak alınmıştır:
+#
+# - Kanal oranları (Android App %48, Mobile %24, Ios App %14, Desktop %14) ve kanala göre "Offline" son sipariş oranı
+# - Son alışveriş tarihi 2020-05-30 ile 2021-05-30 arasında, yakın tarihlere yoğunlaşan bir dağılımla
+# - İlk alışveriş tarihi log-normal müşteri ömrüyle, en erken 2013-01-14
+# - Online (ortalama 3.1) ve offline (ortalama 1.9) sipariş sayıları geometrik, sipariş başına tutar gamma dağılımlı
+# - Kategori listeleri her kategori için gerçek ilgi oranlarıyla (ör. AKTIFSPOR %46, KADIN %38)
+#
+# Büyük veri setleri (ör. 50M satır) sınırlı bellekle, parça parça üretilip yazılır.
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["master_id", "order_channel", "last_order_channel", "first_order_date", "last_order_date",
+           "last_order_date_online", "last_order_date_offline", "order_num_total_ever_online",
+           "order_num_total_ever_offline", "customer_value_total_ever_offline", "customer_value_total_ever_online",
+           "interested_in_categories_12"]
+
+CHANNELS = np.array(["Android App", "Mobile", "Ios App", "Desktop"])
+CHANNEL_PROBS = [0.476, 0.245, 0.142, 0.137]
+OFFLINE_PROBS = np.array([0.25, 0.38, 0.30, 0.56])  # Kanala göre son siparişin offline olma olasılığı
+
+# Kategoriler gerçek verideki yazım sırasıyla
+CATEGORIES = ["AKTIFCOCUK", "ERKEK", "COCUK", "KADIN", "AKTIFSPOR"]
+CATEGORY_PROBS = np.array([0.172, 0.333, 0.208, 0.381, 0.461])
+# 5 bitlik maskeden "[ERKEK, KADIN]" biçimindeki metne
+CATEGORY_LISTS = np.array(["[" + ", ".join(name for i, name in enumerate(CATEGORIES) if mask >> i & 1) + "]"
+                           for mask in range(1 << len(CATEGORIES))], dtype=object)
+
+FIRST_DATE = np.datetime64("2013-01-14")
+LAST_DATE = np.datetime64("2021-05-30")
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def _uuids(rng, n):
+    """Rastgele UUID metinleri üretir (bayt -> onaltılık dönüşümü vektörel yapılır)"""
+    nibbles = rng.integers(0, 16, size=(n, 32), dtype=np.uint8)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    chars[:, [i for i in range(36) if i not in (8, 13, 18, 23)]] = _HEX[nibbles]
+    return chars.view("S36").ravel().astype(str)
+
+
+def generate_customers(n, seed=0):
+    """flo_data_20k.csv şemasında n satırlık sentetik müşteri DataFrame'i üretir"""
+    rng = np.random.default_rng(seed)
+
+    channel = rng.choice(len(CHANNELS), size=n, p=CHANNEL_PROBS)
+    offline_last = rng.random(n) < OFFLINE_PROBS[channel]
+
+    # Tarihler (gün)
+    days_back = np.minimum(rng.exponential(120, n), 365).astype(np.int64)
+    last_order = LAST_DATE - days_back
+    tenure = np.minimum(rng.lognormal(6.3, 0.7, n).astype(np.int64), (last_order - FIRST_DATE).astype(np.int64))
+    first_order = last_order - tenure
+    other_last = last_order - (rng.random(n) * (tenure + 1)).astype(np.int64)
+    last_online = np.where(offline_last, other_last, last_order)
+    last_offline = np.where(offline_last, last_order, other_last)
+
+    # Sipariş sayıları ve tutarlar
+    orders_online = rng.geometric(1 / 3.1, n).astype(np.float64)
+    orders_offline = rng.geometric(1 / 1.9, n).astype(np.float64)
+    value_online = (orders_online * rng.gamma(2.5, 166 / 2.5, n)).round(2)
+    value_offline = (orders_offline * rng.gamma(2.5, 133 / 2.5, n)).round(2)
+
+    # Kategori listeleri
+    masks = ((rng.random((n, len(CATEGORIES))) < CATEGORY_PROBS) << np.arange(len(CATEGORIES))).sum(axis=1)
+
+    return pd.DataFrame({
+        "master_id": _uuids(rng, n),
+        "order_channel": CHANNELS[channel],
+        "last_order_channel": np.where(offline_last, "Offline", CHANNELS[channel]),
+        "first_order_date": np.datetime_as_string(first_order, unit="D"),
+        "last_order_date": np.datetime_as_string(last_order, unit="D"),
+        "last_order_date_online": np.datetime_as_string(last_online, unit="D"),
+        "last_order_date_offline": np.datetime_as_string(last_offline, unit="D"),
+        "order_num_total_ever_online": orders_online,
+        "order_num_total_ever_offline": orders_offline,
+        "customer_value_total_ever_offline": value_offline,
+        "customer_value_total_ever_online": value_online,
+        "interested_in_categories_12": CATEGORY_LISTS[masks],
+    }, columns=COLUMNS)
+
+
+def write_synthetic_csv(path, n, seed=0, chunksize=1_000_000):
+    """n satırlık sentetik veriyi parça parça üreterek CSV dosyasına yazar"""
+    for i, start in enumerate(range(0, n, chunksize)):
+        chunk = generate_customers(min(chunksize, n - start), seed=[seed, i])
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
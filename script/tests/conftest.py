@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPT_DIR)
+
+DATA_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), "dataset", "flo_data_20k.csv")
+
+# Orijinal analiz betiğindeki create_rfm ile aynı segment tanımları (regex)
+BASELINE_SEG_MAP = {
+    r"[1-2][1-2]": "hibernating",
+    r"[1-2][3-4]": "at_Risk",
+    r"[1-2]5": "cant_loose",
+    r"3[1-2]": "about_to_sleep",
+    r"33": "need_attention",
+    r"[3-4][4-5]": "loyal_customers",
+    r"41": "promising",
+    r"51": "new_customers",
+    r"[4-5][2-3]": "potential_loyalists",
+    r"5[4-5]": "champions",
+}
+
+
+def baseline_create_rfm(dataframe, analysis_date=pd.Timestamp(2021, 6, 1)):
+    """Orijinal betikteki create_rfm: pd.qcut, rank(method="first") ve regex ile segment ataması"""
+    dataframe = dataframe.copy()
+    dataframe["order_num_total"] = dataframe["order_num_total_ever_online"] + dataframe["order_num_total_ever_offline"]
+    dataframe["customer_value_total"] = (dataframe["customer_value_total_ever_offline"] +
+                                         dataframe["customer_value_total_ever_online"])
+    date_columns = dataframe.columns[dataframe.columns.str.contains("date")]
+    dataframe[date_columns] = dataframe[date_columns].apply(pd.to_datetime)
+
+    rfm = pd.DataFrame()
+    rfm["customer_id"] = dataframe["master_id"]
+    rfm["recency"] = (analysis_date - dataframe["last_order_date"]).dt.days
+    rfm["frequency"] = dataframe["order_num_total"]
+    rfm["monetary"] = dataframe["customer_value_total"]
+    rfm["recency_score"] = pd.qcut(rfm["recency"], 5, labels=[5, 4, 3, 2, 1])
+    rfm["frequency_score"] = pd.qcut(rfm["frequency"].rank(method="first"), 5, labels=[1, 2, 3, 4, 5])
+    rfm["monetary_score"] = pd.qcut(rfm["monetary"], 5, labels=[1, 2, 3, 4, 5])
+    rfm["RF_SCORE"] = rfm["recency_score"].astype(str) + rfm["frequency_score"].astype(str)
+    rfm["RFM_SCORE"] = rfm["RF_SCORE"] + rfm["monetary_score"].astype(str)
+    rfm["segment"] = rfm["RF_SCORE"].replace(BASELINE_SEG_MAP, regex=True)
+    return rfm[["customer_id", "recency", "frequency", "monetary", "RF_SCORE", "RFM_SCORE", "segment"]]
+
+
+def assert_same_rfm(result, expected, columns=("customer_id", "recency", "frequency", "monetary", "RF_SCORE",
+                                                  "RFM_SCORE", "segment")):
+    """İki RFM tablosunu sütun sütun, değer olarak karşılaştırır (kategorik / metin tip farkları yok sayılır)"""
+    assert len(result) == len(expected)
+    for column in columns:
+        left = result[column].reset_index(drop=True)
+        right = expected[column].reset_index(drop=True)
+        if column in ("frequency", "monetary"):
+            pd.testing.assert_series_equal(left.astype("float64"), right.astype("float64"), check_names=False,
+                                           rtol=0, atol=1e-9)
+        else:
+            assert (left.astype(str).to_numpy() == right.astype(str).to_numpy()).all(), column
+
+
+@pytest.fixture(scope="session")
+def raw():
+    return pd.read_csv(DATA_PATH)
+
+
+@pytest.fixture(scope="session")
+def baseline(raw):
+    return baseline_create_rfm(raw)
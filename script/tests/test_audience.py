@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from rfm import AudienceIndex, create_rfm
+
+QUERIES = [
+    {"segments": ["champions", "loyal_customers"], "categories_any": ["KADIN"]},
+    {"segments": ["cant_loose", "about_to_sleep", "new_customers"], "categories_any": ["ERKEK", "COCUK"]},
+    {"segments": ["at_Risk"], "categories_all": ["KADIN", "AKTIFSPOR"]},
+    {"categories_any": ["SPOR"]},
+    {"categories_any": ["SPOR"], "exact": True},
+    {"segments": ["hibernating"], "channels": ["Mobile"], "last_channels": ["Offline"]},
+    {"segments": []},
+    {},
+]
+
+
+def _expected(df, rfm, segments=None, categories_any=None, categories_all=None, exact=False, channels=None,
+              last_channels=None):
+    """Orijinal betikteki str.contains + isin filtrelerinin genelleştirilmiş hali"""
+    keep = pd.Series(True, index=df.index)
+    if segments == []:
+        return df["master_id"].to_numpy()[:0]
+    if segments is not None:
+        keep &= df["master_id"].isin(rfm.loc[rfm["segment"].isin(segments), "customer_id"])
+    if exact:
+        lists = df["interested_in_categories_12"].str.strip("[]").str.split(", ")
+        has = {name: lists.apply(lambda names, name=name: name in names) for name in categories_any or categories_all}
+    else:
+        has = {name: df["interested_in_categories_12"].str.contains(name, regex=False)
+               for name in categories_any or categories_all or []}
+    if categories_any:
+        keep &= pd.concat([has[name] for name in categories_any], axis=1).any(axis=1)
+    if categories_all:
+        keep &= pd.concat([has[name] for name in categories_all], axis=1).all(axis=1)
+    if channels is not None:
+        keep &= df["order_channel"].isin(channels)
+    if last_channels is not None:
+        keep &= df["last_order_channel"].isin(last_channels)
+    return df.loc[keep, "master_id"].to_numpy()
+
+
+@pytest.fixture(scope="module")
+def frames(raw):
+    return raw, create_rfm(raw.copy())
+
+
+@pytest.fixture(scope="module")
+def index(frames):
+    return AudienceIndex.from_frames(*frames)
+
+
+def test_original_campaigns(frames, index):
+    df, rfm = frames
+    women = df[df["master_id"].isin(rfm[rfm["segment"].isin(["champions", "loyal_customers"])]["customer_id"]) &
+               df["interested_in_categories_12"].str.contains("KADIN")]["master_id"]
+    assert list(index.select(segments=["champions", "loyal_customers"], categories_any=["KADIN"])) == list(women)
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=range(len(QUERIES)))
+def test_select_matches_pandas_filters(frames, index, query):
+    assert list(index.select(**query)) == list(_expected(*frames, **query))
+
+
+def test_select_many_matches_select(index):
+    for query, result in zip(QUERIES, index.select_many(QUERIES), strict=True):
+        assert list(result) == list(index.select(**query))
+
+
+@pytest.mark.parametrize("query", [{"segments": "champions"}, {"categories_any": "KADIN"},
+                                   {"categories_all": "KADIN"}, {"channels": "Mobile"}, {"last_channels": 1}])
+def test_name_fields_must_be_lists(index, query):
+    with pytest.raises(TypeError):
+        index.select(**query)
+    with pytest.raises(TypeError):
+        index.select_many([query])
+
+
+def test_unknown_names_are_rejected(index):
+    with pytest.raises(KeyError):
+        index.select(segments=["champion"])
+    with pytest.raises(KeyError):
+        index.select_many([{"channels": ["Fax"]}])
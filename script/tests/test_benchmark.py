@@ -0,0 +1,36 @@
+import json
+
+from rfm import benchmark
+from rfm.benchmark import compare, run_benchmark
+
+
+def test_in_memory_stages_report_rss(tmp_path):
+    results = run_benchmark([2000], data_dir=str(tmp_path), repeat=1, memory=False)
+    stages = {result["stage"]: result for result in results}
+    assert {"load_cold", "load_warm", "segment", "campaign_new_brand", "campaign_discount"} <= set(stages)
+    assert {result["mode"] for result in results} == {"in_memory"}
+    # Arrow önbelleğinden okuma tracemalloc'ta görünmez; en yüksek RSS ise tabloyu içerir
+    assert stages["load_warm"]["peak_mb"] > 0
+    assert stages["load_warm"]["rss_delta_mb"] is not None
+
+
+def test_parallel_sweep(tmp_path):
+    results = run_benchmark([2000], data_dir=str(tmp_path), repeat=1, memory=False, parallel=[1, 2])
+    sweep = {result["stage"]: result for result in results if result["mode"] == "parallel"}
+    assert list(sweep) == ["parallel_jobs_1", "parallel_jobs_2"]
+    assert sweep["parallel_jobs_1"]["speedup"] == 1
+    assert sweep["parallel_jobs_2"]["speedup"] > 0
+
+
+def test_compare_does_not_match_different_modes(tmp_path, monkeypatch):
+    in_memory = run_benchmark([2000], data_dir=str(tmp_path), repeat=1, memory=False)
+    monkeypatch.setattr(benchmark, "IN_MEMORY_MAX_ROWS", 1000)
+    streaming = run_benchmark([2000], data_dir=str(tmp_path), repeat=1, memory=False)
+    assert [(result["mode"], result["stage"]) for result in streaming] == [("streaming", "create_rfm_streaming")]
+
+    for name, results in [("base.json", in_memory), ("new.json", streaming)]:
+        with open(tmp_path / name, "w") as file:
+            json.dump({"meta": {}, "results": results}, file)
+    table = compare(str(tmp_path / "base.json"), str(tmp_path / "new.json"))
+    assert (table["only_in"] != "").all()
+    assert not table["regression"].any()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH
+from rfm import QuantileBinner, create_rfm, exact_quantiles, quintile_score
+
+TIE_HEAVY = {
+    "small_integers": lambda rng, n: rng.integers(0, 8, n).astype(float),
+    "geometric": lambda rng, n: rng.geometric(0.4, n).astype(float),
+    "rounded_gamma": lambda rng, n: rng.gamma(2.0, 200.0, n).round(-1),
+    "continuous": lambda rng, n: rng.normal(size=n),
+    "with_nan": lambda rng, n: np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 30, n).astype(float)),
+}
+
+
+@pytest.fixture(params=[(name, seed) for name in TIE_HEAVY for seed in range(3)], ids=lambda p: f"{p[0]}-{p[1]}")
+def values(request):
+    name, seed = request.param
+    rng = np.random.default_rng(seed)
+    return TIE_HEAVY[name](rng, int(rng.integers(5, 5000)))
+
+
+def _codes(result):
+    """pd.qcut(labels=False) çıktısını (NaN -> -1) tamsayı kodlara çevirir"""
+    return np.nan_to_num(np.asarray(result, dtype=np.float64), nan=-1).astype(np.int64)
+
+
+def test_exact_quantiles_matches_nanquantile(values):
+    qs = np.linspace(0, 1, 6)
+    np.testing.assert_array_equal(exact_quantiles(values, qs), np.nanquantile(values, qs))
+
+
+def test_binner_raise_matches_qcut(values):
+    try:
+        expected = pd.qcut(values, 5, labels=False)
+    except ValueError:
+        with pytest.raises(ValueError):
+            QuantileBinner(ties="raise").fit_transform(values)
+        return
+    np.testing.assert_array_equal(QuantileBinner(ties="raise").fit_transform(values), _codes(expected))
+
+
+def test_binner_drop_matches_qcut(values):
+    expected = pd.qcut(values, 5, labels=False, duplicates="drop")
+    binner = QuantileBinner(ties="drop")
+    np.testing.assert_array_equal(binner.fit_transform(values), _codes(expected))
+    np.testing.assert_array_equal(binner.transform(values), _codes(expected))
+
+
+def test_binner_first_matches_qcut_rank(values):
+    expected = _codes(pd.qcut(pd.Series(values).rank(method="first"), 5, labels=False))
+    binner = QuantileBinner(ties="first")
+    np.testing.assert_array_equal(binner.fit_transform(values), expected)
+    # Saklanan sınırlar satır konumlarıyla aynı bölünmeyi yeniden üretir
+    restored = QuantileBinner.from_dict(binner.to_dict())
+    np.testing.assert_array_equal(restored.transform(values, rows=np.arange(len(values))), expected)
+
+
+def test_binner_spread_keeps_bin_sizes(values):
+    codes = QuantileBinner(ties="spread", seed=0).fit_transform(values)
+    expected = _codes(pd.qcut(pd.Series(values).rank(method="first"), 5, labels=False))
+    np.testing.assert_array_equal(np.bincount(codes + 1, minlength=6), np.bincount(expected + 1, minlength=6))
+    np.testing.assert_array_equal(codes, QuantileBinner(ties="spread", seed=0).fit_transform(values))
+
+
+def test_nan_does_not_shift_edges():
+    values = np.array([1, 2, 3, np.nan, 5, 6, 7, 8, 9, 10])
+    expected = [0, 0, 1, -1, 1, 2, 3, 3, 4, 4]
+    for ties in ("raise", "drop", "first", "spread"):
+        assert QuantileBinner(ties=ties, seed=0).fit_transform(values).tolist() == expected
+    score = quintile_score(values, [1, 2, 3, 4, 5])
+    assert score.isna().tolist() == [value != value for value in values]
+    with pytest.raises(ValueError):
+        QuantileBinner().fit_transform([np.nan, np.nan])
+
+
+def test_create_rfm_scores_missing_values_as_nan():
+    dataframe = pd.read_csv(DATA_PATH, nrows=500)
+    dataframe.loc[[3, 50], "customer_value_total_ever_online"] = np.nan
+    dataframe.loc[[7], "order_num_total_ever_online"] = np.nan
+    rfm = create_rfm(dataframe.copy())
+
+    monetary = dataframe["customer_value_total_ever_offline"] + dataframe["customer_value_total_ever_online"]
+    frequency = dataframe["order_num_total_ever_online"] + dataframe["order_num_total_ever_offline"]
+    expected_monetary = _codes(pd.qcut(monetary, 5, labels=False)) + 1
+    expected_frequency = _codes(pd.qcut(frequency.rank(method="first"), 5, labels=False)) + 1
+    scores = rfm["RFM_SCORE"].dropna()
+    np.testing.assert_array_equal(scores.str[2].astype(int), expected_monetary[scores.index])
+    np.testing.assert_array_equal(scores.str[1].astype(int), expected_frequency[scores.index])
+    assert rfm["RFM_SCORE"].isna().sum() == 3
+    assert rfm["segment"].isna().tolist() == (frequency.isna()).tolist()
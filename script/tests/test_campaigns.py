@@ -0,0 +1,63 @@
+import gzip
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import SCRIPT_DIR
+from rfm import AudienceIndex, create_rfm, export_campaigns, load_campaigns, parse_campaigns
+
+
+@pytest.fixture(scope="module")
+def frames(raw):
+    return raw, create_rfm(raw.copy())
+
+
+@pytest.mark.parametrize("spec", [
+    {"audiences": [{"name": "a", "segment": ["champions"]}]},
+    {"audiences": [{"name": "a"}, {"name": "a"}]},
+    {"format": "xlsx", "audiences": [{"name": "a"}]},
+    {"audiences": [{"name": "a", "format": "json"}]},
+    {"audiences": [{"name": "a", "segments": "champions"}]},
+    {"audiences": [{"name": "a", "categories_any": "KADIN"}]},
+    {"audiences": [{"name": "a", "last_channels": ["Mobile", 1]}]},
+])
+def test_parse_campaigns_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_campaigns(spec)
+
+
+def test_export_matches_original_to_csv(frames, tmp_path):
+    df, rfm = frames
+    spec = load_campaigns(os.path.join(SCRIPT_DIR, "campaigns.json"))
+    spec.output_dir = str(tmp_path)
+    report = export_campaigns(spec, AudienceIndex.from_frames(df, rfm), max_workers=2)
+
+    # Orijinal betikteki seçimler ve to_csv çıktıları
+    women = df[df["master_id"].isin(rfm[rfm["segment"].isin(["champions", "loyal_customers"])]["customer_id"]) &
+               df["interested_in_categories_12"].str.contains("KADIN")]["master_id"]
+    discount = df[df["master_id"].isin(rfm[rfm["segment"].isin(["cant_loose", "hibernating", "new_customers"])]
+                                       ["customer_id"]) &
+                  (df["interested_in_categories_12"].str.contains("ERKEK") |
+                   df["interested_in_categories_12"].str.contains("COCUK"))]["master_id"]
+    for name, expected in [("yeni_marka_hedef_müşteri_id", women), ("indirim_hedef_müşteri_ids", discount)]:
+        expected.to_csv(tmp_path / "expected.csv", index=False)
+        assert (tmp_path / f"{name}.csv").read_bytes() == (tmp_path / "expected.csv").read_bytes()
+    assert report["customers"].tolist() == [len(women), len(discount)]
+
+
+def test_export_formats(frames, tmp_path):
+    df, rfm = frames
+    spec = parse_campaigns({"output_dir": str(tmp_path), "audiences": [
+        {"name": "plain", "segments": ["champions"]},
+        {"name": "gzip", "segments": ["champions"], "format": "csv.gz"},
+        {"name": "parquet", "segments": ["champions"], "format": "parquet"},
+        {"name": "empty", "segments": []},
+    ]})
+    export_campaigns(spec, AudienceIndex.from_frames(df, rfm))
+    plain = (tmp_path / "plain.csv").read_bytes()
+    with gzip.open(tmp_path / "gzip.csv.gz", "rb") as file:
+        assert file.read() == plain
+    expected = rfm.loc[rfm["segment"] == "champions", "customer_id"].tolist()
+    assert pd.read_parquet(tmp_path / "parquet.parquet")["master_id"].tolist() == expected
+    assert (tmp_path / "empty.csv").read_text() == "master_id\n"
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH, SCRIPT_DIR, assert_same_rfm
+from rfm.cli import main
+
+
+def test_score_writes_create_rfm_output(baseline, tmp_path):
+    output = tmp_path / "rfm.csv"
+    assert main(["score", "--data", DATA_PATH, "--no-cache", "--output", str(output)]) == 0
+    assert_same_rfm(pd.read_csv(output, dtype={"RF_SCORE": str, "RFM_SCORE": str}), baseline)
+
+
+def test_score_to_stdout_with_analysis_date(capsys):
+    assert main(["score", "--data", DATA_PATH, "--no-cache", "--analysis-date", "2021-07-01"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "customer_id,recency,frequency,monetary,RF_SCORE,RFM_SCORE,segment"
+    assert lines[1].split(",")[1] == "125"  # 2021-06-01 ile 95 gün, 30 gün sonra 125
+    assert len(lines) == 19946
+
+
+def test_stats_and_export(tmp_path, capsys):
+    assert main(["stats", "--data", DATA_PATH, "--no-cache", "--top", "3"]) == 0
+    assert "Segment statistics:" in capsys.readouterr().out
+    spec = f"{SCRIPT_DIR}/campaigns.json"
+    assert main(["export", spec, "--data", DATA_PATH, "--no-cache", "--output-dir", str(tmp_path)]) == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["indirim_hedef_müşteri_ids.csv",
+                                                               "yeni_marka_hedef_müşteri_id.csv"]
+
+
+def test_argument_errors(tmp_path):
+    with pytest.raises(SystemExit) as error:
+        main(["score", "--data", str(tmp_path / "missing.csv")])
+    assert error.value.code == 2
+    with pytest.raises(SystemExit):
+        main(["score", "--data", DATA_PATH, "--analysis-date", "01.06.2021"])
+
+
+def test_help_does_not_import_pandas():
+    code = "import sys; from rfm.cli import main\ntry:\n    main(['--help'])\nexcept SystemExit:\n    pass\n" \
+           "print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == "False"
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import assert_same_rfm
+from rfm import CompactRFM, create_rfm, decode_uuids, encode_uuids, memory_report
+
+
+@pytest.fixture(scope="module")
+def rfm(raw):
+    return create_rfm(raw.copy())
+
+
+def test_round_trip_matches_create_rfm(rfm):
+    restored = CompactRFM.from_frame(rfm).to_frame()
+    pd.testing.assert_frame_equal(restored, rfm, check_dtype=False, check_categorical=False)
+    assert list(restored["segment"].cat.categories) == list(rfm["segment"].cat.categories)
+
+
+def test_from_customers_matches_create_rfm(raw, rfm):
+    assert_same_rfm(CompactRFM.from_customers(raw.copy()).to_frame(), rfm)
+
+
+def test_to_csv_matches_frame(rfm, tmp_path):
+    compact = CompactRFM.from_frame(rfm)
+    path = tmp_path / "rfm.csv"
+    compact.to_csv(str(path), chunksize=7000)
+    expected = tmp_path / "expected.csv"
+    rfm.to_csv(expected, index=False)
+    assert path.read_bytes() == expected.read_bytes()
+
+
+def test_compact_is_smaller(rfm):
+    report = memory_report(rfm, CompactRFM.from_frame(rfm))
+    assert report.loc["total", "ratio"] > 2
+
+
+def test_uuid_round_trip(rfm):
+    ids = rfm["customer_id"].to_numpy()
+    np.testing.assert_array_equal(decode_uuids(*encode_uuids(ids)), ids.astype(str))
+
+
+@pytest.mark.parametrize("bad", ["cc294636-19f0-11eb-8d74-000d3a38a36f-dup",
+                                 "cc294636-19f0-11eb-8d74-000d3a38a36",
+                                 "cc294636-19f0-11eb-8d74-000d3a38a36ü",
+                                 "cc294636x19f0-11eb-8d74-000d3a38a36f",
+                                 "cc294636-19f0-11eb-8d74-000d3a38a36g",
+                                 None])
+def test_encode_uuids_rejects_malformed_ids(bad):
+    with pytest.raises(ValueError):
+        encode_uuids(np.array(["cc294636-19f0-11eb-8d74-000d3a38a36f", bad], dtype=object))
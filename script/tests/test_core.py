@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from conftest import assert_same_rfm, baseline_create_rfm
+from rfm import create_rfm
+
+
+def test_create_rfm_matches_baseline(raw, baseline):
+    assert_same_rfm(create_rfm(raw.copy()), baseline)
+
+
+def test_create_rfm_matches_baseline_with_ties():
+    rng = np.random.default_rng(7)
+    n = 3000
+    dataframe = pd.DataFrame({
+        "master_id": [f"{i:08x}-0000-0000-0000-000000000000" for i in range(n)],
+        "last_order_date": (pd.Timestamp(2021, 5, 30) - pd.to_timedelta(rng.integers(0, 400, n), unit="D"))
+        .strftime("%Y-%m-%d"),
+        "order_num_total_ever_online": rng.integers(0, 4, n).astype(float),
+        "order_num_total_ever_offline": rng.integers(1, 3, n).astype(float),
+        "customer_value_total_ever_offline": rng.integers(0, 20, n) * 50.0,
+        "customer_value_total_ever_online": rng.integers(0, 20, n) * 25.0,
+    })
+    assert_same_rfm(create_rfm(dataframe.copy()), baseline_create_rfm(dataframe))
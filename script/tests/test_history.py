@@ -0,0 +1,95 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rfm import SEG_MAP, SnapshotStore
+
+NAMES = list(dict.fromkeys(SEG_MAP.values()))
+
+
+def _random_ids(rng, n):
+    return np.array([str(uuid.UUID(bytes=rng.bytes(16))) for _ in range(n)])
+
+
+def _expected(before, after, labels=(*NAMES, "(absent)")):
+    """İki anlık görüntünün dış birleşimi üzerinden pd.crosstab ile geçiş matrisi"""
+    joined = pd.concat([before.astype(object).rename("from"), after.astype(object).rename("to")], axis=1)
+    joined = joined.fillna("(absent)")  # Birleşimdeki eksik değerler o tarihte bulunmayan müşterilerdir
+    matrix = pd.crosstab(pd.Categorical(joined["from"], categories=labels),
+                         pd.Categorical(joined["to"], categories=labels), dropna=False)
+    matrix.loc["(absent)", "(absent)"] = 0
+    return matrix
+
+
+@pytest.fixture(scope="module")
+def snapshots():
+    rng = np.random.default_rng(0)
+    ids = _random_ids(rng, 6000)
+    dates = ["2021-01-01", "2021-02-01", "2021-03-01", "2021-04-01", "2021-05-01"]
+    frames = {}
+    present = rng.random(len(ids)) < 0.6
+    segment = rng.integers(0, len(NAMES), len(ids))
+    for date in dates:
+        # Her ay müşterilerin bir kısmı gelir / gider, bir kısmının segmenti değişir
+        present ^= rng.random(len(ids)) < 0.1
+        change = rng.random(len(ids)) < 0.2
+        segment[change] = rng.integers(0, len(NAMES), change.sum())
+        rows = rng.permutation(np.flatnonzero(present))
+        frames[date] = pd.Series(pd.Categorical(np.array(NAMES)[segment[rows]], categories=NAMES),
+                                 index=pd.Index(ids[rows], name="customer_id"), name="segment")
+    return frames
+
+
+@pytest.fixture(params=[1, 2, 12], ids=lambda interval: f"keyframe-{interval}")
+def store(request, snapshots, tmp_path):
+    store = SnapshotStore.create(str(tmp_path / "history"), keyframe_interval=request.param)
+    for date, series in snapshots.items():
+        store.append(date, series.index.to_numpy(), series.array)
+    return store
+
+
+def test_snapshot_round_trip(store, snapshots):
+    reopened = SnapshotStore(store.path)
+    for date, series in snapshots.items():
+        pd.testing.assert_series_equal(reopened.snapshot(date).sort_index(), series.sort_index(), check_categorical=False)
+
+
+def test_transition_matrix_matches_crosstab(store, snapshots):
+    dates = list(snapshots)
+    for date_from, date_to in [(dates[0], dates[1]), (dates[1], dates[4]), (dates[3], dates[0])]:
+        matrix = store.transition_matrix(date_from, date_to)
+        expected = _expected(snapshots[date_from], snapshots[date_to])
+        np.testing.assert_array_equal(matrix.to_numpy(), expected.to_numpy())
+        assert list(matrix.index) == list(matrix.columns) == [*NAMES, "(absent)"]
+
+
+def test_history_matches_snapshots(store, snapshots):
+    customer_id = next(iter(snapshots.values())).index[0]
+    expected = [series.get(customer_id) for series in snapshots.values()]
+    assert [None if pd.isna(value) else value for value in store.history(customer_id)] == expected
+
+
+def test_append_rejects_duplicates_and_old_dates(store, snapshots):
+    series = snapshots["2021-05-01"]
+    with pytest.raises(ValueError):
+        store.append("2021-04-15", series.index.to_numpy(), series.array)
+    ids = np.concatenate([series.index.to_numpy(), series.index.to_numpy()[:1]])
+    with pytest.raises(ValueError):
+        store.append("2021-06-01", ids, pd.Categorical(np.resize(series.array, len(ids)), categories=NAMES))
+
+
+def test_transition_matrix_counts_unmapped(snapshots, tmp_path):
+    store = SnapshotStore.create(str(tmp_path / "history"))
+    first, second = snapshots["2021-01-01"], snapshots["2021-02-01"]
+    unmapped = second.copy()
+    unmapped.iloc[:50] = np.nan  # seg_map'te karşılığı olmayan RF skorları
+    store.append("2021-01-01", first.index.to_numpy(), first.array)
+    store.append("2021-02-01", unmapped.index.to_numpy(), unmapped.array)
+
+    matrix = store.transition_matrix("2021-01-01", "2021-02-01")
+    expected = _expected(first, unmapped.astype(object).fillna("(unmapped)"),
+                         labels=[*NAMES, "(absent)", "(unmapped)"])
+    assert matrix["(unmapped)"].sum() == 50
+    np.testing.assert_array_equal(matrix.to_numpy(), expected.to_numpy())
@@ -0,0 +1,75 @@
+import datetime as dt
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import assert_same_rfm
+from rfm import RFMState, apply_delta, build_state, create_rfm
+
+
+def _order_day(date):
+    return (date - dt.timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _apply_to_table(table, delta, date):
+    """Deltayı müşteri tablosuna uygular (tam yeniden hesaplama için karşılaştırma verisi)"""
+    events = delta.groupby("master_id", sort=False).agg(order_num=("order_num", "sum"),
+                                                        order_value=("order_value", "sum"))
+    known = events.index.isin(table["master_id"])
+    rows = pd.Index(table["master_id"]).get_indexer(events.index[known])
+    table.loc[rows, "order_num_total_ever_online"] += events["order_num"].to_numpy()[known]
+    table.loc[rows, "customer_value_total_ever_online"] += events["order_value"].to_numpy()[known]
+    table.loc[rows, "last_order_date"] = _order_day(date)
+    new = events[~known]
+    added = pd.DataFrame({"master_id": new.index,
+                          "last_order_date": _order_day(date),
+                          "order_num_total_ever_online": new["order_num"].to_numpy(),
+                          "order_num_total_ever_offline": 0.0,
+                          "customer_value_total_ever_offline": 0.0,
+                          "customer_value_total_ever_online": new["order_value"].to_numpy()})
+    return pd.concat([table, added], ignore_index=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_apply_delta_matches_full_rebuild(raw, tmp_path, seed):
+    rng = np.random.default_rng(seed)
+    table = raw[["master_id", "last_order_date", "order_num_total_ever_online", "order_num_total_ever_offline",
+                 "customer_value_total_ever_offline", "customer_value_total_ever_online"]].copy()
+    state = build_state(table.copy())
+    assert_same_rfm(state.to_frame(), create_rfm(table.copy()))
+
+    date = dt.datetime(2021, 6, 1)
+    previous = state.to_frame().set_index("customer_id")["segment"].astype(str)
+    for _ in range(3):
+        date += dt.timedelta(days=1)
+        picked = list(table["master_id"].iloc[rng.choice(len(table), 200, replace=False)])
+        new_ids = [str(uuid.UUID(int=int(rng.integers(2 ** 62)))) for _ in range(30)]
+        ids = picked + new_ids + picked[:20]  # Aynı müşteriye ait birden çok olay
+        delta = pd.DataFrame({"master_id": ids,
+                              "order_date": pd.Timestamp(_order_day(date)),
+                              "order_num": 1.0,
+                              "order_value": rng.uniform(50, 500, len(ids)).round(2)})
+
+        result = apply_delta(state, delta, date)
+        table = _apply_to_table(table, delta, date)
+        state.save(str(tmp_path / "state"))
+        state = RFMState.load(str(tmp_path / "state"))
+
+        assert result.new_customers == 30
+        assert result.updated_customers == 200
+        assert result.rescored < len(table)
+        expected = create_rfm(table.copy(), date)
+        assert_same_rfm(state.to_frame(), expected)
+
+        # changed yalnızca segmenti gerçekten değişen (ve yeni) müşterileri içerir
+        current = expected.set_index("customer_id")["segment"].astype(str)
+        moved = current.index[current.ne(previous.reindex(current.index))]
+        assert sorted(result.changed["customer_id"]) == sorted(moved)
+        previous = current
+
+    # Olay olmadan yalnızca tarih ilerletildiğinde de sonuç tam hesaplamayla aynıdır
+    date += dt.timedelta(days=5)
+    apply_delta(state, delta.iloc[:0], date)
+    assert_same_rfm(state.to_frame(), create_rfm(table.copy(), date))
@@ -0,0 +1,51 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from conftest import DATA_PATH, assert_same_rfm
+from rfm import create_rfm, load_customers, read_customers_csv
+from rfm import ingest
+
+
+def test_typed_read_matches_read_csv(raw):
+    typed = read_customers_csv(DATA_PATH)
+    assert list(typed.columns) == list(raw.columns)
+    for column in ingest.COUNT_COLUMNS:
+        assert typed[column].dtype == np.int32
+        np.testing.assert_array_equal(typed[column], raw[column])
+    for column in ["customer_value_total_ever_offline", "customer_value_total_ever_online"]:
+        np.testing.assert_array_equal(typed[column], raw[column])
+    for column in ingest.DATE_COLUMNS:
+        np.testing.assert_array_equal(typed[column].to_numpy(), pd.to_datetime(raw[column]).to_numpy())
+
+
+def test_cached_load_matches_baseline(baseline, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    assert_same_rfm(create_rfm(load_customers(DATA_PATH, cache_dir=cache_dir)), baseline)
+    assert len([name for name in os.listdir(cache_dir) if name.endswith(".arrow")]) == 1
+    # İkinci okuma önbellekten yapılır
+    assert_same_rfm(create_rfm(load_customers(DATA_PATH, cache_dir=cache_dir)), baseline)
+
+
+def test_cache_follows_source_and_schema(tmp_path, monkeypatch):
+    path = str(tmp_path / "customers.csv")
+    shutil.copy(DATA_PATH, path)
+    cache_dir = str(tmp_path / "cache")
+    first = ingest.cache_path(path, cache_dir)
+    assert ingest.cache_path(path, cache_dir) == first
+    load_customers(path, cache_dir=cache_dir)
+
+    # Kaynak değişince yeni önbellek dosyası kullanılır ve eski tablo döndürülmez
+    with open(path) as file:
+        lines = file.readlines()
+    with open(path, "w") as file:
+        file.writelines(lines[:101])
+    assert ingest.cache_path(path, cache_dir) != first
+    assert len(load_customers(path, cache_dir=cache_dir)) == 100
+
+    # Şema değişince de önbellek adı değişir
+    second = ingest.cache_path(path, cache_dir)
+    monkeypatch.setitem(ingest.CSV_DTYPES, "order_channel", "str")
+    assert ingest.cache_path(path, cache_dir) != second
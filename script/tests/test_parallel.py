@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH, assert_same_rfm, baseline_create_rfm
+from rfm import create_rfm_parallel, split_csv, write_synthetic_csv
+
+
+def test_parallel_matches_create_rfm(baseline):
+    assert_same_rfm(create_rfm_parallel(DATA_PATH, n_jobs=2, n_partitions=5), baseline)
+
+
+def test_parallel_output_file_matches_frame(baseline, tmp_path):
+    output_path = tmp_path / "rfm.csv"
+    assert create_rfm_parallel(DATA_PATH, output_path=str(output_path), n_jobs=2, n_partitions=3) is None
+    assert_same_rfm(pd.read_csv(output_path, dtype={"RF_SCORE": str, "RFM_SCORE": str}), baseline)
+
+
+@pytest.mark.parametrize("n_partitions", [1, 4, 16])
+def test_parallel_matches_create_rfm_on_synthetic_data(tmp_path, n_partitions):
+    # Sentetik veride frequency ve recency değerleri bol eşitlik içerir; eşitler bölüm sınırlarına dağılır
+    path = str(tmp_path / "synthetic.csv")
+    write_synthetic_csv(path, 5000, seed=3)
+    expected = baseline_create_rfm(pd.read_csv(path))
+    assert_same_rfm(create_rfm_parallel(path, n_jobs=2, n_partitions=n_partitions, k=50), expected)
+
+
+def test_split_csv_covers_every_row(tmp_path):
+    columns, byte_ranges = split_csv(DATA_PATH, 7)
+    assert columns[0] == "master_id"
+    assert byte_ranges[0][1] == byte_ranges[1][0]
+    with open(DATA_PATH, "rb") as file:
+        data = file.read()
+    assert sum(data[start:stop].count(b"\n") for start, stop in byte_ranges) == data.count(b"\n") - 1
+    assert np.all([data[start - 1:start] == b"\n" for start, _ in byte_ranges])
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH
+from rfm import Query, create_rfm
+
+
+@pytest.fixture(scope="module")
+def df(raw):
+    df = raw.copy()
+    df["order_num_total"] = df["order_num_total_ever_online"] + df["order_num_total_ever_offline"]
+    df["customer_value_total"] = df["customer_value_total_ever_offline"] + df["customer_value_total_ever_online"]
+    return df
+
+
+@pytest.mark.parametrize("block_size", [997, 1 << 16])
+def test_groupby_matches_pandas(df, block_size):
+    aggs = {"master_id": "count", "order_num_total": ["sum", "mean", "min", "max"],
+            "customer_value_total": ["sum", "mean", "count"]}
+    result = Query(df, block_size=block_size).groupby("order_channel", aggs, name="channels").collect()["channels"]
+    expected = df.groupby("order_channel").agg(aggs)
+    pd.testing.assert_frame_equal(result, expected.set_axis(result.columns, axis=1), check_dtype=False,
+                                  check_index_type=False, rtol=1e-12)
+
+    flat = Query(df, block_size=block_size).groupby("last_order_channel", {"master_id": "count"}).collect()
+    expected = df.groupby("last_order_channel").agg({"master_id": "count"})
+    pd.testing.assert_frame_equal(flat["last_order_channel_stats"], expected, check_dtype=False,
+                                  check_index_type=False)
+
+
+def test_groupby_categorical_key_matches_pandas(raw):
+    rfm = create_rfm(raw.copy())
+    aggs = {column: ["mean", "count"] for column in ["recency", "frequency", "monetary"]}
+    result = Query(rfm, block_size=1000).groupby("segment", aggs).collect()["segment_stats"]
+    expected = rfm.groupby("segment", observed=True).agg(aggs)
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=1e-12)
+
+
+@pytest.mark.parametrize("block_size", [7, 1000, 1 << 16])
+@pytest.mark.parametrize("column", ["customer_value_total", "order_num_total"])
+def test_top_k_matches_nlargest(df, block_size, column):
+    # order_num_total bol eşit değer içerir; eşitlerde önce gelen satır seçilmelidir
+    result = Query(df, block_size=block_size).top_k(column, 25, columns=["master_id"], name="top").collect()["top"]
+    expected = df.nlargest(25, column, keep="first")[[column, "master_id"]]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_chunked_csv_matches_in_memory(raw):
+    plan = {"groupby": ("order_channel", {"master_id": "count", "order_num_total_ever_online": ["sum", "max"]}),
+            "top_k": ("customer_value_total_ever_online", 10)}
+
+    def run(query):
+        return (query.groupby(*plan["groupby"], name="channels")
+                .top_k(*plan["top_k"], columns=["master_id"], name="top")
+                .collect())
+
+    chunked = run(Query.from_csv(DATA_PATH, chunksize=3001))
+    in_memory = run(Query(raw))
+    pd.testing.assert_frame_equal(chunked["channels"], in_memory["channels"])
+    pd.testing.assert_frame_equal(chunked["top"], in_memory["top"])
+    assert Query.from_csv(DATA_PATH).top_k("order_num_total_ever_online", 3, columns=["master_id"]) \
+        .required_columns == ["order_num_total_ever_online", "master_id"]
+
+
+def test_duplicate_names_are_rejected(df):
+    with pytest.raises(ValueError):
+        Query(df).top_k("order_num_total", 5, name="top").top_k("customer_value_total", 5, name="top")
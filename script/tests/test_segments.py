@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BASELINE_SEG_MAP
+from rfm import SEG_MAP, assign_segments, check_seg_map, compile_seg_map
+
+BAD_SEG_MAP = {
+    r"[1-2][1-3]": "hibernating",
+    r"[1-2][3-5]": "at_Risk",   # 13 ve 23 iki desene uyar
+    r"[3-5][1-5]": "active",
+    r"1[4-5]": "cant_loose",    # 14 ve 15 de iki desene uyar
+}
+
+
+def test_seg_map_is_complete():
+    assert check_seg_map(SEG_MAP).ok
+
+
+def test_check_seg_map_reports_overlaps_and_gaps():
+    report = check_seg_map(BAD_SEG_MAP)
+    assert not report.ok
+    assert report.gaps == []
+    assert report.overlaps == {"13": [r"[1-2][1-3]", r"[1-2][3-5]"], "14": [r"[1-2][3-5]", r"1[4-5]"],
+                               "15": [r"[1-2][3-5]", r"1[4-5]"], "23": [r"[1-2][1-3]", r"[1-2][3-5]"]}
+    with pytest.raises(ValueError):
+        compile_seg_map(BAD_SEG_MAP, validate=True)
+
+    report = check_seg_map({pattern: name for pattern, name in BAD_SEG_MAP.items() if pattern != r"[1-2][3-5]"})
+    assert report.gaps == ["24", "25"]
+    assert report.overlaps == {}
+
+
+def test_assign_segments_matches_regex_replace():
+    recency, frequency = np.meshgrid(np.arange(1, 6), np.arange(1, 6))
+    recency, frequency = recency.ravel(), frequency.ravel()
+    expected = (pd.Series(recency.astype(str)) + pd.Series(frequency.astype(str))).replace(BASELINE_SEG_MAP, regex=True)
+    assert list(assign_segments(recency, frequency).astype(str)) == list(expected)
+
+
+def test_assign_segments_leaves_gaps_missing():
+    gappy = {pattern: name for pattern, name in SEG_MAP.items() if name != "champions"}
+    segments = assign_segments([5, 5, 1], [4, 5, 1], seg_map=gappy)
+    assert segments.isna().tolist() == [True, True, False]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from rfm import SegmentStore, create_rfm
+from rfm.service import _serve_connection, handle
+
+
+@pytest.fixture(scope="module")
+def rfm(raw):
+    return create_rfm(raw.copy())
+
+
+@pytest.fixture(scope="module")
+def store(rfm, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("store"))
+    SegmentStore.from_rfm(rfm).save(path)
+    return SegmentStore.open(path)
+
+
+def test_lookup_matches_create_rfm(store, rfm):
+    assert len(store) == len(rfm)
+    for row in rfm.sample(200, random_state=0).itertuples():
+        assert store.lookup(row.customer_id) == {"customer_id": row.customer_id,
+                                                 "segment": row.segment,
+                                                 "RF_SCORE": row.RF_SCORE,
+                                                 "RFM_SCORE": row.RFM_SCORE}
+    assert store.lookup("00000000-0000-0000-0000-000000000000") is None
+    assert store.lookup("ffffffff-ffff-ffff-ffff-ffffffffffff") is None
+
+
+def test_score_matches_frozen_edges(store, rfm):
+    # Depodaki müşteriler sabitlenmiş sınırlarla yeniden skorlandığında aynı skoru alır (frequency sınırındaki eşitler
+    # hariç: yeni müşteriler eşit değerlilerin sonuna sıralanır)
+    frequency_edges = store.binners["frequency"].tie_values
+    sample = rfm[~rfm["frequency"].isin(frequency_edges)].sample(300, random_state=1)
+    for row in sample.itertuples():
+        scored = store.score(frequency=row.frequency, monetary=row.monetary, recency=row.recency)
+        assert (scored["RFM_SCORE"], scored["segment"]) == (row.RFM_SCORE, row.segment)
+    by_date = store.score(frequency=2, monetary=150.0, last_order_date="2021-05-01")
+    assert by_date == store.score(frequency=2, monetary=150.0, recency=31)
+
+
+@pytest.mark.parametrize("name", ["recency", "frequency", "monetary"])
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf])
+def test_score_rejects_non_finite(store, name, value):
+    params = {"recency": 10.0, "frequency": 3.0, "monetary": 200.0, name: value}
+    with pytest.raises(ValueError):
+        store.score(**params)
+    status, body = handle(store, "GET", "/score?" + "&".join(f"{key}={val}" for key, val in params.items()))
+    assert status == 400, body
+
+
+def test_handle_status_codes(store, rfm):
+    customer_id = rfm["customer_id"].iloc[0]
+    assert handle(store, "GET", f"/customers/{customer_id}") == (200, store.lookup(customer_id))
+    assert handle(store, "GET", "/customers/unknown")[0] == 404
+    assert handle(store, "GET", "/nowhere")[0] == 404
+    assert handle(store, "POST", "/health")[0] == 405
+    assert handle(store, "GET", "/score?frequency=2")[0] == 400
+    assert handle(store, "GET", "/score?frequency=2&monetary=abc&recency=3")[0] == 400
+    assert handle(store, "GET", "/score?frequency=2&monetary=150")[0] == 400
+    assert handle(store, "GET", "/health") == (200, {"customers": len(rfm), "analysis_date": "2021-06-01"})
+
+
+def _exchange(store, raw_requests):
+    """İstekleri gerçek bir bağlantı üzerinden gönderir; (durum kodu, gövde) listesi döndürür"""
+    async def run():
+        server = await asyncio.start_server(lambda reader, writer: _serve_connection(store, reader, writer),
+                                            host="127.0.0.1", port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"".join(raw_requests))
+            await writer.drain()
+            responses = []
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                lines = head.decode().split("\r\n")
+                length = int(next(line for line in lines if line.startswith("Content-Length")).split(":")[1])
+                responses.append((int(lines[0].split(" ")[1]), json.loads(await reader.readexactly(length))))
+            writer.close()
+            return responses
+    return asyncio.run(run())
+
+
+def test_keep_alive_connection(store):
+    responses = _exchange(store, [b"GET /health HTTP/1.1\r\n\r\n",
+                                  b"GET /customers/unknown HTTP/1.1\r\nContent-Length: 4\r\n\r\nbody",
+                                  b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"])
+    assert [status for status, _ in responses] == [200, 404, 200]
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-3"])
+def test_malformed_content_length(store, length):
+    responses = _exchange(store, [b"GET /health HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n",
+                                  b"GET /health HTTP/1.1\r\n\r\n"])
+    assert responses == [(400, {"error": "malformed Content-Length header"})]
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from conftest import DATA_PATH, assert_same_rfm
+from rfm import create_rfm_streaming
+
+KLL_EPSILON = 0.0133  # rfm/sketch.py, k=200
+
+
+def test_streaming_monetary_within_kll_bound(baseline):
+    result = create_rfm_streaming(DATA_PATH, chunksize=3000, k=200, seed=0)
+    assert_same_rfm(result, baseline, columns=("customer_id", "recency", "frequency", "monetary", "RF_SCORE"))
+
+    # Recency ve frequency skorları kesin; monetary sınırları KLL özetinden gelir. sketch.py'deki sınır: her iç sınırda
+    # en fazla ~ε·n müşteri komşu skora kayar, toplamda en fazla 4·ε·n.
+    monetary = result["RFM_SCORE"].str[2].to_numpy() != baseline["RFM_SCORE"].str[2].to_numpy()
+    assert monetary.sum() <= 4 * KLL_EPSILON * len(baseline)
+
+
+def test_streaming_output_file_matches_frame(tmp_path):
+    output_path = tmp_path / "rfm.csv"
+    assert create_rfm_streaming(DATA_PATH, output_path=str(output_path), chunksize=3000, seed=0) is None
+    expected = create_rfm_streaming(DATA_PATH, chunksize=3000, seed=0)
+    assert_same_rfm(pd.read_csv(output_path, dtype={"RF_SCORE": str, "RFM_SCORE": str}), expected)